@@ -0,0 +1,6 @@
+"""
+Benchmarks for the reservation hot paths.
+
+Every benchmark runs against a throwaway test database created from the
+configured DATABASES (SQLite or PostgreSQL), so it never touches real data.
+"""
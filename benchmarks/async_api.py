@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, override_settings
+from django.utils import timezone
+
+from reservations.availability import mark_slot_reserved
+from reservations.models import Reservation, RoomType, TimeSlot
+
+from .harness import latency_summary
+
+
+BENCH_URLCONF = "benchmarks.urls"
+NO_CACHE_SETTINGS = {
+    "CACHES": {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "bench-dummy": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    },
+    "AVAILABILITY_CACHE_ALIAS": "bench-dummy",
+}
+
+
+async def _drive(client: AsyncClient, url: str, *, requests: int, concurrency: int) -> tuple[float, list[float], int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies_ms: list[float] = []
+    failures = 0
+
+    async def _one() -> None:
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(url)
+            latencies_ms.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_one() for _ in range(requests)))
+    return time.perf_counter() - started, latencies_ms, failures
+
+
+def _run_variant(client: AsyncClient, *, variant: str, query: str, requests: int, concurrency: int) -> dict:
+    wall_s, latencies_ms, failures = asyncio.run(
+        _drive(client, f"/{variant}/availability/?{query}", requests=requests, concurrency=concurrency)
+    )
+    return {
+        "variant": variant,
+        "requests": requests,
+        "failures": failures,
+        "wall_s": round(wall_s, 4),
+        "requests_per_s": round(requests / wall_s, 2) if wall_s else 0.0,
+        **latency_summary(latencies_ms),
+    }
+
+
+def run_async_api_benchmark(
+    *,
+    requests: int = 500,
+    concurrency: int = 50,
+    room_types: int = 8,
+    use_cache: bool = False,
+) -> dict:
+    """
+    Drive /api/availability/ through the ASGI handler with many concurrent in-flight
+    requests and compare the sync view (run in a worker thread) with the async one.
+
+    use_cache=False swaps the availability cache for a DummyCache so every request
+    reaches the database. Must run inside benchmarks.harness.isolated_database().
+    """
+    User = get_user_model()
+    user = User.objects.create(username="bench-async-api")
+    target_date = timezone.localdate() + timedelta(days=1)
+    for index in range(room_types):
+        room_type = RoomType.objects.create(name=f"Benchmark Room {index}", display_order=index)
+        for slot in TimeSlot.values[:: index % 3 + 1]:
+            Reservation.objects.create(user=user, room_type=room_type, date=target_date, slot=slot)
+            mark_slot_reserved(room_type.id, target_date, slot)
+
+    client = AsyncClient()
+    client.force_login(user)
+    query = f"date={target_date.isoformat()}"
+
+    overrides = {"ROOT_URLCONF": BENCH_URLCONF, "ALLOWED_HOSTS": ["*"]}
+    if not use_cache:
+        overrides.update(NO_CACHE_SETTINGS)
+
+    with override_settings(**overrides):
+        results = [
+            _run_variant(client, variant=variant, query=query, requests=requests, concurrency=concurrency)
+            for variant in ("sync", "async")
+        ]
+    return {
+        "benchmark": "async_api",
+        "requests": requests,
+        "concurrency": concurrency,
+        "room_types": room_types,
+        "cache": use_cache,
+        "results": results,
+    }
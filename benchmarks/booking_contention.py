@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.utils import timezone
+
+from reservations import services
+from reservations.locks import LOCK_SCOPE_ROOM_DATE, LOCK_SCOPE_ROOM_TYPE
+from reservations.models import Reservation, RoomType, TimeSlot
+
+from .harness import latency_summary, run_concurrently
+
+
+def _prepare(threads: int) -> tuple[RoomType, list]:
+    room_type = RoomType.objects.create(name="Benchmark Lecture Hall", display_order=0)
+    User = get_user_model()
+    users = [User.objects.create(username=f"bench-contention-{i}") for i in range(threads)]
+    return room_type, users
+
+
+def _run_scope(
+    *,
+    scope: str,
+    room_type: RoomType,
+    users: list,
+    bookings_per_thread: int,
+    hold_ms: float,
+) -> dict:
+    Reservation.objects.all().delete()
+
+    first_date = timezone.localdate() + timedelta(days=1)
+    slot = int(TimeSlot.H09)
+    latencies_ms: list[float] = []
+    failures = 0
+    lock = threading.Lock()
+
+    real_acquire = services.acquire_booking_locks
+
+    def _acquire_and_hold(keys):
+        # Simulates in-transaction work (network round trips, rendering...) while the lock is held.
+        real_acquire(keys)
+        if hold_ms:
+            time.sleep(hold_ms / 1000)
+
+    def _worker(index: int, user):
+        def _book():
+            nonlocal failures
+            for j in range(bookings_per_thread):
+                # Every booking targets the same room type on a different date.
+                target_date = first_date + timedelta(days=index * bookings_per_thread + j)
+                started = time.perf_counter()
+                try:
+                    services.create_reservation(
+                        user=user,
+                        data=services.ReservationInput(room_type_id=room_type.id, date=target_date, slot=slot),
+                    )
+                except services.ReservationError:
+                    with lock:
+                        failures += 1
+                    continue
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                with lock:
+                    latencies_ms.append(elapsed_ms)
+
+        return _book
+
+    with override_settings(RESERVATION_LOCK_SCOPE=scope), mock.patch.object(
+        services, "acquire_booking_locks", _acquire_and_hold
+    ):
+        wall_s = run_concurrently([_worker(i, user) for i, user in enumerate(users)])
+
+    booked = len(latencies_ms)
+    return {
+        "scope": scope,
+        "bookings": booked,
+        "failures": failures,
+        "wall_s": round(wall_s, 4),
+        "throughput_per_s": round(booked / wall_s, 2) if wall_s else 0.0,
+        **latency_summary(latencies_ms),
+    }
+
+
+def run_booking_contention_benchmark(
+    *,
+    threads: int = 16,
+    bookings_per_thread: int = 20,
+    hold_ms: float = 5.0,
+) -> dict:
+    """
+    Many users book the same room type on different dates, once per lock scope.
+
+    Must run inside benchmarks.harness.isolated_database(). On PostgreSQL the
+    "room_date" scope lets these bookings proceed in parallel, while the legacy
+    "room_type" scope serializes them on one RoomType row. SQLite serializes
+    every writer regardless, so both scopes report similar numbers there.
+    """
+    room_type, users = _prepare(threads)
+    results = [
+        _run_scope(
+            scope=scope,
+            room_type=room_type,
+            users=users,
+            bookings_per_thread=bookings_per_thread,
+            hold_ms=hold_ms,
+        )
+        for scope in (LOCK_SCOPE_ROOM_TYPE, LOCK_SCOPE_ROOM_DATE)
+    ]
+
+    baseline = results[0]["throughput_per_s"]
+    speedup = round(results[1]["throughput_per_s"] / baseline, 2) if baseline else None
+    return {
+        "benchmark": "booking_contention",
+        "threads": threads,
+        "bookings_per_thread": bookings_per_thread,
+        "hold_ms": hold_ms,
+        "results": results,
+        "room_date_speedup": speedup,
+    }
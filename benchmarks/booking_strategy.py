@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.utils import timezone
+
+from reservations import services
+from reservations.models import Reservation, RoomType, TimeSlot
+
+from .harness import latency_summary, run_concurrently
+
+
+def _run_strategy(*, strategy: str, room_type: RoomType, users: list, targets: list, seed: int) -> dict:
+    Reservation.objects.all().delete()
+
+    latencies_ms: list[float] = []
+    created = 0
+    conflicts = 0
+    lock = threading.Lock()
+
+    def _worker(index: int, user):
+        def _book():
+            nonlocal created, conflicts
+            # Every thread walks the same targets in its own order, so most attempts collide.
+            order = list(targets)
+            random.Random(seed + index).shuffle(order)
+            for target_date, slot in order:
+                started = time.perf_counter()
+                try:
+                    services.create_reservation(
+                        user=user,
+                        data=services.ReservationInput(room_type_id=room_type.id, date=target_date, slot=slot),
+                    )
+                    outcome = "created"
+                except services.SlotUnavailableError:
+                    outcome = "conflict"
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                with lock:
+                    latencies_ms.append(elapsed_ms)
+                    if outcome == "created":
+                        created += 1
+                    else:
+                        conflicts += 1
+
+        return _book
+
+    with override_settings(RESERVATION_BOOKING_STRATEGY=strategy):
+        wall_s = run_concurrently([_worker(i, user) for i, user in enumerate(users)])
+
+    attempts = len(latencies_ms)
+    return {
+        "strategy": strategy,
+        "attempts": attempts,
+        "created": created,
+        "conflicts": conflicts,
+        "wall_s": round(wall_s, 4),
+        "attempts_per_s": round(attempts / wall_s, 2) if wall_s else 0.0,
+        **latency_summary(latencies_ms),
+    }
+
+
+def run_booking_strategy_benchmark(*, threads: int = 16, days: int = 5, seed: int = 42) -> dict:
+    """
+    Hot-slot contention: every thread tries to book every (date, slot) of one room type.
+
+    Compares the pessimistic (lock + check + insert) and optimistic (insert-first)
+    create_reservation strategies. Must run inside benchmarks.harness.isolated_database().
+    """
+    room_type = RoomType.objects.create(name="Benchmark Seminar Room", display_order=0)
+    User = get_user_model()
+    users = [User.objects.create(username=f"bench-strategy-{i}") for i in range(threads)]
+
+    first_date = timezone.localdate() + timedelta(days=1)
+    targets = [(first_date + timedelta(days=d), int(slot)) for d in range(days) for slot in TimeSlot.values]
+
+    results = [
+        _run_strategy(strategy=strategy, room_type=room_type, users=users, targets=targets, seed=seed)
+        for strategy in (services.BOOKING_STRATEGY_PESSIMISTIC, services.BOOKING_STRATEGY_OPTIMISTIC)
+    ]
+    return {
+        "benchmark": "booking_strategy",
+        "threads": threads,
+        "targets": len(targets),
+        "results": results,
+    }
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+from django.db import connection, connections
+from django.test.utils import setup_databases, teardown_databases
+
+
+@contextmanager
+def isolated_database(*, verbosity: int = 0) -> Iterator[None]:
+    """
+    Create a throwaway test database for the duration of the block.
+
+    SQLite test databases default to a shared in-memory database, which reports
+    "table is locked" instead of waiting when several threads write at once,
+    so benchmarks run against a temporary file instead.
+    """
+    tmp_dir = None
+    if connection.vendor == "sqlite":
+        tmp_dir = tempfile.TemporaryDirectory(prefix="bench-")
+        connection.settings_dict.setdefault("TEST", {})["NAME"] = str(Path(tmp_dir.name) / "bench.sqlite3")
+        connection.settings_dict.setdefault("OPTIONS", {}).setdefault("timeout", 60)
+
+    old_config = setup_databases(verbosity=verbosity, interactive=False)
+    try:
+        yield
+    finally:
+        connections.close_all()
+        teardown_databases(old_config, verbosity=verbosity)
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
+
+
+def run_concurrently(workers: list[Callable[[], None]]) -> float:
+    """
+    Start every worker on its own thread at the same moment and return the wall time (seconds).
+    Each thread closes its DB connection when done so the test database can be dropped.
+    """
+    barrier = threading.Barrier(len(workers) + 1)
+    errors: list[BaseException] = []
+
+    def _run(fn: Callable[[], None]) -> None:
+        try:
+            barrier.wait()
+            fn()
+        except BaseException as exc:  # pragma: no cover - surfaced below
+            errors.append(exc)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=_run, args=(fn,), daemon=True) for fn in workers]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    if errors:
+        raise errors[0]
+    return elapsed
+
+
+def latency_summary(samples_ms: list[float]) -> dict[str, float]:
+    """
+    p50/p95/p99/max of a list of latencies in milliseconds.
+    """
+    if not samples_ms:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+
+    ordered = sorted(samples_ms)
+    if len(ordered) == 1:
+        cuts = [ordered[0]] * 99
+    else:
+        cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+    return {
+        "p50_ms": round(cuts[49], 3),
+        "p95_ms": round(cuts[94], 3),
+        "p99_ms": round(cuts[98], 3),
+        "max_ms": round(ordered[-1], 3),
+    }
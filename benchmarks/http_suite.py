@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import json
+import platform
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date as date_type
+from datetime import timedelta
+from itertools import product
+from typing import Callable, Iterator
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from reservations.availability import mark_slots_reserved
+from reservations.models import Reservation, RoomType, TimeSlot
+
+from .async_api import NO_CACHE_SETTINGS
+from .harness import latency_summary, run_concurrently
+
+
+SCENARIOS = ("availability", "create", "create_hot", "update", "cancel", "my_reservations")
+
+# Keep side effects in memory: booking emails are rendered (part of the hot path) but not sent.
+SUITE_SETTINGS = {
+    "EMAIL_BACKEND": "django.core.mail.backends.locmem.EmailBackend",
+    "RESERVATION_EMAIL_DELIVERY": "immediate",
+    "ALLOWED_HOSTS": ["*"],
+}
+
+
+@dataclass
+class _Samples:
+    latencies_ms: list[float] = field(default_factory=list)
+    queries: list[int] = field(default_factory=list)
+    statuses: dict[int, int] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def add(self, latency_ms: float, queries: int, status: int) -> None:
+        with self.lock:
+            self.latencies_ms.append(latency_ms)
+            self.queries.append(queries)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+
+def _request(client: Client, samples: _Samples | None, method: str, url: str, payload: dict | None = None) -> int:
+    """
+    One request through the WSGI test handler; records latency and the queries it ran.
+    """
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        if method == "post":
+            response = client.post(url, data=json.dumps(payload or {}), content_type="application/json")
+        else:
+            response = client.get(url)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    if samples is not None:
+        samples.add(elapsed_ms, len(queries), response.status_code)
+    return response.status_code
+
+
+def _summary(scenario: str, samples: _Samples, wall_s: float, ok_statuses: set[int], **extra) -> dict:
+    requests = len(samples.latencies_ms)
+    queries = samples.queries or [0]
+    return {
+        "scenario": scenario,
+        "requests": requests,
+        "failures": sum(count for status, count in samples.statuses.items() if status not in ok_statuses),
+        "statuses": {str(status): count for status, count in sorted(samples.statuses.items())},
+        "wall_s": round(wall_s, 4),
+        "requests_per_s": round(requests / wall_s, 2) if wall_s else 0.0,
+        **latency_summary(samples.latencies_ms),
+        "queries_per_request": round(sum(queries) / len(queries), 2),
+        "max_queries": max(queries),
+        **extra,
+    }
+
+
+class _Fixture:
+    """
+    Deterministic data shared by every scenario: room types, users and free (room, date, slot) keys.
+    """
+
+    def __init__(self, *, room_types: int, users: int):
+        User = get_user_model()
+        self.room_types = [
+            RoomType.objects.create(name=f"Benchmark Suite Room {index}", display_order=index) for index in range(room_types)
+        ]
+        self.users = [User.objects.create(username=f"bench-suite-{index}", email=f"bench-{index}@example.com") for index in range(users)]
+        self.first_date = timezone.localdate() + timedelta(days=1)
+        self._next_day = 0
+
+    def client(self, user) -> Client:
+        client = Client()
+        client.force_login(user)
+        return client
+
+    def fresh_slots(self, count: int) -> Iterator[tuple[int, date_type, int]]:
+        """
+        `count` (room_type_id, date, slot) keys on days no earlier scenario used.
+        """
+        slots = [int(value) for value in TimeSlot.values]
+        per_day = len(slots) * len(self.room_types)
+        days = -(-count // per_day)
+        dates = [self.first_date + timedelta(days=self._next_day + offset) for offset in range(days)]
+        self._next_day += days
+        keys = product(dates, slots, (room_type.id for room_type in self.room_types))
+        for _, (date_value, slot_value, room_type_id) in zip(range(count), keys):
+            yield room_type_id, date_value, slot_value
+
+    def book(self, user, keys: list[tuple[int, date_type, int]]) -> list[Reservation]:
+        reservations = Reservation.objects.bulk_create(
+            [Reservation(user=user, room_type_id=room_type_id, date=date_value, slot=slot) for room_type_id, date_value, slot in keys]
+        )
+        mark_slots_reserved(keys)
+        return reservations
+
+
+def _payload(key: tuple[int, date_type, int]) -> dict:
+    room_type_id, date_value, slot_value = key
+    return {"room_type_id": room_type_id, "date": date_value.isoformat(), "slot": slot_value}
+
+
+def _sequential(scenario: str, fixture: _Fixture, requests: int, warmup: int, plan: Callable[[int], tuple], ok: set[int]) -> dict:
+    client = fixture.client(fixture.users[0])
+    for index in range(warmup):
+        _request(client, None, *plan(index))
+    samples = _Samples()
+    started = time.perf_counter()
+    for index in range(warmup, warmup + requests):
+        _request(client, samples, *plan(index))
+    return _summary(scenario, samples, time.perf_counter() - started, ok)
+
+
+def _availability(fixture: _Fixture, *, requests: int, warmup: int, **_) -> dict:
+    # One day with every other slot booked in every room type.
+    day = list(fixture.fresh_slots(len(TimeSlot.values) * len(fixture.room_types)))
+    fixture.book(fixture.users[-1], [key for key in day if key[2] % 2 == 0])
+    url = f"{reverse('reservations:availability_api')}?date={day[0][1].isoformat()}"
+    return _sequential("availability", fixture, requests, warmup, lambda _: ("get", url), {200})
+
+
+def _create(fixture: _Fixture, *, requests: int, warmup: int, **_) -> dict:
+    keys = list(fixture.fresh_slots(requests + warmup))
+    url = reverse("reservations:create_reservation_api")
+    return _sequential("create", fixture, requests, warmup, lambda index: ("post", url, _payload(keys[index])), {201})
+
+
+def _update(fixture: _Fixture, *, requests: int, warmup: int, **_) -> dict:
+    user = fixture.users[0]
+    reservations = fixture.book(user, list(fixture.fresh_slots(requests + warmup)))
+    targets = list(fixture.fresh_slots(requests + warmup))
+
+    def plan(index: int) -> tuple:
+        url = reverse("reservations:update_reservation_api", args=[reservations[index].id])
+        return "post", url, _payload(targets[index])
+
+    return _sequential("update", fixture, requests, warmup, plan, {200})
+
+
+def _cancel(fixture: _Fixture, *, requests: int, warmup: int, **_) -> dict:
+    reservations = fixture.book(fixture.users[0], list(fixture.fresh_slots(requests + warmup)))
+
+    def plan(index: int) -> tuple:
+        return "post", reverse("reservations:cancel_reservation_api", args=[reservations[index].id])
+
+    return _sequential("cancel", fixture, requests, warmup, plan, {200})
+
+
+def _my_reservations(fixture: _Fixture, *, requests: int, warmup: int, history: int = 500, **_) -> dict:
+    user = fixture.users[0]
+    today = timezone.localdate()
+    past_keys = [
+        (fixture.room_types[index % len(fixture.room_types)].id, today - timedelta(days=1 + index // len(fixture.room_types)), int(TimeSlot.values[0]))
+        for index in range(history)
+    ]
+    fixture.book(user, past_keys)
+    url = reverse("reservations:my_reservations")
+    result = _sequential("my_reservations", fixture, requests, warmup, lambda _: ("get", url), {200})
+    result["past_reservations"] = history
+    return result
+
+
+def _create_hot(fixture: _Fixture, *, threads: int, rounds: int, **_) -> dict:
+    """
+    Every thread tries to book the same slot, `rounds` times over: one booking per
+    round must win (201) and the others must lose cleanly (409).
+    """
+    keys = list(fixture.fresh_slots(rounds))
+    url = reverse("reservations:create_reservation_api")
+    samples = _Samples()
+    clients = [fixture.client(user) for user in fixture.users[:threads]]
+
+    def worker(client: Client) -> Callable[[], None]:
+        def _run() -> None:
+            for key in keys:
+                _request(client, samples, "post", url, _payload(key))
+
+        return _run
+
+    wall_s = run_concurrently([worker(client) for client in clients])
+    booked = Reservation.objects.filter(date__in={date_value for _, date_value, _ in keys}).count()
+    return _summary(
+        "create_hot",
+        samples,
+        wall_s,
+        {201, 409},
+        threads=len(clients),
+        rounds=rounds,
+        booked=booked,
+        double_booked=max(booked - rounds, 0),
+    )
+
+
+RUNNERS: dict[str, Callable[..., dict]] = {
+    "availability": _availability,
+    "create": _create,
+    "create_hot": _create_hot,
+    "update": _update,
+    "cancel": _cancel,
+    "my_reservations": _my_reservations,
+}
+
+
+def _git_revision() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def run_http_suite(
+    *,
+    scenarios: tuple[str, ...] = SCENARIOS,
+    requests: int = 200,
+    warmup: int = 10,
+    threads: int = 8,
+    rounds: int = 25,
+    room_types: int = 4,
+    use_cache: bool = False,
+) -> dict:
+    """
+    Drive the booking hot paths through the WSGI test client and report, per
+    scenario, throughput, p50/p95/p99 latency and queries per request.
+
+    The data is deterministic and the output is plain JSON, so runs from two
+    commits can be diffed. Query capture adds a little per-query overhead to the
+    latencies, the same for every run. use_cache=False swaps the availability
+    cache for a DummyCache. Must run inside benchmarks.harness.isolated_database().
+    """
+    unknown = set(scenarios) - set(RUNNERS)
+    if unknown:
+        raise ValueError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    overrides = dict(SUITE_SETTINGS)
+    if not use_cache:
+        overrides.update(NO_CACHE_SETTINGS)
+
+    results = []
+    with override_settings(**overrides):
+        fixture = _Fixture(room_types=room_types, users=max(threads, 1) + 1)
+        for scenario in scenarios:
+            results.append(
+                RUNNERS[scenario](fixture, requests=requests, warmup=warmup, threads=threads, rounds=rounds)
+            )
+
+    return {
+        "benchmark": "http_suite",
+        "revision": _git_revision(),
+        "database": connection.vendor,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "parameters": {
+            "requests": requests,
+            "warmup": warmup,
+            "threads": threads,
+            "rounds": rounds,
+            "room_types": room_types,
+            "cache": use_cache,
+        },
+        "results": results,
+    }
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection
+from django.test import override_settings
+from django.utils import timezone
+
+from reservations import services
+from reservations.availability import mark_slots_reserved, reconcile_daily_availability
+from reservations.locks import (
+    LOCK_ADVISORY,
+    LOCK_RESERVATION_ROW,
+    LOCK_ROOM_TYPE_ROWS,
+    LOCK_SCOPE_ROOM_DATE,
+    LOCK_SCOPE_ROOM_TYPE,
+    LOCK_SQLITE_WRITE,
+    LockOrderError,
+    is_deadlock,
+)
+from reservations.metrics import SLOW_LOCK_WAITS
+from reservations.models import Reservation, RoomType, TimeSlot
+
+from .harness import latency_summary, run_concurrently
+
+
+LOCK_KINDS = (LOCK_SQLITE_WRITE, LOCK_RESERVATION_ROW, LOCK_ADVISORY, LOCK_ROOM_TYPE_ROWS)
+FAILURE_FIELDS = ("deadlocks", "lock_order_errors", "slot_conflicts", "errors", "reservations_lost", "availability_drift")
+
+
+def _prepare(threads: int) -> tuple[list[RoomType], list[Reservation]]:
+    """
+    Two room types and one reservation per thread, each on its own (date, slot).
+
+    Threads share dates (up to one per slot), so every move locks the same
+    (room_type, date) pairs as its neighbours; even threads start in the first
+    room type and odd threads in the second, so half of the moves request the
+    two keys in the opposite order.
+    """
+    room_types = [
+        RoomType.objects.create(name=f"Lock Stress Room {name}", display_order=index)
+        for index, name in enumerate("AB")
+    ]
+    User = get_user_model()
+    slots = [int(value) for value in TimeSlot.values]
+    first_date = timezone.localdate() + timedelta(days=1)
+    reservations = Reservation.objects.bulk_create(
+        [
+            Reservation(
+                user=User.objects.create(username=f"bench-lock-stress-{index}"),
+                room_type=room_types[index % 2],
+                date=first_date + timedelta(days=index // len(slots)),
+                slot=slots[index % len(slots)],
+            )
+            for index in range(threads)
+        ]
+    )
+    mark_slots_reserved((reservation.room_type_id, reservation.date, reservation.slot) for reservation in reservations)
+    return room_types, reservations
+
+
+def _run_scope(
+    *,
+    scope: str,
+    room_types: list[RoomType],
+    reservations: list[Reservation],
+    moves: int,
+    hold_ms: float,
+) -> dict:
+    other = {room_types[0].id: room_types[1].id, room_types[1].id: room_types[0].id}
+    latencies_ms: list[float] = []
+    outcomes = {"moved": 0, "deadlocks": 0, "lock_order_errors": 0, "slot_conflicts": 0, "errors": 0}
+    lock = threading.Lock()
+    real_acquire = services.acquire_booking_locks
+
+    def _acquire_and_hold(keys):
+        # Keep the locks a little longer so moves on the same date overlap.
+        real_acquire(keys)
+        if hold_ms:
+            time.sleep(hold_ms / 1000)
+
+    def _worker(reservation: Reservation):
+        def _move():
+            room_type_id = Reservation.objects.values_list("room_type_id", flat=True).get(id=reservation.id)
+            for _ in range(moves):
+                target = other[room_type_id]
+                new_data = services.ReservationInput(room_type_id=target, date=reservation.date, slot=reservation.slot)
+                started = time.perf_counter()
+                try:
+                    services.update_reservation(user=reservation.user, reservation_id=reservation.id, new_data=new_data)
+                    outcome = "moved"
+                    room_type_id = target
+                except OperationalError as exc:
+                    outcome = "deadlocks" if is_deadlock(exc) else "errors"
+                except LockOrderError:
+                    outcome = "lock_order_errors"
+                except services.SlotUnavailableError:
+                    outcome = "slot_conflicts"
+                except Exception:
+                    outcome = "errors"
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                with lock:
+                    outcomes[outcome] += 1
+                    if outcome == "moved":
+                        latencies_ms.append(elapsed_ms)
+
+        return _move
+
+    slow_before = {kind: SLOW_LOCK_WAITS.value(lock=kind) for kind in LOCK_KINDS}
+    with override_settings(RESERVATION_LOCK_SCOPE=scope), mock.patch.object(
+        services, "acquire_booking_locks", _acquire_and_hold
+    ):
+        wall_s = run_concurrently([_worker(reservation) for reservation in reservations])
+
+    placed = Reservation.objects.filter(id__in=[reservation.id for reservation in reservations]).count()
+    reconcile = reconcile_daily_availability(room_type_ids=[room_type.id for room_type in room_types])
+    return {
+        "scope": scope,
+        **outcomes,
+        "wall_s": round(wall_s, 4),
+        "moves_per_s": round(outcomes["moved"] / wall_s, 2) if wall_s else 0.0,
+        **latency_summary(latencies_ms),
+        "slow_lock_waits": {kind: SLOW_LOCK_WAITS.value(lock=kind) - slow_before[kind] for kind in LOCK_KINDS},
+        "reservations_lost": len(reservations) - placed,
+        "availability_drift": reconcile.get("created", 0) + reconcile.get("updated", 0),
+    }
+
+
+def run_lock_stress(*, threads: int = 16, moves: int = 25, hold_ms: float = 2.0) -> dict:
+    """
+    Concurrent cross-room moves (update_reservation between two room types, in
+    both directions on the same dates), once per lock scope.
+
+    Passes when no move deadlocks, breaks the lock order or fails otherwise, and
+    every reservation and availability row is intact afterwards. Must run on a
+    throwaway database (benchmarks.harness.isolated_database() or a
+    TransactionTestCase, see reservations.tests.test_locks). Only PostgreSQL (or
+    another backend with row locks) exercises the lock order; SQLite serializes
+    every writer, so a passing SQLite run proves nothing about deadlocks.
+    """
+    room_types, reservations = _prepare(threads)
+    results = [
+        _run_scope(scope=scope, room_types=room_types, reservations=reservations, moves=moves, hold_ms=hold_ms)
+        for scope in (LOCK_SCOPE_ROOM_DATE, LOCK_SCOPE_ROOM_TYPE)
+    ]
+    failed = any(result[name] for result in results for name in FAILURE_FIELDS)
+    return {
+        "benchmark": "lock_stress",
+        "database": connection.vendor,
+        "threads": threads,
+        "moves_per_thread": moves,
+        "hold_ms": hold_ms,
+        "results": results,
+        "passed": not failed,
+    }
@@ -0,0 +1,13 @@
+"""
+URLconf used by benchmarks.async_api: the sync and async availability views side by side.
+"""
+
+from django.urls import path
+
+from reservations import api, api_async
+
+
+urlpatterns = [
+    path("sync/availability/", api.availability_api),
+    path("async/availability/", api_async.availability_api),
+]
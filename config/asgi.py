@@ -2,6 +2,10 @@
 ASGI config for the project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+
+Besides Django, it serves the Server-Sent Events stream of live booking changes
+(/api/availability/stream/, see reservations.streams), which is only available
+when running under an ASGI server (e.g. uvicorn or daphne).
 """
 
 import os
@@ -10,7 +14,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
-application = get_asgi_application()
-
+django_application = get_asgi_application()
 
+# Imported after Django is set up (it touches settings and the auth app).
+from reservations.streams import AvailabilityStreamRouter  # noqa: E402
 
+application = AvailabilityStreamRouter(django_application)
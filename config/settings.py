@@ -56,6 +56,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so session and auth queries are counted; inactive unless RESERVATION_QUERY_INSTRUMENTATION=1.
+    "reservations.instrumentation.QueryInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -182,4 +184,109 @@ else:
     # Useful for local dev without SMTP creds.
     EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
-
+# Booking emails: "immediate" sends from the request's on_commit callback; "outbox" queues them in the
+# EmailOutbox table for `manage.py process_email_outbox` (retries with exponential backoff, then dead-letters);
+# "thread" hands them to a bounded in-process thread pool (no worker process needed).
+RESERVATION_EMAIL_DELIVERY = os.environ.get("RESERVATION_EMAIL_DELIVERY", "immediate").strip().lower() or "immediate"
+RESERVATION_EMAIL_OUTBOX_BATCH_SIZE = int(os.environ.get("RESERVATION_EMAIL_OUTBOX_BATCH_SIZE", "50"))
+RESERVATION_EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get("RESERVATION_EMAIL_OUTBOX_MAX_ATTEMPTS", "5"))
+RESERVATION_EMAIL_OUTBOX_BACKOFF_SECONDS = int(os.environ.get("RESERVATION_EMAIL_OUTBOX_BACKOFF_SECONDS", "30"))
+# Outbox digest mode: rows of one batch going to the same recipient are sent as a single summary email.
+RESERVATION_EMAIL_DIGEST = os.environ.get("RESERVATION_EMAIL_DIGEST", "0") == "1"
+RESERVATION_EMAIL_DISPATCH_WORKERS = int(os.environ.get("RESERVATION_EMAIL_DISPATCH_WORKERS", "2"))
+RESERVATION_EMAIL_DISPATCH_QUEUE_SIZE = int(os.environ.get("RESERVATION_EMAIL_DISPATCH_QUEUE_SIZE", "100"))
+# What happens when the queue is full: "spill" (to RESERVATION_EMAIL_SPILL_DIR, replayed later), "block", or "drop".
+RESERVATION_EMAIL_DISPATCH_OVERFLOW = os.environ.get("RESERVATION_EMAIL_DISPATCH_OVERFLOW", "spill").strip().lower() or "spill"
+RESERVATION_EMAIL_DISPATCH_BLOCK_SECONDS = float(os.environ.get("RESERVATION_EMAIL_DISPATCH_BLOCK_SECONDS", "2"))
+RESERVATION_EMAIL_DISPATCH_DRAIN_SECONDS = float(os.environ.get("RESERVATION_EMAIL_DISPATCH_DRAIN_SECONDS", "10"))
+RESERVATION_EMAIL_SPILL_DIR = os.environ.get("RESERVATION_EMAIL_SPILL_DIR", "").strip() or str(
+    BASE_DIR / ".cache" / "email-spill"
+)
+
+# Reservations (booking concurrency)
+# "room_date" locks one (room_type, date) pair per booking; "room_type" restores the legacy RoomType row lock.
+RESERVATION_LOCK_SCOPE = os.environ.get("RESERVATION_LOCK_SCOPE", "room_date").strip() or "room_date"
+# "pessimistic" locks + checks before inserting; "optimistic" inserts first and relies on the unique constraint.
+RESERVATION_BOOKING_STRATEGY = os.environ.get("RESERVATION_BOOKING_STRATEGY", "pessimistic").strip() or "pessimistic"
+# Booking lock acquisitions slower than this (ms) are logged on "reservations.locks" with their keys.
+RESERVATION_LOCK_SLOW_MS = float(os.environ.get("RESERVATION_LOCK_SLOW_MS", "100"))
+
+# Per-request query count / DB time / duplicate SQL / lock wait, as Server-Timing headers and
+# "reservations.queries" log lines. Budgets count the queries a view runs after the session and
+# user are loaded; RESERVATION_QUERY_BUDGET_MODE=raise turns an exceeded budget into an error (tests).
+RESERVATION_QUERY_INSTRUMENTATION = os.environ.get("RESERVATION_QUERY_INSTRUMENTATION", "0") == "1"
+RESERVATION_QUERY_BUDGET_MODE = os.environ.get("RESERVATION_QUERY_BUDGET_MODE", "log")
+RESERVATION_QUERY_BUDGETS = {
+    "reservations:availability_api": 3,
+    "reservations:my_reservations": 4,  # counts, upcoming, past page, calendar feed key version
+}
+
+# Serve the JSON API with the ASGI-native (async ORM) views; only useful under config/asgi.py.
+RESERVATION_ASYNC_API = os.environ.get("RESERVATION_ASYNC_API", "0") == "1"
+
+# Live booking events for the SSE stream (ASGI only): "memory" reaches subscribers of the same
+# process; "postgres" fans out through LISTEN/NOTIFY to every worker.
+RESERVATION_EVENTS_BACKEND = os.environ.get("RESERVATION_EVENTS_BACKEND", "memory").strip().lower() or "memory"
+
+# Prometheus metrics at /metrics. Empty RESERVATION_METRICS_DIR: each process reports its own
+# counters only. Set it (one directory per deployment) when running several workers: every process
+# writes its counters there in the background, every RESERVATION_METRICS_FLUSH_SECONDS, and /metrics
+# sums the live ones. Scrapers authenticate with "Authorization: Bearer <RESERVATION_METRICS_TOKEN>";
+# without a token only staff users may read it.
+RESERVATION_METRICS_DIR = os.environ.get("RESERVATION_METRICS_DIR", "").strip()
+RESERVATION_METRICS_FLUSH_SECONDS = float(os.environ.get("RESERVATION_METRICS_FLUSH_SECONDS", "5"))
+RESERVATION_METRICS_TOKEN = os.environ.get("RESERVATION_METRICS_TOKEN", "").strip()
+
+# Longest span (in days) accepted by /api/availability/range/.
+AVAILABILITY_RANGE_MAX_DAYS = int(os.environ.get("AVAILABILITY_RANGE_MAX_DAYS", "62"))
+
+# Above this many rows (PostgreSQL planner estimate) the unfiltered reservation changelist
+# shows an estimated total instead of running COUNT(*).
+RESERVATION_ADMIN_EXACT_COUNT_LIMIT = int(os.environ.get("RESERVATION_ADMIN_EXACT_COUNT_LIMIT", "100000"))
+
+# Past reservations shown per page on "My Reservations" (keyset pagination).
+RESERVATION_PAST_PAGE_SIZE = int(os.environ.get("RESERVATION_PAST_PAGE_SIZE", "20"))
+
+# iCalendar feeds (/calendar/<token>.ics): how far back they reach and how long rendered feeds stay cached.
+RESERVATION_CALENDAR_PAST_DAYS = int(os.environ.get("RESERVATION_CALENDAR_PAST_DAYS", "90"))
+RESERVATION_CALENDAR_CACHE_TIMEOUT = int(os.environ.get("RESERVATION_CALENDAR_CACHE_TIMEOUT", "300"))
+
+# Rows fetched per round trip by the streaming reservation export (view + export_reservations command).
+RESERVATION_EXPORT_CHUNK_SIZE = int(os.environ.get("RESERVATION_EXPORT_CHUNK_SIZE", "2000"))
+
+# Most items accepted by one POST /api/reservations/batch/ request.
+RESERVATION_BATCH_MAX_ITEMS = int(os.environ.get("RESERVATION_BATCH_MAX_ITEMS", "50"))
+
+# Most occurrences one recurring reservation (POST /api/reservations/series/) may expand to.
+RESERVATION_SERIES_MAX_OCCURRENCES = int(os.environ.get("RESERVATION_SERIES_MAX_OCCURRENCES", "120"))
+
+
+# Caches
+# The availability API caches its responses per date; "file" shares entries (and invalidations)
+# between worker processes on one host. "locmem" invalidates only inside the process that handled
+# the booking: other workers keep serving the old answer (booked slots shown as free) for up to
+# AVAILABILITY_CACHE_TIMEOUT, so it only suits a single process. The default follows
+# WEB_CONCURRENCY (read by gunicorn and uvicorn): "file" for more than one worker, else "locmem".
+_AVAILABILITY_CACHE_DEFAULT = "file" if int(os.environ.get("WEB_CONCURRENCY", "1") or "1") > 1 else "locmem"
+AVAILABILITY_CACHE_BACKEND = (
+    os.environ.get("AVAILABILITY_CACHE_BACKEND", "").strip().lower() or _AVAILABILITY_CACHE_DEFAULT
+)
+AVAILABILITY_CACHE_ALIAS = "availability"
+AVAILABILITY_CACHE_TIMEOUT = int(os.environ.get("AVAILABILITY_CACHE_TIMEOUT", "60"))
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+
+if AVAILABILITY_CACHE_BACKEND == "file":
+    CACHES[AVAILABILITY_CACHE_ALIAS] = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("AVAILABILITY_CACHE_DIR", "").strip() or str(BASE_DIR / ".cache" / "availability"),
+    }
+else:
+    CACHES[AVAILABILITY_CACHE_ALIAS] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "availability",
+    }
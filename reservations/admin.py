@@ -1,10 +1,21 @@
+from datetime import timedelta
+
 from django import forms
 from django.contrib import admin
-from django.db.models import Q
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.urls import reverse
 from django.utils import timezone
 from django.utils.html import format_html
 
-from .models import Reservation, RoomType
+from .availability import mark_slot_released, mark_slot_reserved
+from .availability_cache import invalidate_availability_on_commit
+from .calendar_feeds import FEED_KIND_ROOM, feed_token, rotate_feed
+from .conflicts import CONFLICT_MESSAGE, slot_is_taken
+from .events import BookingEvent, publish_on_commit
+from .models import CalendarFeedKey, EmailOutbox, Reservation, ReservationSeries, RoomType
+from .outbox import requeue_dead_emails
+from .pagination import EstimatedCountPaginator
 
 
 admin.site.site_header = "Room Reservation Admin"
@@ -24,15 +35,9 @@ class ReservationAdminForm(forms.ModelForm):
         slot = cleaned.get("slot")
 
         if room_type and date and slot is not None:
-            conflict = (
-                Reservation.objects.filter(room_type=room_type, date=date, slot=slot)
-                .exclude(pk=self.instance.pk)
-                .exists()
-            )
-            if conflict:
-                raise forms.ValidationError(
-                    "This room type is already reserved for that date and time slot."
-                )
+            # Memoized on the instance: the model clean() of this save cycle reuses the answer.
+            if slot_is_taken(self.instance, room_type.pk, date, slot):
+                raise forms.ValidationError(CONFLICT_MESSAGE)
         return cleaned
 
 
@@ -48,22 +53,59 @@ class ReservationStatusFilter(admin.SimpleListFilter):
         if not value:
             return queryset
 
-        today = timezone.localdate()
-        current_hour = timezone.localtime().hour
-
         if value == "ongoing":
-            return queryset.filter(Q(date__gt=today) | Q(date=today, slot__gte=current_hour))
+            return queryset.upcoming()
         if value == "past":
-            return queryset.filter(Q(date__lt=today) | Q(date=today, slot__lt=current_hour))
+            return queryset.past()
         return queryset
 
 
+class ReservationDateFilter(admin.SimpleListFilter):
+    """
+    Fixed date windows around today. Each choice is a bounded range on `date`, so
+    neither the sidebar nor the filtered list needs a scan over every distinct date.
+    """
+
+    title = "date"
+    parameter_name = "when"
+
+    # value -> (label, first day offset, last day offset), offsets relative to today
+    WINDOWS = {
+        "today": ("Today", 0, 0),
+        "next7": ("Next 7 days", 0, 6),
+        "next30": ("Next 30 days", 0, 29),
+        "past7": ("Past 7 days", -7, -1),
+        "past30": ("Past 30 days", -30, -1),
+    }
+
+    def lookups(self, request, model_admin):
+        return tuple((value, label) for value, (label, _, _) in self.WINDOWS.items())
+
+    def queryset(self, request, queryset):
+        window = self.WINDOWS.get(self.value())
+        if window is None:
+            return queryset
+        today = timezone.localdate()
+        _, first, last = window
+        return queryset.filter(date__range=(today + timedelta(days=first), today + timedelta(days=last)))
+
+
 @admin.register(RoomType)
 class RoomTypeAdmin(admin.ModelAdmin):
-    list_display = ("name", "capacity_range", "is_active", "display_order", "created_at")
+    list_display = ("name", "capacity_range", "is_active", "display_order", "calendar_feed", "created_at")
     list_filter = ("is_active",)
     search_fields = ("name",)
     ordering = ("display_order", "name")
+    actions = ("rotate_calendar_feed",)
+
+    def get_queryset(self, request):
+        # Feed key version per row, so the feed links need no query each.
+        versions = CalendarFeedKey.objects.filter(kind=FEED_KIND_ROOM, object_id=OuterRef("pk")).values("version")
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(calendar_feed_version=Coalesce(Subquery(versions[:1]), Value(1), output_field=IntegerField()))
+        )
 
     @admin.display(description="Capacity")
     def capacity_range(self, obj: RoomType) -> str:
@@ -75,21 +117,38 @@ class RoomTypeAdmin(admin.ModelAdmin):
             return f"≥ {obj.capacity_min}"
         return f"{obj.capacity_min}–{obj.capacity_max}"
 
+    @admin.display(description="Calendar")
+    def calendar_feed(self, obj: RoomType) -> str:
+        version = getattr(obj, "calendar_feed_version", None)
+        url = reverse("reservations:calendar_feed", args=[feed_token(FEED_KIND_ROOM, obj.pk, version)])
+        return format_html('<a href="{}">.ics feed</a>', url)
+
+    @admin.action(description="Replace the calendar feed links of selected room types")
+    def rotate_calendar_feed(self, request, queryset):
+        room_type_ids = list(queryset.values_list("pk", flat=True))
+        for room_type_id in room_type_ids:
+            rotate_feed(FEED_KIND_ROOM, room_type_id)
+        self.message_user(request, f"{len(room_type_ids)} calendar feed link(s) replaced.")
+
 
 @admin.register(Reservation)
 class ReservationAdmin(admin.ModelAdmin):
     form = ReservationAdminForm
     list_display = ("id", "user_email", "room_type", "date", "time_slot", "status_badge", "created_at")
-    list_filter = ("room_type", "date", ReservationStatusFilter)
+    list_filter = ("room_type", ReservationDateFilter, ReservationStatusFilter)
+    # Substring search (so "@example.com" finds a whole domain); migration 0006 backs it with
+    # pg_trgm GIN indexes on PostgreSQL.
     search_fields = ("user__email", "user__username")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     ordering = ("-date", "slot")
-    readonly_fields = ("status_display", "created_at", "updated_at")
+    readonly_fields = ("status_display", "series", "created_at", "updated_at")
     autocomplete_fields = ("user", "room_type")
     list_select_related = ("user", "room_type")
 
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
-        return queryset.select_related("user", "room_type")
+        return queryset.select_related("user", "room_type").with_status()
 
     @admin.display(description="User", ordering="user__email")
     def user_email(self, obj: Reservation) -> str:
@@ -99,7 +158,7 @@ class ReservationAdmin(admin.ModelAdmin):
     def time_slot(self, obj: Reservation) -> str:
         return obj.get_slot_display()
 
-    @admin.display(description="Status", ordering="date")
+    @admin.display(description="Status", ordering="is_ongoing")
     def status_badge(self, obj: Reservation) -> str:
         color = "#c9b26b" if obj.is_future() else "#7e8571"
         return format_html(
@@ -157,5 +216,64 @@ class ReservationAdmin(admin.ModelAdmin):
     def save_model(self, request, obj, form, change):
         # Ensure model-level validation (including double-booking check) runs before saving.
         obj.full_clean()
-        return super().save_model(request, obj, form, change)
+        previous = None
+        if change:
+            previous = Reservation.objects.filter(pk=obj.pk).values_list("room_type_id", "date", "slot").first()
+        result = super().save_model(request, obj, form, change)
+        # Keep the DailyAvailability index in sync (the admin view already runs inside a transaction).
+        if previous:
+            mark_slot_released(*previous)
+            invalidate_availability_on_commit(previous[1])
+            publish_on_commit(BookingEvent("released", *previous))
+        mark_slot_reserved(obj.room_type_id, obj.date, obj.slot)
+        invalidate_availability_on_commit(obj.date)
+        publish_on_commit(BookingEvent("reserved", obj.room_type_id, obj.date, obj.slot))
+        return result
+
+    def delete_model(self, request, obj):
+        room_type_id, date, slot = obj.room_type_id, obj.date, obj.slot
+        super().delete_model(request, obj)
+        mark_slot_released(room_type_id, date, slot)
+        invalidate_availability_on_commit(date)
+        publish_on_commit(BookingEvent("released", room_type_id, date, slot))
+
+
+@admin.register(ReservationSeries)
+class ReservationSeriesAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "room_type", "frequency", "interval", "slot", "start_date", "end_date", "occurrences")
+    list_filter = ("room_type", "frequency")
+    search_fields = ("user__email", "user__username")
+    list_select_related = ("user", "room_type")
+    readonly_fields = ("user", "room_type", "slot", "frequency", "interval", "start_date", "end_date", "created_at")
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(occurrence_count=Count("reservations"))
+
+    @admin.display(description="Booked occurrences", ordering="occurrence_count")
+    def occurrences(self, obj: ReservationSeries) -> int:
+        return obj.occurrence_count
+
+    def has_add_permission(self, request):
+        # Series are created through the booking API so conflicts are checked and the index stays in sync.
+        return False
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ("id", "to_email", "event", "status", "attempts", "next_attempt_at", "created_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("^to_email",)
+    readonly_fields = [field.name for field in EmailOutbox._meta.fields]
+    actions = ("requeue",)
+
+    @admin.display(description="Event")
+    def event(self, obj: EmailOutbox) -> str:
+        return obj.payload.get("event", "")
+
+    def has_add_permission(self, request):
+        return False
 
+    @admin.action(description="Re-queue selected dead emails")
+    def requeue(self, request, queryset):
+        count = requeue_dead_emails(queryset)
+        self.message_user(request, f"{count} email(s) re-queued.")
@@ -1,22 +1,54 @@
 from __future__ import annotations
 
+import hashlib
 import json
+from dataclasses import dataclass
 from datetime import date as date_type
+from datetime import datetime, timedelta
 
+from django.conf import settings
 from django.core.exceptions import PermissionDenied
 from django.core.exceptions import ValidationError
-from django.db.models import Count
-from django.http import JsonResponse
+from django.db.models import Count, Max
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils.http import parse_etags, quote_etag
 from django.views.decorators.http import require_GET
 from django.views.decorators.http import require_POST
 
-from .models import Reservation, RoomType, TimeSlot
+from .availability import (
+    FULL_MASK,
+    mask_count,
+    mask_to_slots,
+    reserved_masks,
+    reserved_masks_for_range,
+    slot_bit,
+)
+from .availability_cache import (
+    availability_cache_stats,
+    date_version,
+    get_cached_availability,
+    set_cached_availability,
+)
+from .email_dispatch import email_dispatch_stats
+from .emails import get_email_delivery
+from .metrics import instrument_endpoint
+from .models import Reservation, ReservationSeries, RoomType, TimeSlot
 from .services import (
+    BATCH_ERROR_UNAVAILABLE,
+    BATCH_MODE_ATOMIC,
+    BATCH_MODE_BEST_EFFORT,
+    BatchItemResult,
+    BatchReservationError,
     PastReservationError,
     ReservationInput,
+    SeriesConflictError,
+    SeriesInput,
+    SeriesResult,
     SlotUnavailableError,
     cancel_reservation,
     create_reservation,
+    create_reservation_series,
+    create_reservations_batch,
     update_reservation,
 )
 
@@ -25,16 +57,31 @@ def _parse_date(value: str) -> date_type:
     return date_type.fromisoformat(value)
 
 
-@require_GET
-def availability_api(request):
-    """
-    GET /api/availability/?date=YYYY-MM-DD[&room_type_id=123]
+@dataclass(frozen=True)
+class AvailabilityQuery:
+    target_date: date_type
+    room_filter: int | None
+    summary: bool
+    exclude_id: int | None
 
-    Returns reserved slot values per room type for the provided date.
-    """
-    if not request.user.is_authenticated:
-        return JsonResponse({"error": "Authentication required."}, status=401)
+    @property
+    def cacheable(self) -> bool:
+        # exclude_reservation_id answers are specific to one edit form, so only the shared answers are cached.
+        return self.exclude_id is None
+
+
+@dataclass(frozen=True)
+class RangeQuery:
+    start: date_type
+    end: date_type
+    room_filter: int | None
+
+    @property
+    def days(self) -> int:
+        return (self.end - self.start).days + 1
 
+
+def _parse_availability_query(request) -> AvailabilityQuery | JsonResponse:
     date_str = request.GET.get("date", "").strip()
     if not date_str:
         return JsonResponse({"error": "Missing required query param: date"}, status=400)
@@ -53,63 +100,414 @@ def availability_api(request):
             return JsonResponse({"error": "Invalid exclude_reservation_id. Expected an integer."}, status=400)
         exclude_id = int(exclude_reservation_id)
 
-    room_types_qs = RoomType.objects.filter(is_active=True).only("id", "name").order_by("display_order", "name")
+    room_filter = None
     if room_type_id:
         if not room_type_id.isdigit():
             return JsonResponse({"error": "Invalid room_type_id. Expected an integer."}, status=400)
-        room_types_qs = room_types_qs.filter(id=int(room_type_id))
+        room_filter = int(room_type_id)
 
-    room_types = list(room_types_qs)
-    room_type_ids = [rt.id for rt in room_types]
+    return AvailabilityQuery(target_date=target_date, room_filter=room_filter, summary=summary, exclude_id=exclude_id)
 
-    reserved_qs = Reservation.objects.filter(date=target_date, room_type_id__in=room_type_ids)
-    if exclude_id is not None:
-        reserved_qs = reserved_qs.exclude(id=exclude_id)
 
-    if summary:
-        # Summary mode is intentionally lightweight for the Room Cards UI.
-        # We reuse the same DB source-of-truth but only return counts (not per-slot arrays),
-        # so we can update card badges without fetching detailed availability for all rooms.
-        counts = reserved_qs.values("room_type_id").annotate(reserved_count=Count("slot"))
-        count_map: dict[int, int] = {row["room_type_id"]: int(row["reserved_count"]) for row in counts}
+def _parse_range_query(request) -> RangeQuery | JsonResponse:
+    start_str = request.GET.get("start", "").strip()
+    end_str = request.GET.get("end", "").strip()
+    if not start_str or not end_str:
+        return JsonResponse({"error": "Missing required query params: start, end"}, status=400)
 
-        return JsonResponse(
-            {
-                "date": target_date.isoformat(),
-                "total_slots": len(TimeSlot.choices),
-                "room_types": [
-                    {
-                        "id": rt.id,
-                        "name": rt.name,
-                        "reserved_count": count_map.get(rt.id, 0),
-                    }
-                    for rt in room_types
-                ],
-            }
+    try:
+        start = _parse_date(start_str)
+        end = _parse_date(end_str)
+    except ValueError:
+        return JsonResponse({"error": "Invalid date. Expected YYYY-MM-DD."}, status=400)
+
+    if end < start:
+        return JsonResponse({"error": "end must be on or after start."}, status=400)
+
+    max_days = getattr(settings, "AVAILABILITY_RANGE_MAX_DAYS", 62)
+    if (end - start).days + 1 > max_days:
+        return JsonResponse({"error": f"Date range too long (max {max_days} days)."}, status=400)
+
+    room_type_id = request.GET.get("room_type_id", "").strip()
+    room_filter = None
+    if room_type_id:
+        if not room_type_id.isdigit():
+            return JsonResponse({"error": "Invalid room_type_id. Expected an integer."}, status=400)
+        room_filter = int(room_type_id)
+
+    return RangeQuery(start=start, end=end, room_filter=room_filter)
+
+
+def _parse_reservation_input(request) -> ReservationInput | JsonResponse:
+    """
+    Validate the JSON body shared by the create and update endpoints.
+    """
+    try:
+        payload = json.loads(request.body.decode("utf-8") or "{}")
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON payload."}, status=400)
+
+    data = _reservation_input_from_payload(payload)
+    if isinstance(data, str):
+        return JsonResponse({"error": data}, status=400)
+    return data
+
+
+def _reservation_input_from_payload(payload) -> ReservationInput | str:
+    """
+    ReservationInput from one {room_type_id, date, slot} object, or the error message.
+    """
+    if not isinstance(payload, dict):
+        return "Expected a JSON object."
+
+    room_type_id = payload.get("room_type_id")
+    date_str = payload.get("date") or ""
+    slot = payload.get("slot")
+
+    if not isinstance(room_type_id, int):
+        return "room_type_id must be an integer."
+    if not isinstance(date_str, str) or not date_str.strip():
+        return "date is required."
+    if not isinstance(slot, int):
+        return "slot must be an integer."
+
+    try:
+        target_date = _parse_date(date_str.strip())
+    except ValueError:
+        return "Invalid date. Expected YYYY-MM-DD."
+
+    return ReservationInput(room_type_id=room_type_id, date=target_date, slot=slot)
+
+
+def _parse_batch_input(request) -> tuple[list[ReservationInput], str] | JsonResponse:
+    """
+    Validate the batch endpoint body: {"items": [{room_type_id, date, slot}, ...], "mode": "atomic"|"best_effort"}.
+    """
+    try:
+        payload = json.loads(request.body.decode("utf-8") or "{}")
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON payload."}, status=400)
+    if not isinstance(payload, dict):
+        return JsonResponse({"error": "Expected a JSON object."}, status=400)
+
+    mode = payload.get("mode", BATCH_MODE_ATOMIC)
+    if mode not in {BATCH_MODE_ATOMIC, BATCH_MODE_BEST_EFFORT}:
+        return JsonResponse({"error": "mode must be 'atomic' or 'best_effort'."}, status=400)
+
+    raw_items = payload.get("items")
+    if not isinstance(raw_items, list) or not raw_items:
+        return JsonResponse({"error": "items must be a non-empty list."}, status=400)
+
+    max_items = getattr(settings, "RESERVATION_BATCH_MAX_ITEMS", 50)
+    if len(raw_items) > max_items:
+        return JsonResponse({"error": f"Too many items (max {max_items})."}, status=400)
+
+    items = []
+    for index, raw_item in enumerate(raw_items):
+        data = _reservation_input_from_payload(raw_item)
+        if isinstance(data, str):
+            return JsonResponse({"error": f"items[{index}]: {data}"}, status=400)
+        items.append(data)
+    return items, mode
+
+
+def _parse_series_input(request) -> tuple[SeriesInput, bool] | JsonResponse:
+    """
+    Validate the series endpoint body; returns (SeriesInput, skip_conflicts).
+    """
+    try:
+        payload = json.loads(request.body.decode("utf-8") or "{}")
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON payload."}, status=400)
+    if not isinstance(payload, dict):
+        return JsonResponse({"error": "Expected a JSON object."}, status=400)
+
+    room_type_id = payload.get("room_type_id")
+    slot = payload.get("slot")
+    frequency = payload.get("frequency", ReservationSeries.Frequency.WEEKLY)
+    interval = payload.get("interval", 1)
+    skip_conflicts = payload.get("skip_conflicts", True)
+
+    if not isinstance(room_type_id, int):
+        return JsonResponse({"error": "room_type_id must be an integer."}, status=400)
+    if not isinstance(slot, int):
+        return JsonResponse({"error": "slot must be an integer."}, status=400)
+    if frequency not in ReservationSeries.Frequency.values:
+        return JsonResponse({"error": "frequency must be 'daily' or 'weekly'."}, status=400)
+    if not isinstance(interval, int):
+        return JsonResponse({"error": "interval must be an integer."}, status=400)
+    if not isinstance(skip_conflicts, bool):
+        return JsonResponse({"error": "skip_conflicts must be a boolean."}, status=400)
+
+    dates = {}
+    for name in ("start_date", "end_date"):
+        value = payload.get(name)
+        if not isinstance(value, str) or not value.strip():
+            return JsonResponse({"error": f"{name} is required."}, status=400)
+        try:
+            dates[name] = _parse_date(value.strip())
+        except ValueError:
+            return JsonResponse({"error": "Invalid date. Expected YYYY-MM-DD."}, status=400)
+
+    data = SeriesInput(
+        room_type_id=room_type_id,
+        slot=slot,
+        frequency=frequency,
+        interval=interval,
+        **dates,
+    )
+    return data, skip_conflicts
+
+
+def _active_room_types(room_filter: int | None):
+    room_types_qs = RoomType.objects.filter(is_active=True).only("id", "name").order_by("display_order", "name")
+    if room_filter is not None:
+        room_types_qs = room_types_qs.filter(id=room_filter)
+    return room_types_qs
+
+
+@instrument_endpoint("availability")
+@require_GET
+def availability_api(request):
+    """
+    GET /api/availability/?date=YYYY-MM-DD[&room_type_id=123]
+
+    Returns reserved slot values per room type for the provided date.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "Authentication required."}, status=401)
+
+    query = _parse_availability_query(request)
+    if isinstance(query, JsonResponse):
+        return query
+
+    # One version read per request: the cache lookup, the ETag and the cache write must agree.
+    version = date_version(query.target_date)
+    if query.cacheable:
+        cached = get_cached_availability(query.target_date, version, query.room_filter, query.summary)
+        if cached is not None:
+            return _cached_availability_response(request, cached)
+
+    room_types = list(_active_room_types(query.room_filter))
+
+    stats = _reservation_stats_qs(query.target_date, room_types).aggregate(
+        count=Count("id"),
+        last_updated=Max("updated_at"),
+    )
+    etag = _availability_etag(
+        query,
+        version=version,
+        room_types=room_types,
+        count=stats["count"],
+        last_updated=stats["last_updated"],
+    )
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+
+    # One DailyAvailability row per room instead of scanning Reservation rows.
+    mask_map = reserved_masks(query.target_date, [rt.id for rt in room_types])
+    if query.exclude_id is not None:
+        excluded = _excluded_reservation_qs(query, mask_map).first()
+        _release_excluded(mask_map, excluded)
+
+    payload = _availability_payload(query.target_date, room_types=room_types, mask_map=mask_map, summary=query.summary)
+    if query.cacheable:
+        set_cached_availability(
+            query.target_date, version, query.room_filter, query.summary, {"etag": etag, "payload": payload}
         )
+    return _availability_response(payload, etag, cache_status="MISS" if query.cacheable else None)
 
-    reserved_rows = reserved_qs.values("room_type_id", "slot")
 
-    reserved_map: dict[int, set[int]] = {rt.id: set() for rt in room_types}
-    for row in reserved_rows:
-        reserved_map[row["room_type_id"]].add(int(row["slot"]))
+def _reservation_stats_qs(target_date: date_type, room_types: list[RoomType]):
+    return Reservation.objects.filter(date=target_date, room_type_id__in=[rt.id for rt in room_types])
 
-    return JsonResponse(
-        {
+
+def _excluded_reservation_qs(query: AvailabilityQuery, mask_map: dict[int, int]):
+    return Reservation.objects.filter(
+        id=query.exclude_id, date=query.target_date, room_type_id__in=list(mask_map)
+    ).values_list("room_type_id", "slot")
+
+
+def _release_excluded(mask_map: dict[int, int], excluded: tuple[int, int] | None) -> None:
+    if excluded:
+        excluded_room_type_id, excluded_slot = excluded
+        mask_map[excluded_room_type_id] &= FULL_MASK ^ slot_bit(excluded_slot)
+
+
+def _availability_etag(
+    query: AvailabilityQuery,
+    *,
+    version: str,
+    room_types: list[RoomType],
+    count: int,
+    last_updated: datetime | None,
+) -> str:
+    """
+    Strong ETag for an availability answer, computed without building the body:
+    the date's booking version plus COUNT/MAX(updated_at) of its reservations
+    (one aggregate over idx_res_room_date) and the room types listed.
+    """
+    signature = "|".join(
+        [
+            query.target_date.isoformat(),
+            version,
+            str(count),
+            last_updated.isoformat() if last_updated else "",
+            ",".join(f"{rt.id}:{rt.name}" for rt in room_types),
+            str(int(query.summary)),
+            str(query.exclude_id or ""),
+        ]
+    )
+    return quote_etag(hashlib.sha1(signature.encode("utf-8")).hexdigest())
+
+
+def _etag_matches(request, etag: str) -> bool:
+    header = request.headers.get("If-None-Match", "")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return "*" in etags or etag in etags
+
+
+def _not_modified(etag: str) -> HttpResponseNotModified:
+    return _with_etag(HttpResponseNotModified(), etag)
+
+
+def _with_etag(response, etag: str):
+    response["ETag"] = etag
+    # Let clients keep the body but revalidate on every poll.
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _availability_response(payload: dict, etag: str, *, cache_status: str | None) -> JsonResponse:
+    response = JsonResponse(payload)
+    if cache_status:
+        response["X-Cache"] = cache_status
+    return _with_etag(response, etag)
+
+
+def _cached_availability_response(request, cached: dict):
+    if _etag_matches(request, cached["etag"]):
+        return _not_modified(cached["etag"])
+    return _availability_response(cached["payload"], cached["etag"], cache_status="HIT")
+
+
+def _availability_payload(
+    target_date: date_type,
+    *,
+    room_types: list[RoomType],
+    mask_map: dict[int, int],
+    summary: bool,
+) -> dict:
+    if summary:
+        # Summary mode is intentionally lightweight for the Room Cards UI.
+        # We reuse the same DB source-of-truth but only return counts (not per-slot arrays),
+        # so we can update card badges without fetching detailed availability for all rooms.
+        return {
             "date": target_date.isoformat(),
-            "time_slots": [{"value": v, "label": label} for v, label in TimeSlot.choices],
+            "total_slots": len(TimeSlot.choices),
             "room_types": [
                 {
                     "id": rt.id,
                     "name": rt.name,
-                    "reserved_slots": sorted(reserved_map.get(rt.id, set())),
+                    "reserved_count": mask_count(mask_map.get(rt.id, 0)),
                 }
                 for rt in room_types
             ],
         }
-    )
 
+    return {
+        "date": target_date.isoformat(),
+        "time_slots": [{"value": v, "label": label} for v, label in TimeSlot.choices],
+        "room_types": [
+            {
+                "id": rt.id,
+                "name": rt.name,
+                "reserved_slots": mask_to_slots(mask_map.get(rt.id, 0)),
+            }
+            for rt in room_types
+        ],
+    }
 
+
+@require_GET
+def availability_cache_stats_api(request):
+    """
+    GET /api/availability/cache-stats/ (staff only)
+
+    Hit/miss counters of the availability cache for the process serving the request.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "Authentication required."}, status=401)
+    if not request.user.is_staff:
+        return JsonResponse({"error": "Staff access required."}, status=403)
+
+    return JsonResponse(availability_cache_stats())
+
+
+@require_GET
+def email_dispatch_stats_api(request):
+    """
+    GET /api/emails/dispatch-stats/ (staff only)
+
+    Queue depth and backpressure counters of the background email dispatcher
+    (RESERVATION_EMAIL_DELIVERY=thread) for the process serving the request.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "Authentication required."}, status=401)
+    if not request.user.is_staff:
+        return JsonResponse({"error": "Staff access required."}, status=403)
+
+    return JsonResponse({"delivery": get_email_delivery(), "dispatcher": email_dispatch_stats()})
+
+
+@instrument_endpoint("availability_range")
+@require_GET
+def availability_range_api(request):
+    """
+    GET /api/availability/range/?start=YYYY-MM-DD&end=YYYY-MM-DD[&room_type_id=123]
+
+    Returns one reserved-slot bitmask per room type per day (start..end inclusive):
+    bit i set means time_slots[i] is reserved. The span is capped by
+    settings.AVAILABILITY_RANGE_MAX_DAYS.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "Authentication required."}, status=401)
+
+    query = _parse_range_query(request)
+    if isinstance(query, JsonResponse):
+        return query
+
+    room_types = list(_active_room_types(query.room_filter))
+    range_masks = reserved_masks_for_range(query.start, query.end, [rt.id for rt in room_types])
+    return JsonResponse(_range_payload(query, room_types=room_types, range_masks=range_masks))
+
+
+def _range_payload(
+    query: RangeQuery,
+    *,
+    room_types: list[RoomType],
+    range_masks: dict[int, dict[date_type, int]],
+) -> dict:
+    dates = [query.start + timedelta(days=offset) for offset in range(query.days)]
+    return {
+        "start": query.start.isoformat(),
+        "end": query.end.isoformat(),
+        "days": query.days,
+        "time_slots": [{"value": v, "label": label} for v, label in TimeSlot.choices],
+        "room_types": [
+            {
+                "id": rt.id,
+                "name": rt.name,
+                "masks": [range_masks[rt.id].get(day, 0) for day in dates],
+            }
+            for rt in room_types
+        ],
+    }
+
+
+@instrument_endpoint("create")
 @require_POST
 def create_reservation_api(request):
     """
@@ -122,103 +520,211 @@ def create_reservation_api(request):
     if not request.user.is_authenticated:
         return JsonResponse({"error": "Authentication required."}, status=401)
 
+    data = _parse_reservation_input(request)
+    if isinstance(data, JsonResponse):
+        return data
+
     try:
-        payload = json.loads(request.body.decode("utf-8") or "{}")
-    except json.JSONDecodeError:
-        return JsonResponse({"error": "Invalid JSON payload."}, status=400)
+        reservation = create_reservation(user=request.user, data=data)
+    except (ValidationError, PastReservationError, SlotUnavailableError, RoomType.DoesNotExist) as exc:
+        return _reservation_error_response(exc)
 
-    room_type_id = payload.get("room_type_id")
-    date_str = (payload.get("date") or "").strip()
-    slot = payload.get("slot")
+    return _created_response(reservation)
 
-    if not isinstance(room_type_id, int):
-        return JsonResponse({"error": "room_type_id must be an integer."}, status=400)
-    if not date_str:
-        return JsonResponse({"error": "date is required."}, status=400)
-    if not isinstance(slot, int):
-        return JsonResponse({"error": "slot must be an integer."}, status=400)
 
-    try:
-        target_date = _parse_date(date_str)
-    except ValueError:
-        return JsonResponse({"error": "Invalid date. Expected YYYY-MM-DD."}, status=400)
+@instrument_endpoint("batch")
+@require_POST
+def batch_reservation_api(request):
+    """
+    POST /api/reservations/batch/
+    Payload (JSON):
+      - items: list of {room_type_id, date, slot} (max RESERVATION_BATCH_MAX_ITEMS)
+      - mode: "atomic" (default, all or nothing) | "best_effort"
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "Authentication required."}, status=401)
+
+    parsed = _parse_batch_input(request)
+    if isinstance(parsed, JsonResponse):
+        return parsed
+    items, mode = parsed
 
     try:
-        reservation = create_reservation(
-            user=request.user,
-            data=ReservationInput(room_type_id=room_type_id, date=target_date, slot=slot),
-        )
-    except ValidationError as exc:
-        return JsonResponse({"error": "Validation error.", "details": exc.message_dict}, status=400)
-    except PastReservationError as exc:
-        return JsonResponse({"error": str(exc)}, status=400)
-    except SlotUnavailableError as exc:
+        results = create_reservations_batch(user=request.user, items=items, mode=mode)
+    except (BatchReservationError, SlotUnavailableError) as exc:
+        return _batch_error_response(exc)
+
+    return _batch_response(results, mode)
+
+
+def _batch_item_payload(result: BatchItemResult) -> dict:
+    item = {
+        "index": result.index,
+        "room_type_id": result.data.room_type_id,
+        "date": result.data.date.isoformat(),
+        "slot": result.data.slot,
+        "success": result.ok,
+    }
+    if result.reservation is not None:
+        item["reservation_id"] = result.reservation.id
+    if not result.ok:
+        item["error"] = result.error
+        item["code"] = result.error_code
+    return item
+
+
+def _batch_response(results: list[BatchItemResult], mode: str) -> JsonResponse:
+    created = sum(1 for result in results if result.reservation is not None)
+    return JsonResponse(
+        {
+            "success": created == len(results),
+            "mode": mode,
+            "created": created,
+            "failed": len(results) - created,
+            "results": [_batch_item_payload(result) for result in results],
+        },
+        status=201 if created else _batch_failure_status(results),
+    )
+
+
+def _batch_error_response(exc: Exception) -> JsonResponse:
+    if isinstance(exc, SlotUnavailableError):
         return JsonResponse({"error": str(exc)}, status=409)
-    except RoomType.DoesNotExist:
-        return JsonResponse({"error": "Room type not found."}, status=404)
 
+    results = exc.results
     return JsonResponse(
         {
-            "success": True,
-            "reservation_id": reservation.id,
-            "message": "Reservation created successfully.",
+            "error": str(exc),
+            "mode": BATCH_MODE_ATOMIC,
+            "created": 0,
+            "failed": sum(1 for result in results if not result.ok),
+            "results": [_batch_item_payload(result) for result in results],
         },
-        status=201,
+        status=_batch_failure_status(results),
     )
 
 
+def _batch_failure_status(results: list[BatchItemResult]) -> int:
+    # 409 when a slot was taken (retrying with other slots may work), 400 for invalid input.
+    return 409 if any(result.error_code == BATCH_ERROR_UNAVAILABLE for result in results) else 400
+
+
+@instrument_endpoint("series")
 @require_POST
-def update_reservation_api(request, reservation_id: int):
+def series_reservation_api(request):
     """
-    POST /api/reservations/<id>/update/
+    POST /api/reservations/series/
     Payload (JSON):
       - room_type_id: int
-      - date: YYYY-MM-DD
       - slot: int (TimeSlot value)
+      - start_date, end_date: YYYY-MM-DD (inclusive)
+      - frequency: "weekly" (default, on start_date's weekday) | "daily"
+      - interval: int, repeat every N weeks/days (default 1)
+      - skip_conflicts: bool (default true); false fails the whole series on any conflict
     """
     if not request.user.is_authenticated:
         return JsonResponse({"error": "Authentication required."}, status=401)
 
+    parsed = _parse_series_input(request)
+    if isinstance(parsed, JsonResponse):
+        return parsed
+    data, skip_conflicts = parsed
+
     try:
-        payload = json.loads(request.body.decode("utf-8") or "{}")
-    except json.JSONDecodeError:
-        return JsonResponse({"error": "Invalid JSON payload."}, status=400)
+        result = create_reservation_series(user=request.user, data=data, skip_conflicts=skip_conflicts)
+    except (ValidationError, PastReservationError, SlotUnavailableError, RoomType.DoesNotExist) as exc:
+        return _series_error_response(exc)
 
-    room_type_id = payload.get("room_type_id")
-    date_str = (payload.get("date") or "").strip()
-    slot = payload.get("slot")
+    return _series_created_response(result)
 
-    if not isinstance(room_type_id, int):
-        return JsonResponse({"error": "room_type_id must be an integer."}, status=400)
-    if not date_str:
-        return JsonResponse({"error": "date is required."}, status=400)
-    if not isinstance(slot, int):
-        return JsonResponse({"error": "slot must be an integer."}, status=400)
 
-    try:
-        target_date = _parse_date(date_str)
-    except ValueError:
-        return JsonResponse({"error": "Invalid date. Expected YYYY-MM-DD."}, status=400)
+def _series_created_response(result: SeriesResult) -> JsonResponse:
+    return JsonResponse(
+        {
+            "success": True,
+            "series_id": result.series.id,
+            "created": len(result.reservations),
+            "reservation_ids": [reservation.id for reservation in result.reservations],
+            "conflicts": [day.isoformat() for day in result.conflicts],
+            "skipped_past": [day.isoformat() for day in result.skipped_past],
+            "message": "Recurring reservation created.",
+        },
+        status=201,
+    )
 
-    try:
-        reservation = update_reservation(
-            user=request.user,
-            reservation_id=reservation_id,
-            new_data=ReservationInput(room_type_id=room_type_id, date=target_date, slot=slot),
+
+def _series_error_response(exc: Exception) -> JsonResponse:
+    if isinstance(exc, SeriesConflictError):
+        return JsonResponse(
+            {"error": str(exc), "conflicts": [day.isoformat() for day in exc.conflicts]},
+            status=409,
         )
-    except Reservation.DoesNotExist:
+    return _reservation_error_response(exc)
+
+
+def _created_response(reservation: Reservation) -> JsonResponse:
+    return JsonResponse(
+        {
+            "success": True,
+            "reservation_id": reservation.id,
+            "message": "Reservation created successfully.",
+        },
+        status=201,
+    )
+
+
+def _reservation_error_response(exc: Exception, *, action: str = "edit") -> JsonResponse:
+    """
+    Map reservation domain errors to the JSON error responses of the booking endpoints.
+    """
+    if isinstance(exc, Reservation.DoesNotExist):
         return JsonResponse({"error": "Reservation not found."}, status=404)
-    except RoomType.DoesNotExist:
+    if isinstance(exc, RoomType.DoesNotExist):
         return JsonResponse({"error": "Room type not found."}, status=404)
-    except PermissionDenied:
-        return JsonResponse({"error": "You do not have permission to edit this reservation."}, status=403)
-    except ValidationError as exc:
+    if isinstance(exc, PermissionDenied):
+        return JsonResponse({"error": f"You do not have permission to {action} this reservation."}, status=403)
+    if isinstance(exc, ValidationError):
         return JsonResponse({"error": "Validation error.", "details": exc.message_dict}, status=400)
-    except PastReservationError as exc:
+    if isinstance(exc, PastReservationError):
         return JsonResponse({"error": str(exc)}, status=400)
-    except SlotUnavailableError as exc:
+    if isinstance(exc, SlotUnavailableError):
         return JsonResponse({"error": str(exc)}, status=409)
+    raise exc
 
+
+@instrument_endpoint("update")
+@require_POST
+def update_reservation_api(request, reservation_id: int):
+    """
+    POST /api/reservations/<id>/update/
+    Payload (JSON):
+      - room_type_id: int
+      - date: YYYY-MM-DD
+      - slot: int (TimeSlot value)
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "Authentication required."}, status=401)
+
+    data = _parse_reservation_input(request)
+    if isinstance(data, JsonResponse):
+        return data
+
+    try:
+        reservation = update_reservation(user=request.user, reservation_id=reservation_id, new_data=data)
+    except (
+        Reservation.DoesNotExist,
+        RoomType.DoesNotExist,
+        PermissionDenied,
+        ValidationError,
+        PastReservationError,
+        SlotUnavailableError,
+    ) as exc:
+        return _reservation_error_response(exc)
+
+    return _updated_response(reservation)
+
+
+def _updated_response(reservation: Reservation) -> JsonResponse:
     return JsonResponse(
         {
             "success": True,
@@ -228,6 +734,7 @@ def update_reservation_api(request, reservation_id: int):
     )
 
 
+@instrument_endpoint("cancel")
 @require_POST
 def cancel_reservation_api(request, reservation_id: int):
     """
@@ -238,16 +745,7 @@ def cancel_reservation_api(request, reservation_id: int):
 
     try:
         cancel_reservation(user=request.user, reservation_id=reservation_id)
-    except Reservation.DoesNotExist:
-        return JsonResponse({"error": "Reservation not found."}, status=404)
-    except PastReservationError as exc:
-        return JsonResponse({"error": str(exc)}, status=400)
-    except PermissionDenied:
-        return JsonResponse(
-            {"error": "You do not have permission to cancel this reservation."},
-            status=403,
-        )
+    except (Reservation.DoesNotExist, PastReservationError, PermissionDenied) as exc:
+        return _reservation_error_response(exc, action="cancel")
 
     return JsonResponse({"success": True, "message": "Reservation cancelled."})
-
-
@@ -0,0 +1,272 @@
+"""
+ASGI-native versions of the JSON API views (enabled with RESERVATION_ASYNC_API=1).
+
+Reads go through Django's async ORM and cache APIs, so under config/asgi.py they
+run on the event loop instead of occupying a worker thread each. Writes keep the
+transactional services from services.py and run them with sync_to_async, one
+narrowly scoped transaction per call. Request parsing and response payloads are
+shared with the sync views in api.py.
+"""
+
+from __future__ import annotations
+
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import PermissionDenied
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.http import HttpResponseNotAllowed, JsonResponse
+
+from .api import (
+    _active_room_types,
+    _batch_error_response,
+    _batch_response,
+    _availability_etag,
+    _availability_payload,
+    _availability_response,
+    _cached_availability_response,
+    _created_response,
+    _etag_matches,
+    _excluded_reservation_qs,
+    _not_modified,
+    _parse_batch_input,
+    _parse_availability_query,
+    _parse_range_query,
+    _parse_series_input,
+    _parse_reservation_input,
+    _range_payload,
+    _release_excluded,
+    _reservation_error_response,
+    _reservation_stats_qs,
+    _series_created_response,
+    _series_error_response,
+    _updated_response,
+)
+from .availability import areserved_masks, areserved_masks_for_range
+from .availability_cache import adate_version, aget_cached_availability, aset_cached_availability
+from .metrics import instrument_endpoint
+from .models import Reservation, RoomType
+from .services import (
+    BatchReservationError,
+    PastReservationError,
+    SlotUnavailableError,
+    cancel_reservation,
+    create_reservation,
+    create_reservation_series,
+    create_reservations_batch,
+    update_reservation,
+)
+
+
+def _require_http_methods(methods: list[str]):
+    """
+    Async-aware require_http_methods (Django 4.2's decorator only wraps sync views).
+    """
+
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            if request.method not in methods:
+                return HttpResponseNotAllowed(methods)
+            return await view(request, *args, **kwargs)
+
+        return inner
+
+    return decorator
+
+
+require_GET = _require_http_methods(["GET"])
+require_POST = _require_http_methods(["POST"])
+
+
+def _authenticated_user(request):
+    user = request.user
+    return user if user.is_authenticated else None
+
+
+async def _auser(request):
+    # request.user is a lazy object backed by a sync session/DB lookup.
+    return await sync_to_async(_authenticated_user)(request)
+
+
+@instrument_endpoint("availability")
+@require_GET
+async def availability_api(request):
+    """
+    Async GET /api/availability/ (same contract as api.availability_api).
+    """
+    if await _auser(request) is None:
+        return JsonResponse({"error": "Authentication required."}, status=401)
+
+    query = _parse_availability_query(request)
+    if isinstance(query, JsonResponse):
+        return query
+
+    # One version read per request: the cache lookup, the ETag and the cache write must agree.
+    version = await adate_version(query.target_date)
+    if query.cacheable:
+        cached = await aget_cached_availability(query.target_date, version, query.room_filter, query.summary)
+        if cached is not None:
+            return _cached_availability_response(request, cached)
+
+    room_types = [rt async for rt in _active_room_types(query.room_filter)]
+
+    stats = await _reservation_stats_qs(query.target_date, room_types).aaggregate(
+        count=Count("id"),
+        last_updated=Max("updated_at"),
+    )
+    etag = _availability_etag(
+        query,
+        version=version,
+        room_types=room_types,
+        count=stats["count"],
+        last_updated=stats["last_updated"],
+    )
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+
+    mask_map = await areserved_masks(query.target_date, [rt.id for rt in room_types])
+    if query.exclude_id is not None:
+        excluded = await _excluded_reservation_qs(query, mask_map).afirst()
+        _release_excluded(mask_map, excluded)
+
+    payload = _availability_payload(query.target_date, room_types=room_types, mask_map=mask_map, summary=query.summary)
+    if query.cacheable:
+        await aset_cached_availability(
+            query.target_date, version, query.room_filter, query.summary, {"etag": etag, "payload": payload}
+        )
+    return _availability_response(payload, etag, cache_status="MISS" if query.cacheable else None)
+
+
+@instrument_endpoint("availability_range")
+@require_GET
+async def availability_range_api(request):
+    """
+    Async GET /api/availability/range/ (same contract as api.availability_range_api).
+    """
+    if await _auser(request) is None:
+        return JsonResponse({"error": "Authentication required."}, status=401)
+
+    query = _parse_range_query(request)
+    if isinstance(query, JsonResponse):
+        return query
+
+    room_types = [rt async for rt in _active_room_types(query.room_filter)]
+    range_masks = await areserved_masks_for_range(query.start, query.end, [rt.id for rt in room_types])
+    return JsonResponse(_range_payload(query, room_types=room_types, range_masks=range_masks))
+
+
+@instrument_endpoint("create")
+@require_POST
+async def create_reservation_api(request):
+    """
+    Async POST /api/reservations/ (same contract as api.create_reservation_api).
+    """
+    user = await _auser(request)
+    if user is None:
+        return JsonResponse({"error": "Authentication required."}, status=401)
+
+    data = _parse_reservation_input(request)
+    if isinstance(data, JsonResponse):
+        return data
+
+    try:
+        reservation = await sync_to_async(create_reservation)(user=user, data=data)
+    except (ValidationError, PastReservationError, SlotUnavailableError, RoomType.DoesNotExist) as exc:
+        return _reservation_error_response(exc)
+
+    return _created_response(reservation)
+
+
+@instrument_endpoint("batch")
+@require_POST
+async def batch_reservation_api(request):
+    """
+    Async POST /api/reservations/batch/ (same contract as api.batch_reservation_api).
+    """
+    user = await _auser(request)
+    if user is None:
+        return JsonResponse({"error": "Authentication required."}, status=401)
+
+    parsed = _parse_batch_input(request)
+    if isinstance(parsed, JsonResponse):
+        return parsed
+    items, mode = parsed
+
+    try:
+        results = await sync_to_async(create_reservations_batch)(user=user, items=items, mode=mode)
+    except (BatchReservationError, SlotUnavailableError) as exc:
+        return _batch_error_response(exc)
+
+    return _batch_response(results, mode)
+
+
+@instrument_endpoint("series")
+@require_POST
+async def series_reservation_api(request):
+    """
+    Async POST /api/reservations/series/ (same contract as api.series_reservation_api).
+    """
+    user = await _auser(request)
+    if user is None:
+        return JsonResponse({"error": "Authentication required."}, status=401)
+
+    parsed = _parse_series_input(request)
+    if isinstance(parsed, JsonResponse):
+        return parsed
+    data, skip_conflicts = parsed
+
+    try:
+        result = await sync_to_async(create_reservation_series)(user=user, data=data, skip_conflicts=skip_conflicts)
+    except (ValidationError, PastReservationError, SlotUnavailableError, RoomType.DoesNotExist) as exc:
+        return _series_error_response(exc)
+
+    return _series_created_response(result)
+
+
+@instrument_endpoint("update")
+@require_POST
+async def update_reservation_api(request, reservation_id: int):
+    """
+    Async POST /api/reservations/<id>/update/ (same contract as api.update_reservation_api).
+    """
+    user = await _auser(request)
+    if user is None:
+        return JsonResponse({"error": "Authentication required."}, status=401)
+
+    data = _parse_reservation_input(request)
+    if isinstance(data, JsonResponse):
+        return data
+
+    try:
+        reservation = await sync_to_async(update_reservation)(user=user, reservation_id=reservation_id, new_data=data)
+    except (
+        Reservation.DoesNotExist,
+        RoomType.DoesNotExist,
+        PermissionDenied,
+        ValidationError,
+        PastReservationError,
+        SlotUnavailableError,
+    ) as exc:
+        return _reservation_error_response(exc)
+
+    return _updated_response(reservation)
+
+
+@instrument_endpoint("cancel")
+@require_POST
+async def cancel_reservation_api(request, reservation_id: int):
+    """
+    Async POST /api/reservations/<id>/cancel/ (same contract as api.cancel_reservation_api).
+    """
+    user = await _auser(request)
+    if user is None:
+        return JsonResponse({"error": "Authentication required."}, status=401)
+
+    try:
+        await sync_to_async(cancel_reservation)(user=user, reservation_id=reservation_id)
+    except (Reservation.DoesNotExist, PastReservationError, PermissionDenied) as exc:
+        return _reservation_error_response(exc, action="cancel")
+
+    return JsonResponse({"success": True, "message": "Reservation cancelled."})
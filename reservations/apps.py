@@ -5,5 +5,12 @@ class ReservationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "reservations"
 
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
 
+        from .availability_cache import room_type_changed
+        from .models import RoomType
 
+        # Room type names and is_active are part of every cached availability answer.
+        post_save.connect(room_type_changed, sender=RoomType, dispatch_uid="availability_room_type_saved")
+        post_delete.connect(room_type_changed, sender=RoomType, dispatch_uid="availability_room_type_deleted")
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+from datetime import date as date_type
+from typing import Iterable
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .availability_cache import invalidate_availability_on_commit
+from .models import DailyAvailability, Reservation, TimeSlot
+
+
+SLOT_BITS: dict[int, int] = {int(value): 1 << index for index, value in enumerate(TimeSlot.values)}
+FULL_MASK = sum(SLOT_BITS.values())
+
+
+def slot_bit(slot_value: int) -> int:
+    return SLOT_BITS[int(slot_value)]
+
+
+def slots_to_mask(slot_values: Iterable[int]) -> int:
+    mask = 0
+    for value in slot_values:
+        mask |= slot_bit(value)
+    return mask
+
+
+def mask_to_slots(mask: int) -> list[int]:
+    return [value for value, bit in SLOT_BITS.items() if mask & bit]
+
+
+def mask_count(mask: int) -> int:
+    return bin(mask & FULL_MASK).count("1")
+
+
+def mark_slot_reserved(room_type_id: int, date_value: date_type, slot_value: int) -> None:
+    """
+    Set the slot bit for (room_type, date). Call inside the booking transaction.
+    """
+    _reserve_mask(room_type_id, date_value, slot_bit(slot_value))
+
+
+def mark_slots_reserved(slots: Iterable[tuple[int, date_type, int]]) -> None:
+    """
+    Set many (room_type_id, date, slot) bits at once. Call inside the booking transaction.
+
+    Pairs that get the same bits (e.g. every occurrence of a recurring booking) are
+    updated together: one SELECT, one UPDATE and one bulk INSERT per (room_type, mask)
+    group instead of one round trip per date.
+    """
+    masks: dict[tuple[int, date_type], int] = {}
+    for room_type_id, date_value, slot_value in slots:
+        key = (room_type_id, date_value)
+        masks[key] = masks.get(key, 0) | slot_bit(slot_value)
+
+    groups: dict[tuple[int, int], list[date_type]] = {}
+    for (room_type_id, date_value), mask in masks.items():
+        groups.setdefault((room_type_id, mask), []).append(date_value)
+
+    for (room_type_id, mask), dates in sorted(groups.items()):
+        rows = DailyAvailability.objects.filter(room_type_id=room_type_id, date__in=dates)
+        existing = set(rows.values_list("date", flat=True))
+        if existing:
+            rows.filter(date__in=existing).update(
+                reserved_mask=F("reserved_mask").bitor(mask),
+                updated_at=timezone.now(),
+            )
+
+        missing = [date_value for date_value in dates if date_value not in existing]
+        if not missing:
+            continue
+        DailyAvailability.objects.bulk_create(
+            [DailyAvailability(room_type_id=room_type_id, date=date_value, reserved_mask=mask) for date_value in missing],
+            ignore_conflicts=True,
+        )
+        # Rows a concurrent booking created first were skipped above; OR-ing again is idempotent.
+        DailyAvailability.objects.filter(room_type_id=room_type_id, date__in=missing).update(
+            reserved_mask=F("reserved_mask").bitor(mask),
+            updated_at=timezone.now(),
+        )
+
+
+def _reserve_mask(room_type_id: int, date_value: date_type, mask: int) -> None:
+    updated = DailyAvailability.objects.filter(room_type_id=room_type_id, date=date_value).update(
+        reserved_mask=F("reserved_mask").bitor(mask),
+        updated_at=timezone.now(),
+    )
+    if updated:
+        return
+
+    try:
+        with transaction.atomic():
+            DailyAvailability.objects.create(room_type_id=room_type_id, date=date_value, reserved_mask=mask)
+    except IntegrityError:
+        # A concurrent booking created the row first (different slot, same room + date).
+        DailyAvailability.objects.filter(room_type_id=room_type_id, date=date_value).update(
+            reserved_mask=F("reserved_mask").bitor(mask),
+            updated_at=timezone.now(),
+        )
+
+
+def mark_slot_released(room_type_id: int, date_value: date_type, slot_value: int) -> None:
+    """
+    Clear the slot bit for (room_type, date). Call inside the booking transaction.
+    """
+    DailyAvailability.objects.filter(room_type_id=room_type_id, date=date_value).update(
+        reserved_mask=F("reserved_mask").bitand(FULL_MASK ^ slot_bit(slot_value)),
+        updated_at=timezone.now(),
+    )
+
+
+def reserved_masks(date_value: date_type, room_type_ids: Iterable[int]) -> dict[int, int]:
+    """
+    room_type_id -> reserved slot mask for one date (one small row per room, 0 when missing).
+    """
+    ids = list(room_type_ids)
+    if not ids:
+        return {}
+
+    rows = DailyAvailability.objects.filter(date=date_value, room_type_id__in=ids).values_list(
+        "room_type_id", "reserved_mask"
+    )
+    masks = {room_type_id: 0 for room_type_id in ids}
+    masks.update({room_type_id: int(mask) for room_type_id, mask in rows})
+    return masks
+
+
+async def areserved_masks(date_value: date_type, room_type_ids: Iterable[int]) -> dict[int, int]:
+    """
+    Async (ASGI-native) version of reserved_masks().
+    """
+    ids = list(room_type_ids)
+    if not ids:
+        return {}
+
+    masks = {room_type_id: 0 for room_type_id in ids}
+    async for room_type_id, mask in DailyAvailability.objects.filter(
+        date=date_value, room_type_id__in=ids
+    ).values_list("room_type_id", "reserved_mask"):
+        masks[room_type_id] = int(mask)
+    return masks
+
+
+def reserved_masks_for_range(
+    start: date_type,
+    end: date_type,
+    room_type_ids: Iterable[int],
+) -> dict[int, dict[date_type, int]]:
+    """
+    room_type_id -> {date: reserved slot mask} for start..end inclusive, in one query.
+    Days without reservations are omitted.
+    """
+    ids = list(room_type_ids)
+    masks: dict[int, dict[date_type, int]] = {room_type_id: {} for room_type_id in ids}
+    if not ids:
+        return masks
+
+    rows = (
+        DailyAvailability.objects.filter(room_type_id__in=ids, date__gte=start, date__lte=end, reserved_mask__gt=0)
+        .order_by()
+        .values_list("room_type_id", "date", "reserved_mask")
+    )
+    for room_type_id, day, mask in rows:
+        masks[room_type_id][day] = int(mask)
+    return masks
+
+
+async def areserved_masks_for_range(
+    start: date_type,
+    end: date_type,
+    room_type_ids: Iterable[int],
+) -> dict[int, dict[date_type, int]]:
+    """
+    Async (ASGI-native) version of reserved_masks_for_range().
+    """
+    ids = list(room_type_ids)
+    masks: dict[int, dict[date_type, int]] = {room_type_id: {} for room_type_id in ids}
+    if not ids:
+        return masks
+
+    rows = (
+        DailyAvailability.objects.filter(room_type_id__in=ids, date__gte=start, date__lte=end, reserved_mask__gt=0)
+        .order_by()
+        .values_list("room_type_id", "date", "reserved_mask")
+    )
+    async for room_type_id, day, mask in rows:
+        masks[room_type_id][day] = int(mask)
+    return masks
+
+
+def reconcile_daily_availability(
+    *,
+    start: date_type | None = None,
+    end: date_type | None = None,
+    room_type_ids: Iterable[int] | None = None,
+) -> dict[str, int]:
+    """
+    Rebuild DailyAvailability from Reservation (optionally limited to a date range / room types).
+
+    Rows that drifted are fixed, missing rows created and rows with no
+    reservations left deleted. Run it after bulk changes that bypass services.py
+    (e.g. cascading user deletes); bookings made while it runs may need a second pass.
+    """
+    reservations = Reservation.objects.all()
+    index = DailyAvailability.objects.all()
+    if start is not None:
+        reservations = reservations.filter(date__gte=start)
+        index = index.filter(date__gte=start)
+    if end is not None:
+        reservations = reservations.filter(date__lte=end)
+        index = index.filter(date__lte=end)
+    if room_type_ids is not None:
+        ids = list(room_type_ids)
+        reservations = reservations.filter(room_type_id__in=ids)
+        index = index.filter(room_type_id__in=ids)
+
+    expected: dict[tuple[int, date_type], int] = {}
+    for room_type_id, day, slot in reservations.order_by().values_list("room_type_id", "date", "slot").iterator(
+        chunk_size=2000
+    ):
+        key = (room_type_id, day)
+        expected[key] = expected.get(key, 0) | slot_bit(slot)
+
+    created = updated = deleted = unchanged = 0
+    now = timezone.now()
+
+    with transaction.atomic():
+        to_update: list[DailyAvailability] = []
+        stale_ids: list[int] = []
+        changed_dates: set[date_type] = set()
+        for row in index.only("id", "room_type_id", "date", "reserved_mask").iterator(chunk_size=2000):
+            key = (row.room_type_id, row.date)
+            mask = expected.pop(key, 0)
+            if mask != row.reserved_mask:
+                changed_dates.add(row.date)
+            if not mask:
+                stale_ids.append(row.id)
+            elif mask != row.reserved_mask:
+                row.reserved_mask = mask
+                row.updated_at = now
+                to_update.append(row)
+            else:
+                unchanged += 1
+
+        if stale_ids:
+            deleted = DailyAvailability.objects.filter(id__in=stale_ids).delete()[0]
+        if to_update:
+            DailyAvailability.objects.bulk_update(to_update, ["reserved_mask", "updated_at"], batch_size=1000)
+            updated = len(to_update)
+        if expected:
+            DailyAvailability.objects.bulk_create(
+                [
+                    DailyAvailability(room_type_id=room_type_id, date=day, reserved_mask=mask)
+                    for (room_type_id, day), mask in expected.items()
+                ],
+                batch_size=1000,
+            )
+            created = len(expected)
+            changed_dates.update(day for _, day in expected)
+
+        if changed_dates:
+            invalidate_availability_on_commit(*changed_dates)
+
+    return {"created": created, "updated": updated, "deleted": deleted, "unchanged": unchanged}
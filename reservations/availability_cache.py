@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import secrets
+import threading
+from datetime import date as date_type
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .metrics import AVAILABILITY_CACHE
+
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def _cache():
+    return caches[getattr(settings, "AVAILABILITY_CACHE_ALIAS", "default")]
+
+
+def _timeout() -> int:
+    return int(getattr(settings, "AVAILABILITY_CACHE_TIMEOUT", 60))
+
+
+def _version_key(date_value: date_type) -> str:
+    return f"availability:version:{date_value.isoformat()}"
+
+
+def _new_version() -> str:
+    # Opaque random tokens instead of incr(): every bump yields a value no reader has seen,
+    # even on backends without an atomic incr (file cache) or after the key was evicted.
+    return secrets.token_hex(6)
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+    AVAILABILITY_CACHE.inc(result=name)
+
+
+ROOM_TYPES_VERSION_KEY = "availability:version:room_types"
+
+
+def _create_version(cache, key: str) -> str:
+    version = _new_version()
+    if not cache.add(key, version, timeout=None):
+        version = cache.get(key) or version
+    return version
+
+
+async def _acreate_version(cache, key: str) -> str:
+    version = _new_version()
+    if not await cache.aadd(key, version, timeout=None):
+        version = await cache.aget(key) or version
+    return version
+
+
+def date_version(date_value: date_type) -> str:
+    """
+    Current availability version of a date: its booking version plus the room-type
+    version (RoomType edits change every date's answer), each created on first use.
+
+    Read it once per request and pass it to get/set_cached_availability and the
+    ETag: a booking that commits in between then leaves the payload stored under
+    the old version, where no later request looks for it.
+    """
+    cache = _cache()
+    keys = (_version_key(date_value), ROOM_TYPES_VERSION_KEY)
+    found = cache.get_many(keys)
+    return ".".join(found.get(key) or _create_version(cache, key) for key in keys)
+
+
+async def adate_version(date_value: date_type) -> str:
+    """
+    Async version of date_version().
+    """
+    cache = _cache()
+    keys = (_version_key(date_value), ROOM_TYPES_VERSION_KEY)
+    found = await cache.aget_many(keys)
+    return ".".join([found.get(key) or await _acreate_version(cache, key) for key in keys])
+
+
+def bump_date_versions(dates: Iterable[date_type]) -> None:
+    cache = _cache()
+    for date_value in set(dates):
+        cache.set(_version_key(date_value), _new_version(), timeout=None)
+        _count("invalidations")
+
+
+def bump_room_types_version() -> None:
+    _cache().set(ROOM_TYPES_VERSION_KEY, _new_version(), timeout=None)
+    _count("invalidations")
+
+
+def room_type_changed(sender, **kwargs) -> None:
+    """
+    post_save/post_delete receiver for RoomType (names and is_active appear in every cached answer).
+    """
+    transaction.on_commit(bump_room_types_version)
+
+
+def invalidate_availability_on_commit(*dates: date_type) -> None:
+    """
+    Bump the booking version of the given dates once the current transaction commits.
+    """
+    transaction.on_commit(lambda: bump_date_versions(dates))
+
+
+def _entry_key(date_value: date_type, version: str, room_type_id: int | None, summary: bool) -> str:
+    room_filter = room_type_id if room_type_id is not None else "all"
+    return f"availability:{date_value.isoformat()}:{version}:{room_filter}:{int(summary)}"
+
+
+def get_cached_availability(date_value: date_type, version: str, room_type_id: int | None, summary: bool) -> Any | None:
+    value = _cache().get(_entry_key(date_value, version, room_type_id, summary))
+    _count("hits" if value is not None else "misses")
+    return value
+
+
+def set_cached_availability(
+    date_value: date_type, version: str, room_type_id: int | None, summary: bool, value: Any
+) -> None:
+    _cache().set(_entry_key(date_value, version, room_type_id, summary), value, timeout=_timeout())
+
+
+async def aget_cached_availability(
+    date_value: date_type, version: str, room_type_id: int | None, summary: bool
+) -> Any | None:
+    value = await _cache().aget(_entry_key(date_value, version, room_type_id, summary))
+    _count("hits" if value is not None else "misses")
+    return value
+
+
+async def aset_cached_availability(
+    date_value: date_type, version: str, room_type_id: int | None, summary: bool, value: Any
+) -> None:
+    await _cache().aset(_entry_key(date_value, version, room_type_id, summary), value, timeout=_timeout())
+
+
+def availability_cache_stats() -> dict[str, float]:
+    """
+    Hit/miss/invalidation counters of this process.
+    """
+    with _stats_lock:
+        stats: dict[str, float] = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    return stats
@@ -0,0 +1,207 @@
+"""
+iCalendar (.ics) feeds: one per user (their bookings) and one per room type (busy slots).
+
+Calendar clients cannot send the session cookie, so each feed URL carries a
+signed token naming the feed and its key version (CalendarFeedKey); rotating a
+feed revokes every URL handed out before. A poll runs two indexed queries: the
+key version lookup (unique (kind, object_id); not cached, so a rotation takes
+effect in every process at once) and one aggregate on the feed's index
+(idx_res_user_date / idx_res_room_date) to build the ETag. Unchanged feeds
+answer 304, changed ones are served from a per-feed cache or streamed from the
+database and cached on the way out.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import date as date_type
+from datetime import datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from typing import Iterator
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from django.db.models import Count, F, Max
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import CalendarFeedKey, Reservation
+
+
+FEED_KIND_USER = "user"
+FEED_KIND_ROOM = "room"
+TOKEN_SALT = "reservations.calendar-feed"
+CRLF = "\r\n"
+
+
+@dataclass(frozen=True)
+class Feed:
+    kind: str  # user|room
+    object_id: int
+
+    @property
+    def cache_prefix(self) -> str:
+        return f"calendar:{self.kind}:{self.object_id}"
+
+
+def feed_version(kind: str, object_id: int) -> int:
+    version = CalendarFeedKey.objects.filter(kind=kind, object_id=object_id).values_list("version", flat=True).first()
+    return version or 1
+
+
+def rotate_feed(kind: str, object_id: int) -> int:
+    """
+    Move a feed to a new key version (revoking its current URL) and return the version.
+    """
+    key, created = CalendarFeedKey.objects.get_or_create(kind=kind, object_id=object_id, defaults={"version": 2})
+    if not created:
+        CalendarFeedKey.objects.filter(pk=key.pk).update(version=F("version") + 1, rotated_at=timezone.now())
+    return feed_version(kind, object_id)
+
+
+def feed_token(kind: str, object_id: int, version: int | None = None) -> str:
+    if version is None:
+        version = feed_version(kind, object_id)
+    return signing.Signer(salt=TOKEN_SALT).sign(f"{kind}-{object_id}-{version}")
+
+
+def feed_from_token(token: str) -> Feed | None:
+    try:
+        value = signing.Signer(salt=TOKEN_SALT).unsign(token)
+    except signing.BadSignature:
+        return None
+    # Tokens signed before feeds had versions ("kind-id") count as version 1.
+    kind, object_id, version = (value.split("-") + ["1"])[:3]
+    if kind not in {FEED_KIND_USER, FEED_KIND_ROOM} or not object_id.isdigit() or not version.isdigit():
+        return None
+    if int(version) != feed_version(kind, int(object_id)):
+        return None
+    return Feed(kind=kind, object_id=int(object_id))
+
+
+def feed_url(request, kind: str, object_id: int) -> str:
+    return request.build_absolute_uri(reverse("reservations:calendar_feed", args=[feed_token(kind, object_id)]))
+
+
+def _window_start() -> date_type:
+    return timezone.localdate() - timedelta(days=int(getattr(settings, "RESERVATION_CALENDAR_PAST_DAYS", 90)))
+
+
+def feed_queryset(feed: Feed):
+    """
+    Reservations of a feed from RESERVATION_CALENDAR_PAST_DAYS ago onwards.
+    Filtering on (user|room_type, date) keeps both the stats query and the rows on the composite index.
+    """
+    queryset = Reservation.objects.filter(date__gte=_window_start())
+    if feed.kind == FEED_KIND_USER:
+        return queryset.filter(user_id=feed.object_id)
+    return queryset.filter(room_type_id=feed.object_id)
+
+
+def feed_etag(feed: Feed) -> str:
+    """
+    ETag of a feed, from one aggregate query. It includes the row count, so
+    cancellations (deleted rows) change it too; a Last-Modified from
+    Max(updated_at) would not, which is why feeds send none.
+    """
+    stats = feed_queryset(feed).aggregate(count=Count("id"), last_updated=Max("updated_at"), last_id=Max("id"))
+    raw = f"{feed.kind}:{feed.object_id}:{_window_start()}:{stats['count']}:{stats['last_id']}:{stats['last_updated']}"
+    return f'"{hashlib.sha1(raw.encode("utf-8")).hexdigest()}"'
+
+
+def _cache():
+    return caches[getattr(settings, "RESERVATION_CALENDAR_CACHE_ALIAS", "default")]
+
+
+def _body_key(feed: Feed, etag: str) -> str:
+    return f"{feed.cache_prefix}:{etag.strip(chr(34))}"
+
+
+def cached_feed_body(feed: Feed, etag: str) -> str | None:
+    return _cache().get(_body_key(feed, etag))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _fold(line: str) -> str:
+    """
+    RFC 5545 line folding: at most 75 octets per line, continuation lines start with a space.
+    """
+    if len(line.encode("utf-8")) <= 75:
+        return line + CRLF
+
+    parts, current, size, limit = [], "", 0, 75
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > limit:
+            parts.append(current)
+            current, size, limit = "", 0, 74
+        current += char
+        size += width
+    parts.append(current)
+    return (CRLF + " ").join(parts) + CRLF
+
+
+def _utc_stamp(value: datetime) -> str:
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _slot_start(date_value: date_type, slot_value: int) -> datetime:
+    # Same rule as Reservation.start_datetime(), without building model instances per row.
+    return timezone.make_aware(datetime.combine(date_value, time(hour=int(slot_value))), timezone.get_current_timezone())
+
+
+def iter_feed(feed: Feed, *, host: str, name: str) -> Iterator[str]:
+    """
+    The .ics document of a feed, generated row by row.
+    """
+    yield from (
+        _fold(line)
+        for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//Room Reservation System//Calendar feed//EN",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{_escape(name)}",
+        )
+    )
+
+    rows = (
+        feed_queryset(feed)
+        .order_by("date", "slot")
+        .values_list("id", "date", "slot", "updated_at", "room_type__name")
+        .iterator(chunk_size=500)
+    )
+    for reservation_id, date_value, slot_value, updated_at, room_name in rows:
+        start = _slot_start(date_value, slot_value)
+        summary = f"{room_name} reservation" if feed.kind == FEED_KIND_USER else "Reserved"
+        lines = (
+            "BEGIN:VEVENT",
+            f"UID:reservation-{reservation_id}@{host}",
+            f"DTSTAMP:{_utc_stamp(updated_at)}",
+            f"DTSTART:{_utc_stamp(start)}",
+            f"DTEND:{_utc_stamp(start + timedelta(hours=1))}",
+            f"SUMMARY:{_escape(summary)}",
+            f"LOCATION:{_escape(room_name)}",
+            "END:VEVENT",
+        )
+        yield "".join(_fold(line) for line in lines)
+
+    yield _fold("END:VCALENDAR")
+
+
+def iter_feed_and_cache(feed: Feed, etag: str, *, host: str, name: str) -> Iterator[str]:
+    """
+    Stream a feed and store the complete body under its ETag once the last chunk went out.
+    """
+    chunks = []
+    for chunk in iter_feed(feed, host=host, name=name):
+        chunks.append(chunk)
+        yield chunk
+    timeout = int(getattr(settings, "RESERVATION_CALENDAR_CACHE_TIMEOUT", 300))
+    _cache().set(_body_key(feed, etag), "".join(chunks), timeout=timeout)
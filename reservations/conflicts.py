@@ -0,0 +1,80 @@
+"""
+Double-booking checks shared by the admin form, Reservation.clean() and bulk imports.
+
+A single-object check is memoized on the instance, keyed by the values it was
+asked about, so the admin form, the model clean() and the unique-constraint
+validation of one save cycle run the query once. Batches go through
+find_conflicts(), which answers any number of slots with one query.
+"""
+
+from __future__ import annotations
+
+from datetime import date as date_type
+from typing import Iterable
+
+from .models import Reservation
+
+
+SlotKey = tuple[int, date_type, int]  # (room_type_id, date, slot)
+
+CONFLICT_MESSAGE = "This room type is already reserved for that date and time slot."
+
+_MEMO_ATTR = "_conflict_check"
+
+
+def find_conflicts(slots: Iterable[SlotKey], *, exclude_ids: Iterable[int] = ()) -> dict[SlotKey, int]:
+    """
+    Existing reservation id for every taken slot among `slots`, in one query.
+    """
+    slots = set(slots)
+    if not slots:
+        return {}
+    queryset = Reservation.objects.filter(
+        room_type_id__in={room_type_id for room_type_id, _, _ in slots},
+        date__in={date_value for _, date_value, _ in slots},
+        slot__in={slot_value for _, _, slot_value in slots},
+    )
+    exclude_ids = [pk for pk in exclude_ids if pk is not None]
+    if exclude_ids:
+        queryset = queryset.exclude(pk__in=exclude_ids)
+
+    taken: dict[SlotKey, int] = {}
+    for reservation_id, room_type_id, date_value, slot_value in queryset.values_list("id", "room_type_id", "date", "slot"):
+        key = (room_type_id, date_value, slot_value)
+        if key in slots:  # the IN lists also match cross combinations
+            taken[key] = reservation_id
+    return taken
+
+
+def slot_is_taken(instance: Reservation, room_type_id: int, date_value: date_type, slot_value: int) -> bool:
+    """
+    Whether another reservation holds the slot `instance` would occupy with these values.
+    The answer is remembered on the instance until its next save() (one clean→save pass).
+    """
+    key = (room_type_id, date_value, int(slot_value), instance.pk)
+    memo = instance.__dict__.get(_MEMO_ATTR)
+    if memo is not None and memo[0] == key:
+        return memo[1]
+
+    taken = bool(find_conflicts([key[:3]], exclude_ids=[instance.pk]))
+    setattr(instance, _MEMO_ATTR, (key, taken))
+    return taken
+
+
+def forget_conflict_check(instance: Reservation) -> None:
+    instance.__dict__.pop(_MEMO_ATTR, None)
+
+
+def reservation_has_conflict(instance: Reservation) -> bool:
+    return slot_is_taken(instance, instance.room_type_id, instance.date, instance.slot)
+
+
+def conflict_already_checked(instance: Reservation) -> bool:
+    """
+    True when a check for the instance's current values is memoized (and found no conflict).
+    """
+    memo = instance.__dict__.get(_MEMO_ATTR)
+    if memo is None or instance.slot is None:
+        return False
+    key = (instance.room_type_id, instance.date, int(instance.slot), instance.pk)
+    return memo[0] == key and not memo[1]
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+
+from .emails import (
+    EMAIL_DELIVERY_THREAD,
+    EmailPayload,
+    build_email_message,
+    deliver_message,
+    payload_from_dict,
+    payload_to_dict,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+OVERFLOW_DROP = "drop"
+OVERFLOW_BLOCK = "block"
+OVERFLOW_SPILL = "spill"
+
+
+class EmailDispatcher:
+    """
+    In-process background sender for RESERVATION_EMAIL_DELIVERY=thread.
+
+    submit() returns immediately; a small ThreadPoolExecutor does the SMTP work.
+    At most `max_queue` payloads wait or run at once. Beyond that the overflow policy applies:
+
+    - drop: log and discard the email.
+    - block: wait up to `block_timeout` seconds for room, then drop.
+    - spill: write the payload to `spill_dir` as JSON; spilled emails are replayed
+      by a worker as soon as the queue has room again (also after a restart).
+
+    shutdown() drains the queue for up to `drain_timeout` seconds; what is still
+    queued after that is spilled (or dropped when no spill directory is set).
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 2,
+        max_queue: int = 100,
+        overflow: str = OVERFLOW_SPILL,
+        block_timeout: float = 2.0,
+        spill_dir: str | os.PathLike | None = None,
+        drain_timeout: float = 10.0,
+    ):
+        self.max_queue = max(1, max_queue)
+        self.overflow = overflow if overflow in {OVERFLOW_DROP, OVERFLOW_BLOCK, OVERFLOW_SPILL} else OVERFLOW_SPILL
+        self.block_timeout = block_timeout
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.drain_timeout = drain_timeout
+
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="reservation-email")
+        self._slots = threading.BoundedSemaphore(self.max_queue)
+        self._lock = threading.Lock()
+        self._pending: dict[Future, EmailPayload] = {}
+        self._replaying = False
+        self._closed = False
+        self._stats = {
+            "submitted": 0,
+            "sent": 0,
+            "failed": 0,
+            "dropped": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "blocked": 0,
+            "blocked_seconds": 0.0,
+            "max_depth": 0,
+        }
+
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            if any(self.spill_dir.glob("*.json")):
+                self._schedule_replay()
+
+    # -- public API -----------------------------------------------------------------
+
+    def submit(self, payload: EmailPayload) -> bool:
+        """
+        Queue a payload for sending. Never raises and never blocks longer than
+        block_timeout. Returns False when the email was dropped or spilled.
+        """
+        if not payload.to_email:
+            return False
+
+        if self._closed or not self._acquire_slot():
+            self._overflow(payload)
+            return False
+
+        try:
+            future = self._executor.submit(self._send, payload)
+        except RuntimeError:  # executor already shut down
+            self._slots.release()
+            self._overflow(payload)
+            return False
+
+        with self._lock:
+            self._pending[future] = payload
+            self._stats["submitted"] += 1
+            self._stats["max_depth"] = max(self._stats["max_depth"], len(self._pending))
+        future.add_done_callback(self._done)
+        return True
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            stats: dict[str, float] = dict(self._stats)
+            stats["depth"] = len(self._pending)
+        stats["capacity"] = self.max_queue
+        stats["overflow_policy"] = self.overflow
+        stats["spill_backlog"] = self._spill_backlog()
+        return stats
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        """
+        Stop accepting work, wait up to `timeout` seconds for queued emails, then
+        spill (or drop) whatever has not started yet.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        deadline = time.monotonic() + (self.drain_timeout if timeout is None else timeout)
+        while time.monotonic() < deadline:
+            with self._lock:
+                if not self._pending:
+                    break
+            time.sleep(0.05)
+
+        with self._lock:
+            pending = list(self._pending.items())
+        # cancel() runs the done callbacks (which take the lock) synchronously, so call it unlocked.
+        leftovers = [payload for future, payload in pending if future.cancel()]
+        for payload in leftovers:
+            self._overflow(payload, policy=OVERFLOW_SPILL if self.spill_dir else OVERFLOW_DROP)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # -- internals ------------------------------------------------------------------
+
+    def _acquire_slot(self) -> bool:
+        if self._slots.acquire(blocking=False):
+            return True
+        if self.overflow != OVERFLOW_BLOCK:
+            return False
+
+        started = time.monotonic()
+        acquired = self._slots.acquire(timeout=self.block_timeout)
+        with self._lock:
+            self._stats["blocked"] += 1
+            self._stats["blocked_seconds"] += time.monotonic() - started
+        return acquired
+
+    def _send(self, payload: EmailPayload) -> None:
+        message = build_email_message(payload)
+        if message is not None:
+            deliver_message(message, channel=EMAIL_DELIVERY_THREAD)
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            payload = self._pending.pop(future, None)
+            if not future.cancelled():
+                self._stats["failed" if future.exception() else "sent"] += 1
+        if not future.cancelled():
+            if future.exception() is not None:
+                logger.error(
+                    "Failed to send reservation email (%s) to %s",
+                    getattr(payload, "event", "?"),
+                    getattr(payload, "to_email", "?"),
+                    exc_info=future.exception(),
+                )
+            self._slots.release()
+            self._schedule_replay()
+
+    def _overflow(self, payload: EmailPayload, *, policy: str | None = None) -> None:
+        policy = policy or self.overflow
+        if policy == OVERFLOW_SPILL and self.spill_dir is not None and self._spill(payload):
+            return
+
+        with self._lock:
+            self._stats["dropped"] += 1
+        logger.warning("Email dispatcher full: dropped %s email to %s", payload.event, payload.to_email)
+
+    def _spill(self, payload: EmailPayload) -> bool:
+        name = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        tmp_path = self.spill_dir / f"{name}.tmp"
+        try:
+            tmp_path.write_text(json.dumps(payload_to_dict(payload)), encoding="utf-8")
+            tmp_path.replace(self.spill_dir / f"{name}.json")
+        except OSError:
+            logger.exception("Email dispatcher: cannot spill email to %s", self.spill_dir)
+            return False
+
+        with self._lock:
+            self._stats["spilled"] += 1
+        return True
+
+    def _spill_backlog(self) -> int:
+        if self.spill_dir is None:
+            return 0
+        try:
+            return sum(1 for _ in self.spill_dir.glob("*.json"))
+        except OSError:  # pragma: no cover
+            return 0
+
+    def _schedule_replay(self) -> None:
+        if self.spill_dir is None or self._closed:
+            return
+        with self._lock:
+            if self._replaying or len(self._pending) >= self.max_queue // 2:
+                return
+            self._replaying = True
+        if self._spill_backlog() == 0:
+            with self._lock:
+                self._replaying = False
+            return
+        try:
+            self._executor.submit(self._replay_spill)
+        except RuntimeError:
+            with self._lock:
+                self._replaying = False
+
+    def _replay_spill(self) -> None:
+        """
+        Re-submit spilled emails (oldest first) while the queue has room.
+        """
+        try:
+            for path in sorted(self.spill_dir.glob("*.json")):
+                if self._closed or not self._slots.acquire(blocking=False):
+                    break
+                self._slots.release()
+                try:
+                    data = json.loads(path.read_text(encoding="utf-8"))
+                    path.unlink()
+                except FileNotFoundError:
+                    continue  # replayed by another process sharing the directory
+                except (OSError, ValueError):
+                    logger.exception("Email dispatcher: unreadable spill file %s", path)
+                    path.rename(path.with_suffix(".bad"))
+                    continue
+
+                try:
+                    payload = payload_from_dict(data)
+                except (KeyError, TypeError, ValueError):
+                    logger.warning("Email dispatcher: ignoring malformed spilled payload %s", path.name)
+                    continue
+                if self.submit(payload):
+                    with self._lock:
+                        self._stats["replayed"] += 1
+        finally:
+            with self._lock:
+                self._replaying = False
+
+
+_dispatcher_lock = threading.Lock()
+_dispatcher: EmailDispatcher | None = None
+_dispatcher_pid: int | None = None
+
+
+def get_email_dispatcher() -> EmailDispatcher:
+    """
+    The dispatcher of this process, created on first use (and again after a fork).
+    """
+    global _dispatcher, _dispatcher_pid
+
+    with _dispatcher_lock:
+        if _dispatcher is None or _dispatcher_pid != os.getpid():
+            spill_dir = getattr(settings, "RESERVATION_EMAIL_SPILL_DIR", "") or None
+            _dispatcher = EmailDispatcher(
+                workers=int(getattr(settings, "RESERVATION_EMAIL_DISPATCH_WORKERS", 2)),
+                max_queue=int(getattr(settings, "RESERVATION_EMAIL_DISPATCH_QUEUE_SIZE", 100)),
+                overflow=getattr(settings, "RESERVATION_EMAIL_DISPATCH_OVERFLOW", OVERFLOW_SPILL),
+                block_timeout=float(getattr(settings, "RESERVATION_EMAIL_DISPATCH_BLOCK_SECONDS", 2.0)),
+                spill_dir=spill_dir,
+                drain_timeout=float(getattr(settings, "RESERVATION_EMAIL_DISPATCH_DRAIN_SECONDS", 10.0)),
+            )
+            _dispatcher_pid = os.getpid()
+            atexit.register(_dispatcher.shutdown)
+        return _dispatcher
+
+
+def email_dispatch_stats() -> dict[str, float] | None:
+    """
+    Counters of this process's dispatcher (None when it has not been started).
+    """
+    with _dispatcher_lock:
+        dispatcher = _dispatcher if _dispatcher_pid == os.getpid() else None
+    return dispatcher.stats() if dispatcher is not None else None
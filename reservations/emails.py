@@ -6,14 +6,33 @@ from datetime import date as date_type
 
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.template.loader import get_template
 
+from .metrics import EMAIL_SECONDS, EMAILS
 from .models import TimeSlot
 
 
 logger = logging.getLogger(__name__)
 
 
+EMAIL_DELIVERY_IMMEDIATE = "immediate"
+EMAIL_DELIVERY_OUTBOX = "outbox"
+EMAIL_DELIVERY_THREAD = "thread"
+
+
+def get_email_delivery() -> str:
+    """
+    How booking emails leave the process (settings.RESERVATION_EMAIL_DELIVERY):
+    - "immediate" (default): sent from the on_commit callback of the booking request.
+    - "outbox": queued in EmailOutbox and sent by `manage.py process_email_outbox`.
+    - "thread": handed to this process's bounded background pool (email_dispatch) after commit.
+    """
+    delivery = getattr(settings, "RESERVATION_EMAIL_DELIVERY", EMAIL_DELIVERY_IMMEDIATE)
+    if delivery not in {EMAIL_DELIVERY_IMMEDIATE, EMAIL_DELIVERY_OUTBOX, EMAIL_DELIVERY_THREAD}:
+        return EMAIL_DELIVERY_IMMEDIATE
+    return delivery
+
+
 @dataclass(frozen=True)
 class ReservationEmailPayload:
     to_email: str
@@ -30,37 +49,188 @@ class ReservationEmailPayload:
             return str(self.slot_value)
 
 
-def send_reservation_email(payload: ReservationEmailPayload) -> bool:
+@dataclass(frozen=True)
+class ReservationBatchEmailPayload:
+    to_email: str
+    event: str  # created
+    items: tuple[ReservationEmailPayload, ...]
+
+
+EmailPayload = ReservationEmailPayload | ReservationBatchEmailPayload
+
+
+EMAIL_TEMPLATE_PREFIXES = (
+    "reservation_created",
+    "reservation_updated",
+    "reservation_cancelled",
+    "reservation_batch_created",
+    "reservation_digest",
+)
+EMAIL_TEMPLATE_SUFFIXES = ("_subject.txt", ".txt", ".html")
+EVENT_LABELS = {"created": "Confirmed", "updated": "Updated", "cancelled": "Cancelled"}
+
+def _email_template(name: str):
+    # Django's cached template loader (the default) compiles each template once per
+    # process, on first use, and reloads edited templates under DEBUG.
+    return get_template(f"emails/{name}")
+
+
+def _render_email(template_prefix: str, context: dict, *, to_email: str) -> EmailMultiAlternatives:
+    subject, text_body, html_body = (
+        _email_template(f"{template_prefix}{suffix}").render(context) for suffix in EMAIL_TEMPLATE_SUFFIXES
+    )
+    message = EmailMultiAlternatives(
+        subject=subject.strip(),
+        body=text_body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[to_email],
+    )
+    if html_body:
+        message.attach_alternative(html_body, "text/html")
+    return message
+
+
+def send_email_payload(payload: EmailPayload) -> bool:
     """
-    Send reservation email. Returns True if attempted, False if skipped.
+    Render and send either payload type. Returns True if attempted, False if skipped.
     Never raises (logs on failure).
     """
-    if not payload.to_email:
+    message = build_email_message(payload)
+    if message is None:
         return False
 
+    try:
+        deliver_message(message, channel=EMAIL_DELIVERY_IMMEDIATE)
+    except Exception:
+        logger.exception("Failed to send reservation email (%s) to %s", payload.event, payload.to_email)
+    return True
+
+
+def deliver_message(message: EmailMultiAlternatives, *, channel: str) -> None:
+    """
+    message.send(), counted and timed in the reservation_emails_* metrics. Send errors propagate.
+    """
+    with EMAIL_SECONDS.time(channel=channel):
+        try:
+            message.send(fail_silently=False)
+        except Exception:
+            EMAILS.inc(channel=channel, result="failed")
+            raise
+    EMAILS.inc(channel=channel, result="sent")
+
+
+def build_email_message(payload: EmailPayload) -> EmailMultiAlternatives | None:
+    """
+    Render the message for a payload (None when there is nothing to send).
+    Never raises (logs rendering failures).
+    """
+    if not payload.to_email:
+        return None
+
+    if isinstance(payload, ReservationBatchEmailPayload):
+        if not payload.items:
+            return None
+        template_prefix = f"reservation_batch_{payload.event}"
+        context = {
+            "reservations": [
+                {"room_name": item.room_name, "date": item.date, "slot_label": item.slot_label}
+                for item in sorted(payload.items, key=lambda item: (item.date, item.slot_value, item.room_name))
+            ],
+            "count": len(payload.items),
+        }
+    else:
+        template_prefix = f"reservation_{payload.event}"
+        context = {
+            "room_name": payload.room_name,
+            "date": payload.date,
+            "slot_label": payload.slot_label,
+        }
+
+    try:
+        return _render_email(template_prefix, context, to_email=payload.to_email)
+    except Exception:
+        logger.exception("Failed to render reservation email (%s) to %s", template_prefix, payload.to_email)
+        return None
+
+
+def build_digest_message(payloads: list[EmailPayload]) -> EmailMultiAlternatives | None:
+    """
+    One combined message for several payloads going to the same recipient (the
+    regular message when there is only one). Logs rendering failures and returns
+    None; mixing recipients is a programming error (ValueError).
+    """
+    payloads = [payload for payload in payloads if payload.to_email]
+    if not payloads:
+        return None
+    if len(payloads) == 1:
+        return build_email_message(payloads[0])
+
+    to_email = payloads[0].to_email
+    if any(payload.to_email != to_email for payload in payloads):
+        raise ValueError("A digest goes to a single recipient.")
+
+    items: list[tuple[str, ReservationEmailPayload]] = []
+    for payload in payloads:
+        if isinstance(payload, ReservationBatchEmailPayload):
+            items.extend((payload.event, item) for item in payload.items)
+        else:
+            items.append((payload.event, payload))
+
     context = {
-        "room_name": payload.room_name,
-        "date": payload.date,
-        "slot_label": payload.slot_label,
+        "reservations": [
+            {
+                "event": event,
+                "event_label": EVENT_LABELS.get(event, event.title()),
+                "room_name": item.room_name,
+                "date": item.date,
+                "slot_label": item.slot_label,
+            }
+            for event, item in items  # queue order, so "updated" follows "created" for the same booking
+        ],
+        "count": len(items),
     }
-
     try:
-        subject = render_to_string(f"emails/reservation_{payload.event}_subject.txt", context).strip()
-        text_body = render_to_string(f"emails/reservation_{payload.event}.txt", context)
-        html_body = render_to_string(f"emails/reservation_{payload.event}.html", context)
-
-        msg = EmailMultiAlternatives(
-            subject=subject,
-            body=text_body,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[payload.to_email],
-        )
-        if html_body:
-            msg.attach_alternative(html_body, "text/html")
-        msg.send(fail_silently=False)
-        return True
+        return _render_email("reservation_digest", context, to_email=to_email)
     except Exception:
-        logger.exception("Failed to send reservation email (%s) to %s", payload.event, payload.to_email)
-        return True
+        logger.exception("Failed to render reservation digest email to %s", to_email)
+        return None
 
 
+def payload_to_dict(payload: EmailPayload) -> dict:
+    """
+    JSON-serializable form of a payload (stored in EmailOutbox.payload).
+    """
+    if isinstance(payload, ReservationBatchEmailPayload):
+        return {
+            "kind": "batch",
+            "to_email": payload.to_email,
+            "event": payload.event,
+            "items": [payload_to_dict(item) for item in payload.items],
+        }
+    return {
+        "kind": "single",
+        "to_email": payload.to_email,
+        "event": payload.event,
+        "room_name": payload.room_name,
+        "date": payload.date.isoformat(),
+        "slot_value": int(payload.slot_value),
+    }
+
+
+def payload_from_dict(data: dict) -> EmailPayload:
+    """
+    Inverse of payload_to_dict(). Raises KeyError/ValueError for malformed data.
+    """
+    if data.get("kind") == "batch":
+        return ReservationBatchEmailPayload(
+            to_email=data["to_email"],
+            event=data["event"],
+            items=tuple(payload_from_dict(item) for item in data["items"]),
+        )
+    return ReservationEmailPayload(
+        to_email=data["to_email"],
+        event=data["event"],
+        room_name=data["room_name"],
+        date=date_type.fromisoformat(data["date"]),
+        slot_value=int(data["slot_value"]),
+    )
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import date as date_type
+from typing import Iterable
+
+from django.conf import settings
+from django.db import connection, transaction
+
+
+logger = logging.getLogger(__name__)
+
+
+EVENTS_BACKEND_MEMORY = "memory"
+EVENTS_BACKEND_POSTGRES = "postgres"
+NOTIFY_CHANNEL = "reservation_events"
+
+
+@dataclass(frozen=True)
+class BookingEvent:
+    type: str  # reserved|released
+    room_type_id: int
+    date: date_type
+    slot: int
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["date"] = self.date.isoformat()
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "BookingEvent":
+        data = json.loads(raw)
+        return cls(
+            type=str(data["type"]),
+            room_type_id=int(data["room_type_id"]),
+            date=date_type.fromisoformat(data["date"]),
+            slot=int(data["slot"]),
+        )
+
+
+class Subscription:
+    """
+    One SSE client listening to one date. Events are delivered on the client's event loop.
+    """
+
+    def __init__(self, date_value: date_type, loop: asyncio.AbstractEventLoop, max_queue: int):
+        self.date = date_value
+        self.loop = loop
+        self.queue: asyncio.Queue[BookingEvent] = asyncio.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+    def deliver(self, event: BookingEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # The client is too slow: tell it to re-fetch instead of growing without bound.
+            self.overflowed = True
+
+
+class Broker:
+    """
+    In-process pub/sub keyed by date. publish() is thread-safe (called from sync
+    request threads); subscribers live on the ASGI event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: dict[date_type, set[Subscription]] = {}
+
+    def subscribe(self, date_value: date_type, *, max_queue: int = 100) -> Subscription:
+        subscription = Subscription(date_value, asyncio.get_running_loop(), max_queue)
+        with self._lock:
+            self._subscribers.setdefault(date_value, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.date)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.date]
+
+    def broadcast(self, event: BookingEvent) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.date, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:  # pragma: no cover - loop already closed
+                self.unsubscribe(subscription)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+broker = Broker()
+
+
+def get_events_backend() -> str:
+    backend = getattr(settings, "RESERVATION_EVENTS_BACKEND", EVENTS_BACKEND_MEMORY)
+    if backend == EVENTS_BACKEND_POSTGRES and connection.vendor == "postgresql":
+        return EVENTS_BACKEND_POSTGRES
+    return EVENTS_BACKEND_MEMORY
+
+
+def publish(events: Iterable[BookingEvent]) -> None:
+    """
+    Fan events out to subscribers. Never raises (logs on failure).
+
+    - memory: delivered to the subscribers of this process only.
+    - postgres: sent with NOTIFY so every process running a listener receives them.
+    """
+    events = list(events)
+    if not events:
+        return
+
+    try:
+        if get_events_backend() == EVENTS_BACKEND_POSTGRES:
+            with connection.cursor() as cursor:
+                for event in events:
+                    cursor.execute("SELECT pg_notify(%s, %s)", [NOTIFY_CHANNEL, event.to_json()])
+            return
+
+        for event in events:
+            broker.broadcast(event)
+    except Exception:
+        logger.exception("Failed to publish %d booking event(s)", len(events))
+
+
+def publish_on_commit(*events: BookingEvent) -> None:
+    """
+    Publish booking events once the current transaction commits.
+    """
+    transaction.on_commit(lambda: publish(events))
+
+
+_listener_lock = threading.Lock()
+_listener_thread: threading.Thread | None = None
+
+
+def ensure_listener() -> None:
+    """
+    Start the Postgres LISTEN thread of this process (no-op for the memory backend).
+    """
+    global _listener_thread
+
+    if get_events_backend() != EVENTS_BACKEND_POSTGRES:
+        return
+
+    with _listener_lock:
+        if _listener_thread is not None and _listener_thread.is_alive():
+            return
+        _listener_thread = threading.Thread(target=_listen_forever, name="reservation-events-listener", daemon=True)
+        _listener_thread.start()
+
+
+def _listen_forever() -> None:  # pragma: no cover - needs a live PostgreSQL server
+    params = connection.get_connection_params()
+    while True:
+        conn = None
+        try:
+            import psycopg2
+
+            conn = psycopg2.connect(**params)
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+
+            while True:
+                if select.select([conn], [], [], 5.0) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    try:
+                        broker.broadcast(BookingEvent.from_json(notify.payload))
+                    except (KeyError, TypeError, ValueError):
+                        logger.warning("Ignoring malformed booking event: %r", notify.payload)
+        except Exception:
+            logger.exception("Booking event listener failed; reconnecting in 5s")
+        finally:
+            # Don't leak one server connection per reconnect.
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+        time.sleep(5)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import dataclass
+from datetime import date as date_type
+from typing import Iterable, Iterator
+
+from django.conf import settings
+
+from .models import Reservation, TimeSlot
+
+
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_NDJSON = "ndjson"
+EXPORT_CONTENT_TYPES = {
+    EXPORT_FORMAT_CSV: "text/csv; charset=utf-8",
+    EXPORT_FORMAT_NDJSON: "application/x-ndjson",
+}
+
+STATUS_ALL = "all"
+STATUS_UPCOMING = "upcoming"
+STATUS_PAST = "past"
+
+# (output column, values_list() lookup); the room and user columns come from the same JOINed query.
+EXPORT_FIELDS = (
+    ("id", "id"),
+    ("date", "date"),
+    ("slot", "slot"),
+    ("room_type_id", "room_type_id"),
+    ("room_name", "room_type__name"),
+    ("user_id", "user_id"),
+    ("user_email", "user__email"),
+    ("username", "user__username"),
+    ("series_id", "series_id"),
+    ("created_at", "created_at"),
+    ("updated_at", "updated_at"),
+)
+EXPORT_COLUMNS = ("id", "date", "slot", "slot_label") + tuple(column for column, _ in EXPORT_FIELDS[3:])
+
+SLOT_LABELS = dict(TimeSlot.choices)
+
+
+@dataclass(frozen=True)
+class ExportFilters:
+    start: date_type | None = None
+    end: date_type | None = None
+    room_type_ids: tuple[int, ...] = ()
+    status: str = STATUS_ALL  # all|upcoming|past
+
+
+def export_chunk_size() -> int:
+    return int(getattr(settings, "RESERVATION_EXPORT_CHUNK_SIZE", 2000))
+
+
+def export_rows(filters: ExportFilters, *, chunk_size: int | None = None) -> Iterator[tuple]:
+    """
+    Reservation rows as tuples in EXPORT_COLUMNS order, oldest first.
+
+    A single values_list() query joined with room type and user, consumed with
+    iterator(chunk_size) (a server-side cursor on PostgreSQL), so memory stays
+    flat no matter how many rows match.
+    """
+    queryset = Reservation.objects.all()
+    if filters.start is not None:
+        queryset = queryset.filter(date__gte=filters.start)
+    if filters.end is not None:
+        queryset = queryset.filter(date__lte=filters.end)
+    if filters.room_type_ids:
+        queryset = queryset.filter(room_type_id__in=filters.room_type_ids)
+    if filters.status == STATUS_UPCOMING:
+        queryset = queryset.upcoming()
+    elif filters.status == STATUS_PAST:
+        queryset = queryset.past()
+
+    rows = queryset.order_by("date", "slot", "id").values_list(*(lookup for _, lookup in EXPORT_FIELDS))
+    for row in rows.iterator(chunk_size=chunk_size or export_chunk_size()):
+        yield row[:3] + (SLOT_LABELS.get(row[2], str(row[2])),) + row[3:]
+
+
+def _isoformat(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+class _Echo:
+    """
+    File-like object whose write() hands back the line, so csv.writer can feed a generator.
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv(rows: Iterable[tuple]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow([_isoformat(value) for value in row])
+
+
+def iter_ndjson(rows: Iterable[tuple]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_COLUMNS, (_isoformat(value) for value in row))), ensure_ascii=False) + "\n"
+
+
+def iter_export(filters: ExportFilters, export_format: str, *, chunk_size: int | None = None) -> Iterator[str]:
+    rows = export_rows(filters, chunk_size=chunk_size)
+    return iter_ndjson(rows) if export_format == EXPORT_FORMAT_NDJSON else iter_csv(rows)
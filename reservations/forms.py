@@ -4,6 +4,7 @@ from datetime import date as date_type
 
 from django import forms
 
+from .availability import FULL_MASK, reserved_masks, slot_bit
 from .models import Reservation, RoomType, TimeSlot
 
 
@@ -55,10 +56,11 @@ class ReservationCreateForm(forms.Form):
         except ValueError:
             return []
 
-        reserved = set(
-            Reservation.objects.filter(room_type_id=int(room_type_id), date=target_date).values_list("slot", flat=True)
-        )
-        return [(v, label) for v, label in TimeSlot.choices if v not in reserved]
+        reserved = self._reserved_mask(int(room_type_id), target_date)
+        return [(v, label) for v, label in TimeSlot.choices if not reserved & slot_bit(v)]
+
+    def _reserved_mask(self, room_type_id: int, target_date: date_type) -> int:
+        return reserved_masks(target_date, [room_type_id])[room_type_id]
 
 
 class ReservationUpdateForm(ReservationCreateForm):
@@ -66,21 +68,13 @@ class ReservationUpdateForm(ReservationCreateForm):
         self.reservation = reservation
         super().__init__(*args, **kwargs)
 
-    def _available_slot_choices(self, room_type_id: str | None, date_str: str | None):
-        if not room_type_id or not date_str:
-            return []
-        if not str(room_type_id).isdigit():
-            return []
-        try:
-            target_date = date_type.fromisoformat(str(date_str))
-        except ValueError:
-            return []
-
-        qs = Reservation.objects.filter(room_type_id=int(room_type_id), date=target_date)
-        if self.reservation:
-            qs = qs.exclude(id=self.reservation.id)
-
-        reserved = set(qs.values_list("slot", flat=True))
-        return [(v, label) for v, label in TimeSlot.choices if v not in reserved]
-
-
+    def _reserved_mask(self, room_type_id: int, target_date: date_type) -> int:
+        mask = super()._reserved_mask(room_type_id, target_date)
+        # The reservation being edited must not block its own slot.
+        if (
+            self.reservation
+            and self.reservation.room_type_id == room_type_id
+            and self.reservation.date == target_date
+        ):
+            mask &= FULL_MASK ^ slot_bit(self.reservation.slot)
+        return mask
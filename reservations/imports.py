@@ -0,0 +1,344 @@
+"""
+Bulk import of reservations (e.g. migrating from another booking system).
+
+The file is streamed twice and never held in memory:
+1. a scan collects the date window and the room/user references;
+2. the rows are resolved through in-memory maps (room types, users) and checked
+   against the set of reservations already booked in that window (one query),
+   then inserted with bulk_create in chunks, one transaction per chunk.
+
+The import accepts the columns written by the export (exports.EXPORT_COLUMNS):
+room_type_id or room_name, user_id or user_email or username, date, slot.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date as date_type
+from typing import Callable, Iterator
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+
+from .availability import mark_slots_reserved
+from .availability_cache import invalidate_availability_on_commit
+from .conflicts import find_conflicts
+from .exports import EXPORT_FORMAT_CSV, EXPORT_FORMAT_NDJSON
+from .models import Reservation, RoomType, TimeSlot
+from .services import schedule_booked_email
+
+
+REJECT_INVALID_ROW = "invalid_row"
+REJECT_UNKNOWN_ROOM_TYPE = "unknown_room_type"
+REJECT_UNKNOWN_USER = "unknown_user"
+REJECT_DUPLICATE_IN_FILE = "duplicate_in_file"
+REJECT_SLOT_TAKEN = "slot_taken"
+
+USER_LOOKUP_CHUNK = 1000
+# Chunk inserts retried after a concurrent booking took one of their slots, before inserting row by row.
+INSERT_ATTEMPTS = 3
+VALID_SLOTS = frozenset(int(value) for value in TimeSlot.values)
+
+
+class ImportRowError(ValueError):
+    def __init__(self, reason: str, detail: str):
+        super().__init__(detail)
+        self.reason = reason
+        self.detail = detail
+
+
+@dataclass(frozen=True)
+class ImportReject:
+    line: int
+    reason: str
+    detail: str
+    record: dict
+
+
+@dataclass
+class ImportResult:
+    read: int = 0
+    created: int = 0
+    rejected: Counter = field(default_factory=Counter)
+    dry_run: bool = False
+
+    @property
+    def rejected_total(self) -> int:
+        return sum(self.rejected.values())
+
+
+@dataclass(frozen=True)
+class _Row:
+    room_type_id: int | None
+    room_name: str
+    user_id: int | None
+    user_email: str
+    username: str
+    date: date_type
+    slot: int
+
+
+def import_format_for(path: str) -> str:
+    return EXPORT_FORMAT_NDJSON if path.endswith((".ndjson", ".jsonl")) else EXPORT_FORMAT_CSV
+
+
+def iter_records(path: str, import_format: str) -> Iterator[tuple[int, dict]]:
+    """
+    (line number, raw record) pairs; a line that is not a JSON object yields an empty record.
+    """
+    with open(path, encoding="utf-8", newline="") as handle:
+        if import_format == EXPORT_FORMAT_NDJSON:
+            for line_number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = {}
+                yield line_number, record if isinstance(record, dict) else {}
+        else:
+            reader = csv.DictReader(handle)
+            for record in reader:
+                yield reader.line_num, record
+
+
+def _text(record: dict, key: str) -> str:
+    value = record.get(key)
+    return "" if value is None else str(value).strip()
+
+
+def _optional_int(record: dict, key: str) -> int | None:
+    value = _text(record, key)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError as exc:
+        raise ImportRowError(REJECT_INVALID_ROW, f"{key} must be an integer.") from exc
+
+
+def _parse_row(record: dict) -> _Row:
+    if not record:
+        raise ImportRowError(REJECT_INVALID_ROW, "Unreadable row.")
+    try:
+        date_value = date_type.fromisoformat(_text(record, "date"))
+    except ValueError as exc:
+        raise ImportRowError(REJECT_INVALID_ROW, "date must be YYYY-MM-DD.") from exc
+    slot_value = _optional_int(record, "slot")
+    if slot_value not in VALID_SLOTS:
+        raise ImportRowError(REJECT_INVALID_ROW, "slot is not a valid time slot.")
+
+    row = _Row(
+        room_type_id=_optional_int(record, "room_type_id"),
+        room_name=_text(record, "room_name"),
+        user_id=_optional_int(record, "user_id"),
+        user_email=_text(record, "user_email").lower(),
+        username=_text(record, "username"),
+        date=date_value,
+        slot=slot_value,
+    )
+    if row.room_type_id is None and not row.room_name:
+        raise ImportRowError(REJECT_INVALID_ROW, "room_type_id or room_name is required.")
+    if row.user_id is None and not row.user_email and not row.username:
+        raise ImportRowError(REJECT_INVALID_ROW, "user_id, user_email or username is required.")
+    return row
+
+
+class _Lookups:
+    """
+    In-memory maps built once per import: room types (all of them) and the users the file mentions.
+    """
+
+    def __init__(self, user_ids: set[int], emails: set[str], usernames: set[str]):
+        self.room_names: dict[int, str] = {}
+        self.room_ids_by_name: dict[str, int] = {}
+        for room_type_id, name in RoomType.objects.values_list("id", "name"):
+            self.room_names[room_type_id] = name
+            self.room_ids_by_name[name.lower()] = room_type_id
+
+        User = get_user_model()
+        self.users: dict[int, object] = {}
+        self.user_ids_by_email: dict[str, int] = {}
+        self.user_ids_by_username: dict[str, int] = {}
+        only = ("id", "email", User.USERNAME_FIELD)
+        lookups = (
+            ("id__in", sorted(user_ids)),
+            ("email_lower__in", sorted(emails)),
+            (f"{User.USERNAME_FIELD}__in", sorted(usernames)),
+        )
+        for lookup, values in lookups:
+            for start in range(0, len(values), USER_LOOKUP_CHUNK):
+                queryset = User.objects.annotate(email_lower=Lower("email")).only(*only).order_by("id")
+                for user in queryset.filter(**{lookup: values[start : start + USER_LOOKUP_CHUNK]}):
+                    self.users[user.pk] = user
+                    self.user_ids_by_email.setdefault(user.email_lower, user.pk)
+                    self.user_ids_by_username.setdefault(user.get_username(), user.pk)
+
+    def room_type_id(self, row: _Row) -> int:
+        if row.room_type_id is not None:
+            if row.room_type_id in self.room_names:
+                return row.room_type_id
+        elif row.room_name.lower() in self.room_ids_by_name:
+            return self.room_ids_by_name[row.room_name.lower()]
+        raise ImportRowError(REJECT_UNKNOWN_ROOM_TYPE, f"Unknown room type {row.room_type_id or row.room_name!r}.")
+
+    def user_id(self, row: _Row) -> int:
+        if row.user_id is not None:
+            user_id = row.user_id if row.user_id in self.users else None
+        elif row.user_email:
+            user_id = self.user_ids_by_email.get(row.user_email)
+        else:
+            user_id = self.user_ids_by_username.get(row.username)
+        if user_id is None:
+            raise ImportRowError(REJECT_UNKNOWN_USER, f"Unknown user {row.user_id or row.user_email or row.username!r}.")
+        return user_id
+
+
+def import_reservations(
+    path: str,
+    *,
+    import_format: str | None = None,
+    batch_size: int = 1000,
+    dry_run: bool = False,
+    send_emails: bool = False,
+    on_reject: Callable[[ImportReject], None] | None = None,
+) -> ImportResult:
+    """
+    Import reservations from a CSV or NDJSON file. Rejected rows are counted by
+    reason and passed to on_reject; they never abort the import. Booking emails
+    are only sent with send_emails=True (one per user and chunk).
+    """
+    import_format = import_format or import_format_for(path)
+    result = ImportResult(dry_run=dry_run)
+
+    def reject(line: int, record: dict, exc: ImportRowError) -> None:
+        result.rejected[exc.reason] += 1
+        if on_reject is not None:
+            on_reject(ImportReject(line=line, reason=exc.reason, detail=exc.detail, record=record))
+
+    # Pass 1: date window and references, without keeping rows.
+    first_date = last_date = None
+    user_ids: set[int] = set()
+    emails: set[str] = set()
+    usernames: set[str] = set()
+    for _, record in iter_records(path, import_format):
+        try:
+            row = _parse_row(record)
+        except ImportRowError:
+            continue
+        first_date = row.date if first_date is None else min(first_date, row.date)
+        last_date = row.date if last_date is None else max(last_date, row.date)
+        if row.user_id is not None:
+            user_ids.add(row.user_id)
+        elif row.user_email:
+            emails.add(row.user_email)
+        else:
+            usernames.add(row.username)
+
+    lookups = _Lookups(user_ids, emails, usernames)
+    booked: set[tuple[int, date_type, int]] = set()
+    if first_date is not None:
+        booked = set(
+            Reservation.objects.filter(date__range=(first_date, last_date))
+            .values_list("room_type_id", "date", "slot")
+            .iterator(chunk_size=5000)
+        )
+    in_file: set[tuple[int, date_type, int]] = set()
+
+    # Pass 2: resolve, check against the pre-fetched window, insert in chunks.
+    pending: list[tuple[int, dict, Reservation]] = []
+    for line, record in iter_records(path, import_format):
+        result.read += 1
+        try:
+            row = _parse_row(record)
+            key = (lookups.room_type_id(row), row.date, row.slot)
+            user_id = lookups.user_id(row)
+            if key in booked:
+                raise ImportRowError(REJECT_SLOT_TAKEN, "The slot is already reserved.")
+            if key in in_file:
+                raise ImportRowError(REJECT_DUPLICATE_IN_FILE, "The slot appears earlier in the file.")
+        except ImportRowError as exc:
+            reject(line, record, exc)
+            continue
+
+        in_file.add(key)
+        pending.append((line, record, Reservation(user_id=user_id, room_type_id=key[0], date=row.date, slot=row.slot)))
+        if len(pending) >= batch_size:
+            result.created += _flush(pending, lookups, reject, dry_run=dry_run, send_emails=send_emails)
+            pending = []
+
+    if pending:
+        result.created += _flush(pending, lookups, reject, dry_run=dry_run, send_emails=send_emails)
+    return result
+
+
+def _flush(pending, lookups: _Lookups, reject, *, dry_run: bool, send_emails: bool) -> int:
+    if dry_run:
+        return len(pending)
+
+    with transaction.atomic():
+        for _ in range(INSERT_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    Reservation.objects.bulk_create([reservation for _, _, reservation in pending])
+                break
+            except IntegrityError:
+                # Someone booked one of these slots after the window was fetched: recheck this chunk only.
+                kept = _drop_taken(pending, reject)
+                if len(kept) == len(pending):
+                    pending = _insert_row_by_row(pending, reject)  # not a slot conflict: find the bad rows
+                    break
+                pending = kept
+        else:
+            pending = _insert_row_by_row(pending, reject)
+
+        reservations = [reservation for _, _, reservation in pending]
+        mark_slots_reserved((reservation.room_type_id, reservation.date, reservation.slot) for reservation in reservations)
+        invalidate_availability_on_commit(*{reservation.date for reservation in reservations})
+        if send_emails:
+            _schedule_import_emails(reservations, lookups)
+    return len(reservations)
+
+
+def _drop_taken(pending, reject) -> list:
+    taken = find_conflicts((reservation.room_type_id, reservation.date, reservation.slot) for _, _, reservation in pending)
+    kept = []
+    for line, record, reservation in pending:
+        if (reservation.room_type_id, reservation.date, reservation.slot) in taken:
+            reject(line, record, ImportRowError(REJECT_SLOT_TAKEN, "The slot was reserved during the import."))
+        else:
+            kept.append((line, record, reservation))
+    return kept
+
+
+def _insert_row_by_row(pending, reject) -> list:
+    """
+    Last resort for a chunk that keeps failing: one savepoint per row, so only the failing rows are rejected.
+    """
+    inserted = []
+    for line, record, reservation in pending:
+        try:
+            with transaction.atomic():
+                reservation.save(force_insert=True)
+        except IntegrityError as exc:
+            if find_conflicts([(reservation.room_type_id, reservation.date, reservation.slot)]):
+                reject(line, record, ImportRowError(REJECT_SLOT_TAKEN, "The slot was reserved during the import."))
+            else:
+                reject(line, record, ImportRowError(REJECT_INVALID_ROW, str(exc)))
+            continue
+        inserted.append((line, record, reservation))
+    return inserted
+
+
+def _schedule_import_emails(reservations: list[Reservation], lookups: _Lookups) -> None:
+    by_user: dict[int, list[tuple[str, date_type, int]]] = {}
+    for reservation in reservations:
+        by_user.setdefault(reservation.user_id, []).append(
+            (lookups.room_names[reservation.room_type_id], reservation.date, reservation.slot)
+        )
+    for user_id, booked in by_user.items():
+        schedule_booked_email(lookups.users[user_id], booked)
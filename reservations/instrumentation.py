@@ -0,0 +1,195 @@
+"""
+Per-request database instrumentation.
+
+QueryInstrumentationMiddleware wraps each request with connection.execute_wrapper
+and reports the query count, total DB time, duplicated SQL (the same statement
+run more than once: usually an N+1) and the time spent in row/advisory lock
+statements (select_for_update in services.py, acquire_booking_locks). Results go
+to a Server-Timing header and one structured log line per request.
+
+Per-view query budgets (RESERVATION_QUERY_BUDGETS) count the queries the view
+itself runs, after the session and user have been loaded. In "raise" mode an
+exceeded budget raises QueryBudgetExceeded, which fails the test that made the
+request; query_budget() does the same for a block of code.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+
+logger = logging.getLogger("reservations.queries")
+
+
+BUDGET_MODE_LOG = "log"
+BUDGET_MODE_RAISE = "raise"
+
+# Statements that can wait on another transaction's lock.
+LOCK_SQL_MARKERS = ("FOR UPDATE", "PG_ADVISORY_XACT_LOCK")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    db_ms: float = 0.0
+    lock_queries: int = 0
+    lock_wait_ms: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, sql: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.db_ms += elapsed_ms
+        self.statements[sql] += 1
+        upper = sql.upper()
+        if any(marker in upper for marker in LOCK_SQL_MARKERS):
+            self.lock_queries += 1
+            self.lock_wait_ms += elapsed_ms
+
+    @property
+    def duplicates(self) -> int:
+        """
+        Executions beyond the first of any statement (same SQL text, any parameters).
+        """
+        return sum(times - 1 for times in self.statements.values() if times > 1)
+
+    def most_repeated(self) -> tuple[str, int] | None:
+        if not self.statements:
+            return None
+        sql, times = self.statements.most_common(1)[0]
+        return (sql, times) if times > 1 else None
+
+
+class _Recorder:
+    def __init__(self, stats: QueryStats):
+        self.stats = stats
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.stats.record(sql, (time.perf_counter() - started) * 1000)
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryStats]:
+    """
+    Record every query run on this thread's connections inside the block.
+    """
+    stats = QueryStats()
+    recorder = _Recorder(stats)
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield stats
+
+
+def _budget_error(label: str, used: int, budget: int, stats: QueryStats) -> str:
+    message = f"{label} ran {used} queries (budget {budget})"
+    repeated = stats.most_repeated()
+    if repeated:
+        message += f"; most repeated ({repeated[1]}x): {repeated[0][:200]}"
+    return message
+
+
+@contextmanager
+def query_budget(max_queries: int, *, label: str = "block") -> Iterator[QueryStats]:
+    """
+    Fail (QueryBudgetExceeded) when the block runs more than max_queries queries.
+    """
+    with record_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        raise QueryBudgetExceeded(_budget_error(label, stats.count, max_queries, stats))
+
+
+def server_timing(stats: QueryStats, *, view_queries: int | None = None) -> str:
+    parts = [f'db;dur={stats.db_ms:.2f};desc="{stats.count} queries"']
+    if view_queries is not None:
+        parts.append(f'db-view;desc="{view_queries} queries in view"')
+    if stats.duplicates:
+        parts.append(f'db-dup;desc="{stats.duplicates} duplicated"')
+    if stats.lock_queries:
+        parts.append(f'db-lock;dur={stats.lock_wait_ms:.2f};desc="{stats.lock_queries} lock statements"')
+    return ", ".join(parts)
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Enabled by RESERVATION_QUERY_INSTRUMENTATION; otherwise removed from the chain at startup.
+    Put it first so the session and user lookups are counted too.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "RESERVATION_QUERY_INSTRUMENTATION", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.budgets: dict[str, int] = dict(getattr(settings, "RESERVATION_QUERY_BUDGETS", {}) or {})
+        self.budget_mode = getattr(settings, "RESERVATION_QUERY_BUDGET_MODE", BUDGET_MODE_LOG)
+
+    def __call__(self, request):
+        with record_queries() as stats:
+            request._query_stats = stats
+            response = self.get_response(request)
+
+        view_start = getattr(request, "_query_view_start", None)
+        view_queries = stats.count - view_start if view_start is not None else None
+        response["Server-Timing"] = server_timing(stats, view_queries=view_queries)
+        self._log(request, response, stats, view_queries)
+        self._check_budget(request, stats, view_queries)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        stats = getattr(request, "_query_stats", None)
+        if stats is None:
+            return None
+        if self._budget_for(request) is not None:
+            # Resolve the lazy session/user now, so the budget only counts the view's own queries.
+            user = getattr(request, "user", None)
+            if user is not None:
+                user.is_authenticated
+        request._query_view_start = stats.count
+        return None
+
+    def _budget_for(self, request) -> int | None:
+        match = getattr(request, "resolver_match", None)
+        return self.budgets.get(match.view_name) if match is not None else None
+
+    def _log(self, request, response, stats: QueryStats, view_queries: int | None) -> None:
+        match = getattr(request, "resolver_match", None)
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match is not None else "",
+            "status": response.status_code,
+            "queries": stats.count,
+            "view_queries": view_queries,
+            "db_ms": round(stats.db_ms, 2),
+            "duplicates": stats.duplicates,
+            "lock_queries": stats.lock_queries,
+            "lock_wait_ms": round(stats.lock_wait_ms, 2),
+        }
+        level = logging.WARNING if stats.duplicates else logging.INFO
+        logger.log(level, " ".join(f"{key}={value}" for key, value in fields.items()), extra={"db": fields})
+
+    def _check_budget(self, request, stats: QueryStats, view_queries: int | None) -> None:
+        budget = self._budget_for(request)
+        if budget is None or view_queries is None or view_queries <= budget:
+            return
+        message = _budget_error(request.resolver_match.view_name, view_queries, budget, stats)
+        if self.budget_mode == BUDGET_MODE_RAISE:
+            raise QueryBudgetExceeded(message)
+        logger.warning("Query budget exceeded: %s", message)
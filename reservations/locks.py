@@ -0,0 +1,209 @@
+"""
+Booking locks.
+
+Lock order (every booking transaction follows it, so none can wait on another in a cycle):
+1. the SQLite database write lock (booking_transaction), SQLite only;
+2. the reservation row being edited or cancelled (lock_reservation);
+3. the (room_type, date) booking keys, ascending, in a single acquire_booking_locks() call.
+
+Each acquisition is timed into the reservation_lock_wait_seconds metric; waits
+longer than RESERVATION_LOCK_SLOW_MS are logged on "reservations.locks" with
+the keys involved, and deadlocks reported by the database are logged with the
+keys the transaction held.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date as date_type
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+
+from .metrics import DEADLOCKS, LOCK_WAIT_SECONDS, SLOW_LOCK_WAITS
+from .models import Reservation, RoomType
+
+
+logger = logging.getLogger("reservations.locks")
+
+
+LOCK_SCOPE_ROOM_DATE = "room_date"
+LOCK_SCOPE_ROOM_TYPE = "room_type"
+
+
+LOCK_SQLITE_WRITE = "sqlite_write"
+LOCK_RESERVATION_ROW = "reservation_row"
+LOCK_ADVISORY = "advisory"
+LOCK_ROOM_TYPE_ROWS = "room_type_rows"
+
+# SQLSTATE 40P01 (PostgreSQL) / error 1213 (MySQL): the transaction was chosen as a deadlock victim.
+DEADLOCK_SQLSTATE = "40P01"
+MYSQL_DEADLOCK_ERRNO = 1213
+
+
+BookingLockKey = tuple[int, date_type]
+
+
+class LockOrderError(RuntimeError):
+    """
+    Booking keys requested out of order within one booking transaction (a deadlock risk).
+    """
+
+
+# Booking keys locked by the current thread's booking transaction, for ordering checks and deadlock logs.
+_held = threading.local()
+
+
+def _held_keys() -> list[BookingLockKey]:
+    return getattr(_held, "keys", None) or []
+
+
+def is_deadlock(exc: BaseException) -> bool:
+    cause = exc.__cause__ or exc
+    code = getattr(cause, "sqlstate", None) or getattr(cause, "pgcode", None)
+    if code == DEADLOCK_SQLSTATE:
+        return True
+    args = getattr(cause, "args", ())
+    return connection.vendor == "mysql" and bool(args) and args[0] == MYSQL_DEADLOCK_ERRNO
+
+
+def _record_wait(lock: str, started: float, detail: str) -> None:
+    elapsed = time.perf_counter() - started
+    LOCK_WAIT_SECONDS.observe(elapsed, lock=lock)
+    slow_ms = float(getattr(settings, "RESERVATION_LOCK_SLOW_MS", 100))
+    if elapsed * 1000 >= slow_ms:
+        SLOW_LOCK_WAITS.inc(lock=lock)
+        logger.warning(
+            "Slow lock wait: %.1f ms for %s %s",
+            elapsed * 1000,
+            lock,
+            detail,
+            extra={"lock": {"lock": lock, "wait_ms": round(elapsed * 1000, 2), "detail": detail}},
+        )
+
+
+def _format_keys(keys: Iterable[BookingLockKey]) -> str:
+    return "[" + ", ".join(f"(room_type={room_type_id}, date={day.isoformat()})" for room_type_id, day in keys) + "]"
+
+
+def get_lock_scope() -> str:
+    """
+    Lock granularity used by the booking services.
+
+    - "room_date" (default): one lock per (room_type, date) pair.
+    - "room_type": legacy behaviour, one row lock per RoomType for all dates.
+    """
+    scope = getattr(settings, "RESERVATION_LOCK_SCOPE", LOCK_SCOPE_ROOM_DATE)
+    if scope not in {LOCK_SCOPE_ROOM_DATE, LOCK_SCOPE_ROOM_TYPE}:
+        return LOCK_SCOPE_ROOM_DATE
+    return scope
+
+
+@contextmanager
+def booking_transaction() -> Iterator[None]:
+    """
+    transaction.atomic() for booking writes.
+
+    SQLite has no row or advisory locks: a transaction that reads first and
+    writes later fails with "database is locked" (instead of waiting) when
+    another writer got there first. Taking the database write lock as the very
+    first statement makes concurrent bookings queue on the busy timeout instead.
+
+    A deadlock reported by the database is logged with the booking keys this
+    transaction held, then re-raised.
+
+    Nested calls run in a savepoint of the outer booking transaction and share
+    its held keys (its locks stay held until the outer transaction ends), so the
+    lock order is still enforced across them.
+    """
+    outermost = getattr(_held, "keys", None) is None
+    if outermost:
+        _held.keys = []
+    try:
+        with transaction.atomic():
+            if connection.vendor == "sqlite":
+                started = time.perf_counter()
+                with connection.cursor() as cursor:
+                    cursor.execute(f"UPDATE {RoomType._meta.db_table} SET id = id WHERE 0")
+                _record_wait(LOCK_SQLITE_WRITE, started, "(database)")
+            yield
+    except OperationalError as exc:
+        if is_deadlock(exc):
+            DEADLOCKS.inc()
+            logger.error("Deadlock in booking transaction holding %s: %s", _format_keys(_held_keys()), exc)
+        raise
+    finally:
+        if outermost:
+            _held.keys = None
+
+
+def lock_reservation(reservation_id: int, queryset=None) -> Reservation:
+    """
+    select_for_update() one reservation row (step 2 of the lock order), timed like the booking locks.
+
+    Only that row is locked, even when the queryset joins room_type (select_related):
+    a plain FOR UPDATE would also lock the RoomType row and queue every edit in that room type.
+    """
+    queryset = Reservation.objects.all() if queryset is None else queryset
+    of = ("self",) if connection.features.has_select_for_update_of else ()
+    started = time.perf_counter()
+    reservation = queryset.select_for_update(of=of).get(id=reservation_id)
+    _record_wait(
+        LOCK_RESERVATION_ROW,
+        started,
+        f"reservation #{reservation.id} {_format_keys([(reservation.room_type_id, reservation.date)])}",
+    )
+    return reservation
+
+
+def _lock_order(keys: Iterable[BookingLockKey]) -> list[BookingLockKey]:
+    return sorted({(int(room_type_id), day) for room_type_id, day in keys})
+
+
+def acquire_booking_locks(keys: Iterable[BookingLockKey]) -> None:
+    """
+    Serialize bookings that target the same (room_type, date) pairs.
+
+    Must be called inside booking_transaction(); every lock is released when the
+    surrounding transaction commits or rolls back.
+
+    Keys are de-duplicated and acquired in ascending (room_type_id, date) order
+    (e.g. a move between room types locks the lower id first, whatever the
+    direction), so two transactions locking overlapping keys can never deadlock.
+    A later call in the same booking transaction may only add keys above the ones
+    already held, otherwise LockOrderError is raised: pass every key in one call.
+
+    - PostgreSQL: transaction-level advisory locks keyed on
+      (room_type_id, date ordinal), so bookings for the same room on different
+      dates no longer queue behind each other.
+    - SQLite: nothing to do, booking_transaction() already holds the database write lock.
+    - Other backends (or RESERVATION_LOCK_SCOPE="room_type"): RoomType row locks.
+    """
+    held = _held_keys()
+    ordered = [key for key in _lock_order(keys) if key not in held]
+    if not ordered:
+        return
+    if held and ordered[0] < held[-1]:
+        raise LockOrderError(
+            f"Cannot lock {_format_keys(ordered)} after {_format_keys(held)}; pass every key in one call."
+        )
+    _held.keys = held + ordered
+    if connection.vendor == "sqlite":
+        return
+
+    if get_lock_scope() == LOCK_SCOPE_ROOM_DATE and connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            for key in ordered:
+                started = time.perf_counter()
+                cursor.execute("SELECT pg_advisory_xact_lock(%s, %s)", [key[0], key[1].toordinal()])
+                _record_wait(LOCK_ADVISORY, started, _format_keys([key]))
+        return
+
+    room_type_ids = sorted({room_type_id for room_type_id, _ in ordered})
+    started = time.perf_counter()
+    list(RoomType.objects.select_for_update().filter(id__in=room_type_ids).order_by("id").values_list("id", flat=True))
+    _record_wait(LOCK_ROOM_TYPE_ROWS, started, _format_keys(ordered))
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from benchmarks.async_api import run_async_api_benchmark
+from benchmarks.harness import isolated_database
+
+
+class Command(BaseCommand):
+    help = "Compare the sync and async availability API views under concurrent ASGI load (throwaway test DB)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500, help="Requests per variant.")
+        parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight at once.")
+        parser.add_argument("--room-types", type=int, default=8, help="Active room types to seed.")
+        parser.add_argument("--cache", action="store_true", help="Keep the availability cache enabled.")
+
+    def handle(self, *args, **options):
+        with isolated_database(verbosity=0):
+            result = run_async_api_benchmark(
+                requests=options["requests"],
+                concurrency=options["concurrency"],
+                room_types=options["room_types"],
+                use_cache=options["cache"],
+            )
+        self.stdout.write(json.dumps(result, indent=2))
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from benchmarks.booking_contention import run_booking_contention_benchmark
+from benchmarks.harness import isolated_database
+
+
+class Command(BaseCommand):
+    help = "Benchmark booking throughput when many users book one room type on different dates (throwaway test DB)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=16, help="Concurrent booking threads.")
+        parser.add_argument("--bookings", type=int, default=20, help="Bookings per thread.")
+        parser.add_argument(
+            "--hold-ms",
+            type=float,
+            default=5.0,
+            help="Simulated in-transaction work (ms) while the booking lock is held.",
+        )
+
+    def handle(self, *args, **options):
+        with isolated_database(verbosity=0):
+            result = run_booking_contention_benchmark(
+                threads=options["threads"],
+                bookings_per_thread=options["bookings"],
+                hold_ms=options["hold_ms"],
+            )
+        self.stdout.write(json.dumps(result, indent=2))
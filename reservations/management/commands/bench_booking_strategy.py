@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from benchmarks.booking_strategy import run_booking_strategy_benchmark
+from benchmarks.harness import isolated_database
+
+
+class Command(BaseCommand):
+    help = "Compare p50/p95/p99 latency of the pessimistic and optimistic booking strategies (throwaway test DB)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=16, help="Concurrent booking threads.")
+        parser.add_argument("--days", type=int, default=5, help="Number of days of slots every thread competes for.")
+        parser.add_argument("--seed", type=int, default=42, help="Seed for the per-thread booking order.")
+
+    def handle(self, *args, **options):
+        with isolated_database(verbosity=0):
+            result = run_booking_strategy_benchmark(
+                threads=options["threads"],
+                days=options["days"],
+                seed=options["seed"],
+            )
+        self.stdout.write(json.dumps(result, indent=2))
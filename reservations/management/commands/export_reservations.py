@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import sys
+from datetime import date as date_type
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reservations.exports import (
+    EXPORT_CONTENT_TYPES,
+    EXPORT_FORMAT_CSV,
+    STATUS_ALL,
+    STATUS_PAST,
+    STATUS_UPCOMING,
+    ExportFilters,
+    iter_export,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream reservations as CSV or NDJSON (constant memory, any number of rows)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=sorted(EXPORT_CONTENT_TYPES), default=EXPORT_FORMAT_CSV)
+        parser.add_argument("--start", help="First date (YYYY-MM-DD).")
+        parser.add_argument("--end", help="Last date (YYYY-MM-DD).")
+        parser.add_argument(
+            "--room-type",
+            type=int,
+            action="append",
+            dest="room_type_ids",
+            default=[],
+            help="Limit to a room type id (repeatable).",
+        )
+        parser.add_argument("--status", choices=[STATUS_ALL, STATUS_UPCOMING, STATUS_PAST], default=STATUS_ALL)
+        parser.add_argument("--output", "-o", help="Write to this file instead of stdout.")
+        parser.add_argument("--chunk-size", type=int, help="Rows fetched per round trip (default RESERVATION_EXPORT_CHUNK_SIZE).")
+
+    def handle(self, *args, **options):
+        try:
+            start = date_type.fromisoformat(options["start"]) if options["start"] else None
+            end = date_type.fromisoformat(options["end"]) if options["end"] else None
+        except ValueError as exc:
+            raise CommandError("Invalid date. Expected YYYY-MM-DD.") from exc
+
+        filters = ExportFilters(
+            start=start,
+            end=end,
+            room_type_ids=tuple(options["room_type_ids"]),
+            status=options["status"],
+        )
+        chunks = iter_export(filters, options["format"], chunk_size=options["chunk_size"])
+
+        if not options["output"]:
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+            return
+
+        rows = -1 if options["format"] == EXPORT_FORMAT_CSV else 0  # the CSV header is not a row
+        with open(options["output"], "w", encoding="utf-8", newline="") as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+                rows += 1
+        self.stdout.write(self.style.SUCCESS(f"Exported {rows} reservation(s) to {options['output']}"))
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reservations.exports import EXPORT_FORMAT_CSV, EXPORT_FORMAT_NDJSON
+from reservations.imports import ImportReject, import_format_for, import_reservations
+
+
+class Command(BaseCommand):
+    help = (
+        "Import reservations from a CSV or NDJSON file (the export format). "
+        "Rows are validated in bulk and inserted in chunks; booking emails are not sent unless asked."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or NDJSON file (.ndjson/.jsonl are read as NDJSON).")
+        parser.add_argument("--format", choices=[EXPORT_FORMAT_CSV, EXPORT_FORMAT_NDJSON], help="Override the format guessed from the file name.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per bulk insert / transaction (default 1000).")
+        parser.add_argument("--dry-run", action="store_true", help="Validate and report without writing anything.")
+        parser.add_argument("--send-emails", action="store_true", help="Send booking confirmations (one per user and chunk).")
+        parser.add_argument("--rejects", help="Write rejected rows to this CSV file (line, reason, detail, record).")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.isfile(path):
+            raise CommandError(f"No such file: {path}")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        rejects_handle = open(options["rejects"], "w", encoding="utf-8", newline="") if options["rejects"] else None
+        rejects_writer = csv.writer(rejects_handle) if rejects_handle else None
+        if rejects_writer:
+            rejects_writer.writerow(["line", "reason", "detail", "record"])
+
+        def on_reject(item: ImportReject) -> None:
+            if rejects_writer:
+                rejects_writer.writerow([item.line, item.reason, item.detail, json.dumps(item.record, ensure_ascii=False)])
+            if options["verbosity"] >= 2:
+                self.stderr.write(f"line {item.line}: {item.reason}: {item.detail}")
+
+        try:
+            result = import_reservations(
+                path,
+                import_format=options["format"] or import_format_for(path),
+                batch_size=options["batch_size"],
+                dry_run=options["dry_run"],
+                send_emails=options["send_emails"],
+                on_reject=on_reject,
+            )
+        finally:
+            if rejects_handle:
+                rejects_handle.close()
+
+        verb = "Would create" if result.dry_run else "Created"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {result.created} reservation(s) from {result.read} row(s); rejected {result.rejected_total}.")
+        )
+        for reason, count in sorted(result.rejected.items()):
+            self.stdout.write(f"  {reason}: {count}")
+        if rejects_writer and result.rejected_total:
+            self.stdout.write(f"Rejected rows written to {options['rejects']}")
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+from django.core.management.base import BaseCommand
+
+from reservations.outbox import process_outbox_batch
+
+
+class Command(BaseCommand):
+    help = "Send queued booking emails (RESERVATION_EMAIL_DELIVERY=outbox) in batches over one mail connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, help="Rows per batch (default RESERVATION_EMAIL_OUTBOX_BATCH_SIZE).")
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            help="Attempts before a row is dead-lettered (default RESERVATION_EMAIL_OUTBOX_MAX_ATTEMPTS).",
+        )
+        parser.add_argument(
+            "--digest",
+            action=argparse.BooleanOptionalAction,
+            default=None,
+            help="Combine emails to the same recipient into one summary (default RESERVATION_EMAIL_DIGEST).",
+        )
+        parser.add_argument("--once", action="store_true", help="Drain what is due now and exit instead of polling.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds to sleep when the outbox is idle.")
+
+    def handle(self, *args, **options):
+        totals = {"claimed": 0, "sent": 0, "retried": 0, "dead": 0, "messages": 0}
+        try:
+            while True:
+                counts = process_outbox_batch(
+                    batch_size=options["batch_size"],
+                    max_attempts=options["max_attempts"],
+                    digest=options["digest"],
+                )
+                for key, value in counts.items():
+                    totals[key] += value
+                if counts["claimed"]:
+                    self.stdout.write(
+                        f"Batch: sent={counts['sent']} messages={counts['messages']} "
+                        f"retried={counts['retried']} dead={counts['dead']}"
+                    )
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Email outbox processed: "
+                f"sent={totals['sent']} messages={totals['messages']} "
+                f"retried={totals['retried']} dead={totals['dead']}"
+            )
+        )
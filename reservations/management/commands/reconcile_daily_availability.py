@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from datetime import date as date_type
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reservations.availability import reconcile_daily_availability
+
+
+class Command(BaseCommand):
+    help = "Rebuild the DailyAvailability slot bitmask index from Reservation rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", help="First date to reconcile (YYYY-MM-DD). Defaults to all history.")
+        parser.add_argument("--end", help="Last date to reconcile (YYYY-MM-DD). Defaults to all future dates.")
+        parser.add_argument(
+            "--room-type",
+            type=int,
+            action="append",
+            dest="room_type_ids",
+            help="Limit to a room type id (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            start = date_type.fromisoformat(options["start"]) if options["start"] else None
+            end = date_type.fromisoformat(options["end"]) if options["end"] else None
+        except ValueError as exc:
+            raise CommandError("Invalid date. Expected YYYY-MM-DD.") from exc
+
+        result = reconcile_daily_availability(start=start, end=end, room_type_ids=options["room_type_ids"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Reconcile completed: "
+                f"created={result['created']} updated={result['updated']} "
+                f"deleted={result['deleted']} unchanged={result['unchanged']}"
+            )
+        )
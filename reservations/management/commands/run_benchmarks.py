@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.harness import isolated_database
+from benchmarks.http_suite import SCENARIOS, run_http_suite
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the HTTP benchmark suite (availability, create, hot-slot create, update, cancel, "
+        "my reservations) on a throwaway test DB and print JSON to diff between commits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=SCENARIOS,
+            dest="scenarios",
+            help="Run only this scenario (repeatable; default: all).",
+        )
+        parser.add_argument("--requests", type=int, default=200, help="Measured requests per sequential scenario.")
+        parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests before each sequential scenario.")
+        parser.add_argument("--threads", type=int, default=8, help="Concurrent clients in the hot-slot scenario.")
+        parser.add_argument("--rounds", type=int, default=25, help="Contested slots in the hot-slot scenario.")
+        parser.add_argument("--room-types", type=int, default=4, help="Active room types to seed.")
+        parser.add_argument("--cache", action="store_true", help="Keep the availability cache enabled.")
+        parser.add_argument("--output", "-o", help="Also write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        if min(options["requests"], options["threads"], options["rounds"], options["room_types"]) < 1:
+            raise CommandError("--requests, --threads, --rounds and --room-types must be at least 1.")
+
+        with isolated_database(verbosity=0):
+            result = run_http_suite(
+                scenarios=tuple(options["scenarios"] or SCENARIOS),
+                requests=options["requests"],
+                warmup=max(options["warmup"], 0),
+                threads=options["threads"],
+                rounds=options["rounds"],
+                room_types=options["room_types"],
+                use_cache=options["cache"],
+            )
+
+        report = json.dumps(result, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                handle.write(report + "\n")
+        self.stdout.write(report)
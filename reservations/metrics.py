@@ -0,0 +1,411 @@
+"""
+In-process metrics registry (counters and histograms) served in the Prometheus
+text format at /metrics, without any client library or external service.
+
+Each process keeps its metrics in memory; by default /metrics only reports the
+process that answers it. With RESERVATION_METRICS_DIR set (needed for
+gunicorn/uvicorn with several workers), a background thread of every process
+that recorded something writes its values to <dir>/<pid>-<token>.json, at most
+every RESERVATION_METRICS_FLUSH_SECONDS and at exit, and /metrics adds the
+snapshots of the other live processes to its own. Snapshots of exited
+processes are deleted, so a recycled worker shows up as a counter reset, which
+Prometheus' rate() and increase() already handle.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import json
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Iterator
+
+from django.conf import settings
+from django.db import transaction
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: tuple[str, ...]):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.values: dict[tuple[str, ...], object] = {}
+
+    def _key(self, labels: dict[str, object]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def describe(self) -> dict:
+        return {"type": self.kind, "help": self.documentation, "labelnames": list(self.labelnames)}
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+        self.registry.changed()
+
+    def value(self, **labels) -> float:
+        """
+        This process's current value (not the multi-process total).
+        """
+        with self.registry.lock:
+            return self.values.get(self._key(labels), 0.0)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(*args)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self.registry.lock:
+            # [count per bucket (non-cumulative)..., +Inf bucket, sum]
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [0.0] * (len(self.buckets) + 2)
+            index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+            state[index] += 1
+            state[-1] += value
+        self.registry.changed()
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def describe(self) -> dict:
+        return {**super().describe(), "buckets": list(self.buckets)}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._metrics: dict[str, _Metric] = {}
+        self._token = uuid.uuid4().hex[:8]
+        self._dirty = threading.Event()
+        self._flusher: threading.Thread | None = None
+        self._exit_hook = False
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(self, name, documentation, tuple(labelnames)))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(self, name, documentation, tuple(labelnames), buckets=buckets))
+
+    def _register(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def _after_fork(self) -> None:
+        # A forked worker starts from zero under its own snapshot file; the parent keeps its values.
+        # Threads do not survive fork(): the child starts its own flusher on its first update.
+        self.lock = threading.Lock()
+        self._token = uuid.uuid4().hex[:8]
+        self._dirty = threading.Event()
+        self._flusher = None
+        for metric in self._metrics.values():
+            metric.values = {}
+
+    # -- multi-process snapshots ----------------------------------------------------
+
+    def _directory(self) -> Path | None:
+        directory = getattr(settings, "RESERVATION_METRICS_DIR", "") or ""
+        return Path(directory) if directory else None
+
+    def _snapshot_path(self, directory: Path) -> Path:
+        return directory / f"{os.getpid()}-{self._token}.json"
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                name: {**metric.describe(), "values": [[list(key), value] for key, value in metric.values.items()]}
+                for name, metric in self._metrics.items()
+            }
+
+    def changed(self) -> None:
+        """
+        Mark the snapshot as out of date. Never writes: the file I/O happens on a background thread.
+        """
+        if self._directory() is None:
+            return
+        self._dirty.set()
+        if self._flusher is None:
+            self._start_flusher()
+
+    def _start_flusher(self) -> None:
+        with self.lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True)
+            self._flusher.start()
+            if not self._exit_hook:
+                # Only processes that recorded something leave a snapshot behind.
+                atexit.register(self.flush)
+                self._exit_hook = True
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._dirty.wait()
+            time.sleep(float(getattr(settings, "RESERVATION_METRICS_FLUSH_SECONDS", 5.0)))
+            self.flush()
+
+    def flush(self) -> None:
+        directory = self._directory()
+        if directory is None or not self._dirty.is_set():
+            return
+        self._dirty.clear()
+        path = self._snapshot_path(directory)
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(self.snapshot()), encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError:
+            logger.exception("Cannot write metrics snapshot to %s", directory)
+
+    def _other_snapshots(self, directory: Path) -> Iterator[dict]:
+        """
+        Snapshots of the other live processes; files left by exited processes are deleted.
+        """
+        own = self._snapshot_path(directory)
+        for path in sorted(directory.glob("*.json")):
+            if path == own:
+                continue
+            pid = path.stem.partition("-")[0]
+            if not pid.isdigit() or not _pid_alive(int(pid)):
+                path.unlink(missing_ok=True)
+                continue
+            try:
+                yield json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue  # being replaced by its writer, or unreadable
+
+    def collect(self) -> dict:
+        """
+        Metrics of every live process (this one from memory, the others from their snapshots), summed per label set.
+        """
+        own = self.snapshot()
+        directory = self._directory()
+        if directory is None or not directory.is_dir():
+            return own
+
+        merged: dict[str, dict] = {}
+        for snapshot in (own, *self._other_snapshots(directory)):
+            for name, data in snapshot.items():
+                target = merged.setdefault(name, {**data, "values": {}})
+                for key, value in data["values"]:
+                    key = tuple(key)
+                    if key not in target["values"]:
+                        target["values"][key] = value
+                    elif isinstance(value, list):
+                        target["values"][key] = [a + b for a, b in zip(target["values"][key], value)]
+                    else:
+                        target["values"][key] += value
+        for data in merged.values():
+            data["values"] = [[list(key), value] for key, value in data["values"].items()]
+        return merged
+
+    # -- exposition -----------------------------------------------------------------
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for name, data in sorted(self.collect().items()):
+            lines.append(f"# HELP {name} {_escape_help(data['help'])}")
+            lines.append(f"# TYPE {name} {data['type']}")
+            labelnames = data["labelnames"]
+            for key, value in sorted(data["values"], key=lambda item: item[0]):
+                labels = list(zip(labelnames, key))
+                if data["type"] == "histogram":
+                    cumulative = 0.0
+                    for bound, count in zip([*data["buckets"], math.inf], value[:-1]):
+                        cumulative += count
+                        le = "+Inf" if bound == math.inf else _format_number(bound)
+                        lines.append(f"{name}_bucket{_labels(labels + [('le', le)])} {_format_number(cumulative)}")
+                    lines.append(f"{name}_sum{_labels(labels)} {_format_number(value[-1])}")
+                    lines.append(f"{name}_count{_labels(labels)} {_format_number(cumulative)}")
+                else:
+                    lines.append(f"{name}{_labels(labels)} {_format_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # alive, owned by another user
+    return True
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs: list[tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + "}"
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+BOOKINGS = REGISTRY.counter(
+    "reservation_bookings_total",
+    "Reservations created, by booking path (single, batch, series).",
+    ("kind",),
+)
+BOOKING_CHANGES = REGISTRY.counter(
+    "reservation_changes_total",
+    "Reservations updated or cancelled.",
+    ("operation",),
+)
+SLOT_CONFLICTS = REGISTRY.counter(
+    "reservation_slot_conflicts_total",
+    "Booking API requests rejected because a slot was taken (HTTP 409), by endpoint.",
+    ("endpoint",),
+)
+INTEGRITY_RACES = REGISTRY.counter(
+    "reservation_integrity_races_total",
+    "Unique-constraint violations caught at insert time (two writers raced for a slot).",
+    ("operation",),
+)
+API_RESPONSES = REGISTRY.counter(
+    "reservation_api_responses_total",
+    "JSON API responses by endpoint and status code.",
+    ("endpoint", "status"),
+)
+API_SECONDS = REGISTRY.histogram(
+    "reservation_api_request_seconds",
+    "JSON API request duration by endpoint.",
+    ("endpoint",),
+)
+EMAILS = REGISTRY.counter(
+    "reservation_emails_total",
+    "Booking emails handed to the mail backend, by delivery channel and result.",
+    ("channel", "result"),
+)
+EMAIL_SECONDS = REGISTRY.histogram(
+    "reservation_email_send_seconds",
+    "Time to hand one booking email to the mail backend.",
+    ("channel",),
+)
+AVAILABILITY_CACHE = REGISTRY.counter(
+    "reservation_availability_cache_total",
+    "Availability cache lookups (hit/miss) and date invalidations.",
+    ("result",),
+)
+
+LOCK_WAIT_SECONDS = REGISTRY.histogram(
+    "reservation_lock_wait_seconds",
+    "Time to acquire a booking lock, by lock kind (see reservations.locks).",
+    ("lock",),
+)
+SLOW_LOCK_WAITS = REGISTRY.counter(
+    "reservation_slow_lock_waits_total",
+    "Booking lock acquisitions slower than RESERVATION_LOCK_SLOW_MS.",
+    ("lock",),
+)
+DEADLOCKS = REGISTRY.counter(
+    "reservation_deadlocks_total",
+    "Booking transactions aborted by the database as deadlock victims.",
+)
+
+
+def inc_on_commit(counter: Counter, amount: float = 1.0, **labels) -> None:
+    """
+    Increment once the current transaction commits, so rolled-back bookings are never counted.
+    """
+    transaction.on_commit(lambda: counter.inc(amount, **labels))
+
+
+def _record_response(endpoint: str, started: float, status: int) -> None:
+    API_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint)
+    API_RESPONSES.inc(endpoint=endpoint, status=status)
+    if status == 409:
+        SLOT_CONFLICTS.inc(endpoint=endpoint)
+
+
+def instrument_endpoint(endpoint: str):
+    """
+    Count and time a JSON API view (sync or async) under `endpoint`; an exception counts as a 500.
+    """
+
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+
+            @wraps(view)
+            async def async_view(request, *args, **kwargs):
+                started, status = time.perf_counter(), 500
+                try:
+                    response = await view(request, *args, **kwargs)
+                    status = response.status_code
+                    return response
+                finally:
+                    _record_response(endpoint, started, status)
+
+            return async_view
+
+        @wraps(view)
+        def sync_view(request, *args, **kwargs):
+            started, status = time.perf_counter(), 500
+            try:
+                response = view(request, *args, **kwargs)
+                status = response.status_code
+                return response
+            finally:
+                _record_response(endpoint, started, status)
+
+        return sync_view
+
+    return decorator
+
+
+def metrics_text() -> str:
+    return REGISTRY.render()
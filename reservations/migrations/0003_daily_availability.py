@@ -0,0 +1,71 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_daily_availability(apps, schema_editor):
+    """
+    Build the availability index from the existing reservations.
+    """
+    Reservation = apps.get_model("reservations", "Reservation")
+    DailyAvailability = apps.get_model("reservations", "DailyAvailability")
+
+    slot_values = [9, 10, 11, 12, 13, 14, 15, 16, 17]
+    slot_bits = {value: 1 << index for index, value in enumerate(slot_values)}
+
+    masks = {}
+    for room_type_id, day, slot in Reservation.objects.order_by().values_list("room_type_id", "date", "slot").iterator():
+        key = (room_type_id, day)
+        masks[key] = masks.get(key, 0) | slot_bits.get(int(slot), 0)
+
+    DailyAvailability.objects.bulk_create(
+        [
+            DailyAvailability(room_type_id=room_type_id, date=day, reserved_mask=mask)
+            for (room_type_id, day), mask in masks.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reservations", "0002_roomtype_capacity_and_equipment"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="reservation",
+            options={"ordering": ["-date", "slot", "-created_at"]},
+        ),
+        migrations.CreateModel(
+            name="DailyAvailability",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("reserved_mask", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "room_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_availability",
+                        to="reservations.roomtype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "daily availability",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailyavailability",
+            constraint=models.UniqueConstraint(
+                fields=("room_type", "date"), name="unique_daily_availability_roomtype_date"
+            ),
+        ),
+        migrations.RunPython(backfill_daily_availability, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.db import DatabaseError, migrations, transaction
+
+
+# The reservation admin searches with icontains on the user's email/username (so a
+# domain like "@example.com" still matches), which PostgreSQL runs as
+# UPPER(col::text) LIKE UPPER('%term%'). Trigram GIN indexes on that expression make
+# it an index scan. Without pg_trgm (or on other databases) the search keeps the plain scan.
+INDEXES = (
+    ("idx_user_email_upper_trgm", "email"),
+    ("idx_user_username_upper_trgm", "username"),
+)
+
+
+def _has_pg_trgm(schema_editor) -> bool:
+    connection = schema_editor.connection
+    try:
+        with transaction.atomic(using=connection.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except DatabaseError:
+        # Not installable by this role; a DBA can add it and re-run the migration.
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            return cursor.fetchone() is not None
+    return True
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql" or not _has_pg_trgm(schema_editor):
+        return
+    table = schema_editor.quote_name(apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table)
+    for name, column in INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {schema_editor.quote_name(name)} "
+            f"ON {table} USING gin (UPPER({schema_editor.quote_name(column)}::text) gin_trgm_ops)"
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _ in INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(name)}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reservations", "0005_email_outbox"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
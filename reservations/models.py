@@ -36,6 +36,94 @@ class TimeSlot(models.IntegerChoices):
     H17 = 17, "17:00–18:00"
 
 
+class ReservationSeries(models.Model):
+    """
+    A recurring booking ("every Tuesday 10:00 until the end of the semester").
+
+    The occurrences are regular Reservation rows pointing back here; see
+    recurrence.occurrence_dates for how the rule expands into dates.
+    """
+
+    class Frequency(models.TextChoices):
+        DAILY = "daily", "Daily"
+        WEEKLY = "weekly", "Weekly"
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="reservation_series",
+    )
+    room_type = models.ForeignKey(RoomType, on_delete=models.PROTECT, related_name="reservation_series")
+    slot = models.PositiveSmallIntegerField(choices=TimeSlot.choices)
+    frequency = models.CharField(max_length=10, choices=Frequency.choices, default=Frequency.WEEKLY)
+    interval = models.PositiveSmallIntegerField(default=1, help_text="Repeat every N days/weeks.")
+    start_date = models.DateField()
+    end_date = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-start_date", "slot"]
+        verbose_name_plural = "reservation series"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.room_type} · {self.get_frequency_display()} · {self.start_date}–{self.end_date} · {self.user}"
+
+
+def upcoming_q(now: datetime | None = None) -> models.Q:
+    """
+    Reservations whose slot has not ended yet (same rule as Reservation.is_future()),
+    expressed on (date, slot) so it stays on the date indexes.
+    """
+    now = timezone.localtime(now)
+    return models.Q(date__gt=now.date()) | models.Q(date=now.date(), slot__gte=now.hour)
+
+
+def past_q(now: datetime | None = None) -> models.Q:
+    now = timezone.localtime(now)
+    return models.Q(date__lt=now.date()) | models.Q(date=now.date(), slot__lt=now.hour)
+
+
+class ReservationQuerySet(models.QuerySet):
+    def upcoming(self, now: datetime | None = None):
+        return self.filter(upcoming_q(now))
+
+    def past(self, now: datetime | None = None):
+        return self.filter(past_q(now))
+
+    def before(self, date_value, slot_value: int, reservation_id: int):
+        """
+        Keyset filter: rows strictly after (date, slot, id) in "-date, -slot, -id" order.
+        """
+        return self.filter(
+            models.Q(date__lt=date_value)
+            | models.Q(date=date_value, slot__lt=slot_value)
+            | models.Q(date=date_value, slot=slot_value, id__lt=reservation_id)
+        )
+
+    def with_status(self, now: datetime | None = None):
+        """
+        Annotate `is_ongoing` (same rule as upcoming_q()) so is_future(), is_past()
+        and status read it instead of building timezone-aware datetimes per row.
+        """
+        return self.annotate(
+            is_ongoing=models.Case(
+                models.When(upcoming_q(now), then=models.Value(True)),
+                default=models.Value(False),
+                output_field=models.BooleanField(),
+            )
+        )
+
+    def status_counts(self, now: datetime | None = None) -> dict[str, int]:
+        """
+        {"upcoming": n, "past": n} from a single aggregate query.
+        """
+        return self.aggregate(
+            upcoming=models.Count("id", filter=upcoming_q(now)),
+            past=models.Count("id", filter=past_q(now)),
+        )
+
+
 class Reservation(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -45,9 +133,18 @@ class Reservation(models.Model):
     room_type = models.ForeignKey(RoomType, on_delete=models.PROTECT, related_name="reservations")
     date = models.DateField()
     slot = models.PositiveSmallIntegerField(choices=TimeSlot.choices)
+    series = models.ForeignKey(
+        ReservationSeries,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="reservations",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ReservationQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -81,7 +178,11 @@ class Reservation(models.Model):
     def is_future(self) -> bool:
         """
         True if the reservation has not ended yet.
+        Uses the `is_ongoing` annotation of ReservationQuerySet.with_status() when present.
         """
+        annotated = self.__dict__.get("is_ongoing")
+        if annotated is not None:
+            return bool(annotated)
         return self.end_datetime() >= timezone.now()
 
     def is_past(self) -> bool:
@@ -102,17 +203,111 @@ class Reservation(models.Model):
         Prevent double booking at the model validation layer so admin and any
         other save path get the same protection before the DB constraint fires.
         """
+        from .conflicts import CONFLICT_MESSAGE, reservation_has_conflict  # conflicts imports this module
+
         super().clean()
-        if self.room_type and self.date and self.slot is not None:
-            conflict = (
-                Reservation.objects.filter(room_type=self.room_type, date=self.date, slot=self.slot)
-                .exclude(pk=self.pk)
-                .exists()
+        if self.room_type_id and self.date and self.slot is not None:
+            if reservation_has_conflict(self):
+                raise ValidationError({"slot": CONFLICT_MESSAGE})
+
+    def save(self, *args, **kwargs):
+        from .conflicts import forget_conflict_check
+
+        try:
+            super().save(*args, **kwargs)
+        finally:
+            # The conflict check memo covers one clean→save pass; later validation queries again.
+            forget_conflict_check(self)
+
+    def validate_constraints(self, exclude=None):
+        """
+        Skip the (room_type, date, slot) unique constraint when clean() already
+        checked these exact values; the database still enforces it on save.
+        """
+        from .conflicts import conflict_already_checked
+
+        if conflict_already_checked(self):
+            exclude = set(exclude or ()) | {"slot"}
+        super().validate_constraints(exclude=exclude)
+
+
+class DailyAvailability(models.Model):
+    """
+    Denormalized availability index: one row per (room_type, date) with a bitmask
+    of reserved slots (bit i = i-th TimeSlot value, see availability.slot_bit).
+
+    Written in the same transaction as the Reservation rows by services.py;
+    `manage.py reconcile_daily_availability` rebuilds it from Reservation.
+    """
+
+    room_type = models.ForeignKey(RoomType, on_delete=models.CASCADE, related_name="daily_availability")
+    date = models.DateField()
+    reserved_mask = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["room_type", "date"],
+                name="unique_daily_availability_roomtype_date",
             )
-            if conflict:
-                raise ValidationError(
-                    {"slot": "This room type is already reserved for that date and time slot."}
-                )
+        ]
+        verbose_name_plural = "daily availability"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.room_type_id} · {self.date} · {self.reserved_mask:#011b}"
+
 
+class EmailOutbox(models.Model):
+    """
+    Booking emails waiting to be sent (RESERVATION_EMAIL_DELIVERY=outbox).
 
+    Rows are written in the booking transaction, so an email exists if and only if
+    the booking committed; `manage.py process_email_outbox` delivers them.
+    """
 
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENT = "sent", "Sent"
+        DEAD = "dead", "Dead"
+
+    to_email = models.CharField(max_length=254)
+    payload = models.JSONField()
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="idx_outbox_status_next"),
+        ]
+        ordering = ["id"]
+        verbose_name_plural = "email outbox"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.to_email} · {self.payload.get('event', '?')} · {self.status}"
+
+
+class CalendarFeedKey(models.Model):
+    """
+    Current version of a calendar feed's signed URL (see calendar_feeds).
+
+    Feeds without a row are at version 1; rotating a feed bumps the version, so
+    every URL signed for an earlier one stops working.
+    """
+
+    kind = models.CharField(max_length=10)
+    object_id = models.PositiveBigIntegerField()
+    version = models.PositiveIntegerField(default=1)
+    rotated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="unique_calendar_feed_key"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.kind}-{self.object_id} · v{self.version}"
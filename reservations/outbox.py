@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .emails import (
+    EMAIL_DELIVERY_OUTBOX,
+    EmailPayload,
+    build_digest_message,
+    build_email_message,
+    deliver_message,
+    payload_from_dict,
+    payload_to_dict,
+)
+from .models import EmailOutbox
+
+
+logger = logging.getLogger(__name__)
+
+
+# A claimed row is invisible to other workers for this long; if the worker dies
+# mid-batch the row simply becomes due again.
+CLAIM_LEASE = timedelta(minutes=5)
+MAX_BACKOFF_SECONDS = 6 * 60 * 60
+
+
+def enqueue_email(payload: EmailPayload) -> EmailOutbox | None:
+    """
+    Queue a booking email. Call inside the booking transaction so the row commits
+    (or rolls back) together with the booking.
+    """
+    if not payload.to_email:
+        return None
+    return EmailOutbox.objects.create(to_email=payload.to_email, payload=payload_to_dict(payload))
+
+
+def _backoff(attempts: int) -> timedelta:
+    base = int(getattr(settings, "RESERVATION_EMAIL_OUTBOX_BACKOFF_SECONDS", 30))
+    return timedelta(seconds=min(base * 2 ** max(attempts - 1, 0), MAX_BACKOFF_SECONDS))
+
+
+def _claim_batch(batch_size: int) -> list[EmailOutbox]:
+    """
+    Lease up to batch_size due rows. SKIP LOCKED lets several workers drain the
+    outbox side by side on PostgreSQL (SQLite serializes the transaction instead).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status=EmailOutbox.Status.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        if rows:
+            EmailOutbox.objects.filter(id__in=[row.id for row in rows]).update(next_attempt_at=now + CLAIM_LEASE)
+    return rows
+
+
+def process_outbox_batch(
+    *,
+    batch_size: int | None = None,
+    max_attempts: int | None = None,
+    digest: bool | None = None,
+) -> dict[str, int]:
+    """
+    Send one batch of due outbox rows over a single mail connection.
+
+    Failed sends are retried with exponential backoff
+    (RESERVATION_EMAIL_OUTBOX_BACKOFF_SECONDS, doubled per attempt); after
+    max_attempts a row is dead-lettered (status=dead) and kept for inspection.
+
+    With digest (default RESERVATION_EMAIL_DIGEST), the rows of a batch that go to
+    the same recipient are combined into one message.
+    Returns counts: claimed, sent, retried, dead, messages.
+    """
+    batch_size = batch_size or int(getattr(settings, "RESERVATION_EMAIL_OUTBOX_BATCH_SIZE", 50))
+    max_attempts = max_attempts or int(getattr(settings, "RESERVATION_EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+    digest = bool(getattr(settings, "RESERVATION_EMAIL_DIGEST", False)) if digest is None else digest
+    counts = {"claimed": 0, "sent": 0, "retried": 0, "dead": 0, "messages": 0}
+
+    rows = _claim_batch(batch_size)
+    counts["claimed"] = len(rows)
+    if not rows:
+        return counts
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as exc:
+        # Mail server unreachable: every row of the batch counts as a failed attempt.
+        logger.warning("Email outbox: cannot open mail connection: %s", exc)
+        for row in rows:
+            counts[_record_failure(row, exc, max_attempts)] += 1
+        return counts
+
+    try:
+        for group in _message_groups(rows, digest=digest, counts=counts, max_attempts=max_attempts):
+            try:
+                payloads = [payload for _, payload in group]
+                message = build_digest_message(payloads) if len(payloads) > 1 else build_email_message(payloads[0])
+                if message is None:
+                    raise ValueError("Nothing to send for this payload.")
+                message.connection = connection
+                deliver_message(message, channel=EMAIL_DELIVERY_OUTBOX)
+            except Exception as exc:
+                for row, _ in group:
+                    counts[_record_failure(row, exc, max_attempts)] += 1
+                continue
+
+            EmailOutbox.objects.filter(id__in=[row.id for row, _ in group]).update(
+                status=EmailOutbox.Status.SENT,
+                attempts=F("attempts") + 1,
+                sent_at=timezone.now(),
+                last_error="",
+            )
+            counts["sent"] += len(group)
+            counts["messages"] += 1
+    finally:
+        try:
+            connection.close()
+        except Exception:  # pragma: no cover - closing a broken SMTP session
+            pass
+
+    return counts
+
+
+def _message_groups(
+    rows: list[EmailOutbox],
+    *,
+    digest: bool,
+    counts: dict[str, int],
+    max_attempts: int,
+) -> list[list[tuple[EmailOutbox, EmailPayload]]]:
+    """
+    Decode the rows and group them into messages: one per row, or one per recipient
+    when digesting. Rows whose payload cannot be decoded are dead-lettered here.
+    """
+    groups: dict[object, list[tuple[EmailOutbox, EmailPayload]]] = {}
+    for row in rows:
+        try:
+            payload = payload_from_dict(row.payload)
+        except (KeyError, TypeError, ValueError) as exc:
+            counts[_record_failure(row, ValueError(f"Malformed payload: {exc}"), max_attempts)] += 1
+            continue
+        key = payload.to_email.lower() if digest else row.id
+        groups.setdefault(key, []).append((row, payload))
+    return list(groups.values())
+
+
+def _record_failure(row: EmailOutbox, exc: Exception, max_attempts: int) -> str:
+    attempts = row.attempts + 1
+    error = f"{type(exc).__name__}: {exc}"[:2000]
+    if attempts >= max_attempts or isinstance(exc, (KeyError, ValueError)):
+        # Out of retries, or a payload that can never render: dead-letter it.
+        EmailOutbox.objects.filter(id=row.id).update(
+            status=EmailOutbox.Status.DEAD,
+            attempts=attempts,
+            last_error=error,
+        )
+        logger.error("Email outbox: giving up on #%s to %s after %d attempt(s): %s", row.id, row.to_email, attempts, error)
+        return "dead"
+
+    EmailOutbox.objects.filter(id=row.id).update(
+        attempts=attempts,
+        next_attempt_at=timezone.now() + _backoff(attempts),
+        last_error=error,
+    )
+    return "retried"
+
+
+def requeue_dead_emails(queryset=None) -> int:
+    """
+    Put dead-lettered rows back in the queue (e.g. after fixing the SMTP settings).
+    """
+    queryset = queryset if queryset is not None else EmailOutbox.objects.all()
+    return queryset.filter(status=EmailOutbox.Status.DEAD).update(
+        status=EmailOutbox.Status.PENDING,
+        attempts=0,
+        next_attempt_at=timezone.now(),
+    )
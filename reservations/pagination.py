@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def estimated_table_rows(model, *, using: str = "default") -> int | None:
+    """
+    Planner row estimate of a model's table (PostgreSQL pg_class.reltuples).
+    None on other databases, or when the table has never been analyzed.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table])
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for large admin changelists: an unfiltered queryset is counted from
+    the planner estimate instead of a full COUNT(*) once the table is bigger than
+    RESERVATION_ADMIN_EXACT_COUNT_LIMIT rows. Filtered querysets (and small
+    tables) still get an exact count.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        query = getattr(queryset, "query", None)
+        if query is not None and not query.where and not query.distinct:
+            estimate = estimated_table_rows(queryset.model, using=queryset.db)
+            limit = int(getattr(settings, "RESERVATION_ADMIN_EXACT_COUNT_LIMIT", 100_000))
+            if estimate is not None and estimate > limit:
+                return estimate
+        return super().count
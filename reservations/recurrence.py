@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from datetime import date as date_type
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+from .models import ReservationSeries
+
+
+def max_occurrences() -> int:
+    return int(getattr(settings, "RESERVATION_SERIES_MAX_OCCURRENCES", 120))
+
+
+def occurrence_dates(*, start_date: date_type, end_date: date_type, frequency: str, interval: int = 1) -> list[date_type]:
+    """
+    Dates of a recurrence rule, start_date..end_date inclusive.
+
+    Weekly series repeat on start_date's weekday. Raises ValidationError for an
+    invalid rule or one that expands to more than RESERVATION_SERIES_MAX_OCCURRENCES dates.
+    """
+    if frequency not in ReservationSeries.Frequency.values:
+        raise ValidationError({"frequency": "Invalid frequency."})
+    if interval < 1:
+        raise ValidationError({"interval": "Interval must be at least 1."})
+    if end_date < start_date:
+        raise ValidationError({"end_date": "end_date must be on or after start_date."})
+
+    days = interval * (7 if frequency == ReservationSeries.Frequency.WEEKLY else 1)
+    count = (end_date - start_date).days // days + 1
+    limit = max_occurrences()
+    if count > limit:
+        raise ValidationError({"end_date": f"Too many occurrences ({count}, max {limit})."})
+
+    step = timedelta(days=days)
+    return [start_date + step * index for index in range(count)]
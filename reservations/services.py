@@ -1,15 +1,40 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date as date_type
 from datetime import datetime, time, timedelta
 
+from django.conf import settings
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.db import IntegrityError, transaction
 from django.utils import timezone
 
-from .models import Reservation, RoomType, TimeSlot
-from .emails import ReservationEmailPayload, send_reservation_email
+from .availability import mark_slot_released, mark_slot_reserved, mark_slots_reserved
+from .availability_cache import invalidate_availability_on_commit
+from .conflicts import find_conflicts
+from .models import Reservation, ReservationSeries, RoomType, TimeSlot
+from .recurrence import occurrence_dates
+from .email_dispatch import get_email_dispatcher
+from .emails import (
+    EMAIL_DELIVERY_OUTBOX,
+    EMAIL_DELIVERY_THREAD,
+    EmailPayload,
+    ReservationBatchEmailPayload,
+    ReservationEmailPayload,
+    get_email_delivery,
+    send_email_payload,
+)
+from .events import BookingEvent, publish_on_commit
+from .locks import acquire_booking_locks, booking_transaction, lock_reservation
+from .metrics import BOOKING_CHANGES, BOOKINGS, INTEGRITY_RACES, inc_on_commit
+from .outbox import enqueue_email
+
+
+BOOKING_STRATEGY_PESSIMISTIC = "pessimistic"
+BOOKING_STRATEGY_OPTIMISTIC = "optimistic"
+
+BATCH_MODE_ATOMIC = "atomic"
+BATCH_MODE_BEST_EFFORT = "best_effort"
 
 
 class ReservationError(Exception):
@@ -24,6 +49,22 @@ class PastReservationError(ReservationError):
     """Raised when attempting to create/update/cancel a past reservation."""
 
 
+class SeriesConflictError(SlotUnavailableError):
+    """Raised when occurrences of a recurring booking are taken and conflicts may not be skipped."""
+
+    def __init__(self, conflicts: list[date_type]):
+        super().__init__("Some occurrences of that series are already reserved.")
+        self.conflicts = conflicts
+
+
+class BatchReservationError(ReservationError):
+    """Raised when an all-or-nothing batch cannot book every item (nothing was created)."""
+
+    def __init__(self, results: list["BatchItemResult"]):
+        super().__init__("No reservations were created.")
+        self.results = results
+
+
 @dataclass(frozen=True)
 class ReservationInput:
     room_type_id: int
@@ -31,6 +72,49 @@ class ReservationInput:
     slot: int
 
 
+@dataclass(frozen=True)
+class SeriesInput:
+    room_type_id: int
+    slot: int
+    start_date: date_type
+    end_date: date_type
+    frequency: str = ReservationSeries.Frequency.WEEKLY
+    interval: int = 1
+
+
+@dataclass
+class SeriesResult:
+    series: ReservationSeries
+    reservations: list[Reservation]
+    conflicts: list[date_type]  # occurrences already reserved by someone else (not booked)
+    skipped_past: list[date_type]  # occurrences that already ended (not booked)
+
+
+BATCH_ERROR_INVALID = "invalid"
+BATCH_ERROR_PAST = "past"
+BATCH_ERROR_NOT_FOUND = "not_found"
+BATCH_ERROR_DUPLICATE = "duplicate"
+BATCH_ERROR_UNAVAILABLE = "unavailable"
+
+
+@dataclass
+class BatchItemResult:
+    index: int
+    data: ReservationInput
+    reservation: Reservation | None = None
+    error_code: str | None = None  # invalid|past|not_found|duplicate|unavailable
+    error: str | None = None
+    room_type: RoomType | None = field(default=None, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.error_code is None
+
+    def fail(self, code: str, message: str) -> None:
+        self.error_code = code
+        self.error = message
+
+
 def _aware_slot_start(date_value: date_type, slot_value: int) -> datetime:
     naive = datetime.combine(date_value, time(hour=int(slot_value)))
     return timezone.make_aware(naive, timezone.get_current_timezone())
@@ -54,23 +138,40 @@ def _validate_not_past(date_value: date_type, slot_value: int) -> None:
         raise PastReservationError("You cannot reserve a past time slot.")
 
 
+def get_booking_strategy() -> str:
+    """
+    Strategy used by create_reservation (settings.RESERVATION_BOOKING_STRATEGY):
+    - "pessimistic" (default): lock, check, then insert.
+    - "optimistic": insert first and let the unique constraint reject conflicts.
+    """
+    strategy = getattr(settings, "RESERVATION_BOOKING_STRATEGY", BOOKING_STRATEGY_PESSIMISTIC)
+    if strategy not in {BOOKING_STRATEGY_PESSIMISTIC, BOOKING_STRATEGY_OPTIMISTIC}:
+        return BOOKING_STRATEGY_PESSIMISTIC
+    return strategy
+
+
 def create_reservation(*, user, data: ReservationInput) -> Reservation:
     """
     Create a reservation safely:
-    - Locks the target RoomType row (row-level locking).
+    - Locks the target (room_type, date) pair (see locks.acquire_booking_locks).
     - Re-checks availability in-transaction.
     - Relies on a unique constraint as the final guard.
+
+    With the optimistic strategy the lock and the re-check are skipped
+    (see _create_reservation_optimistic).
     """
     _validate_slot(data.slot)
     _validate_not_past(data.date, data.slot)
 
+    if get_booking_strategy() == BOOKING_STRATEGY_OPTIMISTIC:
+        return _create_reservation_optimistic(user=user, data=data)
+
     try:
-        with transaction.atomic():
-            room_type = (
-                RoomType.objects.select_for_update()
-                .only("id", "is_active")
-                .get(id=data.room_type_id, is_active=True)
+        with booking_transaction():
+            room_type = RoomType.objects.only("id", "name", "is_active").get(
+                id=data.room_type_id, is_active=True
             )
+            acquire_booking_locks([(room_type.id, data.date)])
 
             if Reservation.objects.filter(
                 room_type=room_type,
@@ -85,6 +186,10 @@ def create_reservation(*, user, data: ReservationInput) -> Reservation:
                 date=data.date,
                 slot=data.slot,
             )
+            mark_slot_reserved(room_type.id, reservation.date, reservation.slot)
+            invalidate_availability_on_commit(reservation.date)
+            publish_on_commit(BookingEvent("reserved", room_type.id, reservation.date, reservation.slot))
+            inc_on_commit(BOOKINGS, kind="single")
             _schedule_reservation_email(
                 ReservationEmailPayload(
                     to_email=getattr(user, "email", "") or "",
@@ -96,9 +201,221 @@ def create_reservation(*, user, data: ReservationInput) -> Reservation:
             )
             return reservation
     except IntegrityError as exc:
+        INTEGRITY_RACES.inc(operation="create")
         raise SlotUnavailableError("That time slot was just reserved. Please pick another.") from exc
 
 
+def _create_reservation_optimistic(*, user, data: ReservationInput) -> Reservation:
+    """
+    Insert-first booking path:
+    - Reads the RoomType without locking it (inactive room types are still rejected).
+    - Runs a single INSERT in its own transaction (a savepoint when nested).
+    - Turns a unique constraint violation into SlotUnavailableError.
+    """
+    room_type = RoomType.objects.only("id", "name", "is_active").get(id=data.room_type_id, is_active=True)
+
+    try:
+        with transaction.atomic():
+            reservation = Reservation.objects.create(
+                user=user,
+                room_type=room_type,
+                date=data.date,
+                slot=data.slot,
+            )
+            mark_slot_reserved(room_type.id, reservation.date, reservation.slot)
+            invalidate_availability_on_commit(reservation.date)
+            publish_on_commit(BookingEvent("reserved", room_type.id, reservation.date, reservation.slot))
+            inc_on_commit(BOOKINGS, kind="single")
+            _schedule_reservation_email(
+                ReservationEmailPayload(
+                    to_email=getattr(user, "email", "") or "",
+                    event="created",
+                    room_name=room_type.name,
+                    date=reservation.date,
+                    slot_value=reservation.slot,
+                )
+            )
+    except IntegrityError as exc:
+        INTEGRITY_RACES.inc(operation="create")
+        raise SlotUnavailableError("That time slot is already reserved.") from exc
+    return reservation
+
+
+def create_reservations_batch(
+    *,
+    user,
+    items: list[ReservationInput],
+    mode: str = BATCH_MODE_ATOMIC,
+) -> list[BatchItemResult]:
+    """
+    Book many (room_type, date, slot) items in one transaction:
+    - Validates every item up front (slot, past, room type, duplicates in the batch).
+    - Locks all (room_type, date) pairs at once, in deterministic order.
+    - Checks conflicts with one query and inserts with one bulk_create.
+    - Sends a single confirmation email for the whole batch.
+
+    mode="atomic" books everything or nothing (BatchReservationError carries the
+    per-item results); mode="best_effort" books what it can and reports the rest.
+    """
+    results = [BatchItemResult(index=index, data=data) for index, data in enumerate(items)]
+    _validate_batch_items(results)
+    if mode == BATCH_MODE_ATOMIC and not all(result.ok for result in results):
+        raise BatchReservationError(results)
+
+    try:
+        with booking_transaction():
+            pending = [result for result in results if result.ok]
+            acquire_booking_locks((result.data.room_type_id, result.data.date) for result in pending)
+
+            taken = _reserved_triples([result.data for result in pending])
+            for result in pending:
+                if (result.data.room_type_id, result.data.date, result.data.slot) in taken:
+                    result.fail(BATCH_ERROR_UNAVAILABLE, "That time slot is already reserved.")
+            if mode == BATCH_MODE_ATOMIC and not all(result.ok for result in results):
+                raise BatchReservationError(results)
+
+            pending = [result for result in pending if result.ok]
+            if not pending:
+                return results
+
+            reservations = Reservation.objects.bulk_create(
+                [
+                    Reservation(user=user, room_type=result.room_type, date=result.data.date, slot=result.data.slot)
+                    for result in pending
+                ]
+            )
+            for result, reservation in zip(pending, reservations):
+                result.reservation = reservation
+
+            booked = [(result.room_type.id, result.data.date, result.data.slot) for result in pending]
+            mark_slots_reserved(booked)
+            invalidate_availability_on_commit(*{date_value for _, date_value, _ in booked})
+            publish_on_commit(*(BookingEvent("reserved", *triple) for triple in booked))
+            inc_on_commit(BOOKINGS, len(booked), kind="batch")
+            schedule_booked_email(
+                user, [(result.room_type.name, result.data.date, result.data.slot) for result in pending]
+            )
+            return results
+    except IntegrityError as exc:
+        INTEGRITY_RACES.inc(operation="batch")
+        raise SlotUnavailableError("One of those time slots was just reserved. Please try again.") from exc
+
+
+def _validate_batch_items(results: list[BatchItemResult]) -> None:
+    """
+    Per-item checks that need no locks; room types are loaded with a single query.
+    """
+    room_types = RoomType.objects.only("id", "name", "is_active").filter(
+        id__in={result.data.room_type_id for result in results}, is_active=True
+    ).in_bulk()
+
+    seen: set[tuple[int, date_type, int]] = set()
+    for result in results:
+        data = result.data
+        try:
+            _validate_slot(data.slot)
+            _validate_not_past(data.date, data.slot)
+        except ValidationError:
+            result.fail(BATCH_ERROR_INVALID, "Invalid time slot.")
+            continue
+        except PastReservationError as exc:
+            result.fail(BATCH_ERROR_PAST, str(exc))
+            continue
+
+        result.room_type = room_types.get(data.room_type_id)
+        if result.room_type is None:
+            result.fail(BATCH_ERROR_NOT_FOUND, "Room type not found.")
+            continue
+
+        key = (data.room_type_id, data.date, data.slot)
+        if key in seen:
+            result.fail(BATCH_ERROR_DUPLICATE, "This time slot appears more than once in the batch.")
+            continue
+        seen.add(key)
+
+
+def _reserved_triples(items: list[ReservationInput]) -> set[tuple[int, date_type, int]]:
+    """
+    (room_type_id, date, slot) of existing reservations among items, in one query.
+    """
+    return set(find_conflicts((item.room_type_id, item.date, item.slot) for item in items))
+
+
+def create_reservation_series(*, user, data: SeriesInput, skip_conflicts: bool = True) -> SeriesResult:
+    """
+    Book a recurring reservation:
+    - Expands the rule into occurrence dates (recurrence.occurrence_dates).
+    - Locks every (room_type, date) pair, then finds all conflicts with one
+      room_type + date__in + slot query.
+    - Bulk-inserts the free occurrences and sends one confirmation email.
+
+    Taken occurrences are reported in SeriesResult.conflicts; with
+    skip_conflicts=False any conflict raises SeriesConflictError instead.
+    """
+    _validate_slot(data.slot)
+    dates = occurrence_dates(
+        start_date=data.start_date,
+        end_date=data.end_date,
+        frequency=data.frequency,
+        interval=data.interval,
+    )
+
+    now = timezone.now()
+    skipped_past = [day for day in dates if _aware_slot_end(day, data.slot) <= now]
+    dates = [day for day in dates if _aware_slot_end(day, data.slot) > now]
+    if not dates:
+        raise PastReservationError("You cannot reserve a past time slot.")
+
+    try:
+        with booking_transaction():
+            room_type = RoomType.objects.only("id", "name", "is_active").get(
+                id=data.room_type_id, is_active=True
+            )
+            acquire_booking_locks((room_type.id, day) for day in dates)
+
+            conflicts = sorted(
+                Reservation.objects.filter(room_type=room_type, date__in=dates, slot=data.slot).values_list(
+                    "date", flat=True
+                )
+            )
+            taken = set(conflicts)
+            free_dates = [day for day in dates if day not in taken]
+            if not free_dates or (conflicts and not skip_conflicts):
+                raise SeriesConflictError(conflicts)
+
+            series = ReservationSeries.objects.create(
+                user=user,
+                room_type=room_type,
+                slot=data.slot,
+                frequency=data.frequency,
+                interval=data.interval,
+                start_date=data.start_date,
+                end_date=data.end_date,
+            )
+            reservations = Reservation.objects.bulk_create(
+                [
+                    Reservation(user=user, room_type=room_type, date=day, slot=data.slot, series=series)
+                    for day in free_dates
+                ]
+            )
+
+            booked = [(room_type.id, day, data.slot) for day in free_dates]
+            mark_slots_reserved(booked)
+            invalidate_availability_on_commit(*free_dates)
+            publish_on_commit(*(BookingEvent("reserved", *triple) for triple in booked))
+            inc_on_commit(BOOKINGS, len(booked), kind="series")
+            schedule_booked_email(user, [(room_type.name, day, data.slot) for day in free_dates])
+            return SeriesResult(
+                series=series,
+                reservations=reservations,
+                conflicts=conflicts,
+                skipped_past=skipped_past,
+            )
+    except IntegrityError as exc:
+        INTEGRITY_RACES.inc(operation="series")
+        raise SlotUnavailableError("One of those time slots was just reserved. Please try again.") from exc
+
+
 def update_reservation(
     *,
     user,
@@ -107,20 +424,16 @@ def update_reservation(
 ) -> Reservation:
     """
     Update an existing reservation safely (future-only, owner-only).
-    Locks:
+    Locks (in the order documented in locks.py):
     - Reservation row (to serialize edits)
-    - RoomType row(s) involved (row-level locking)
+    - Old and new (room_type, date) pairs, in one call, lowest room type id first
     """
     _validate_slot(new_data.slot)
     _validate_not_past(new_data.date, new_data.slot)
 
     try:
-        with transaction.atomic():
-            reservation = (
-                Reservation.objects.select_for_update()
-                .select_related("room_type")
-                .get(id=reservation_id)
-            )
+        with booking_transaction():
+            reservation = lock_reservation(reservation_id, Reservation.objects.select_related("room_type"))
 
             if reservation.user_id != user.id:
                 raise PermissionDenied("You do not have permission to edit this reservation.")
@@ -128,11 +441,15 @@ def update_reservation(
             if not reservation.is_future():
                 raise PastReservationError("Past reservations cannot be edited.")
 
-            new_room_type = RoomType.objects.select_for_update().only("id", "is_active").get(
+            new_room_type = RoomType.objects.only("id", "name", "is_active").get(
                 id=new_data.room_type_id, is_active=True
             )
-            if reservation.room_type_id != new_room_type.id:
-                RoomType.objects.select_for_update().filter(id=reservation.room_type_id).only("id")
+            acquire_booking_locks(
+                [
+                    (reservation.room_type_id, reservation.date),
+                    (new_room_type.id, new_data.date),
+                ]
+            )
 
             if Reservation.objects.exclude(id=reservation.id).filter(
                 room_type=new_room_type,
@@ -141,10 +458,19 @@ def update_reservation(
             ).exists():
                 raise SlotUnavailableError("That time slot is already reserved.")
 
+            old_room_type_id, old_date, old_slot = reservation.room_type_id, reservation.date, reservation.slot
             reservation.room_type = new_room_type
             reservation.date = new_data.date
             reservation.slot = new_data.slot
             reservation.save(update_fields=["room_type", "date", "slot", "updated_at"])
+            mark_slot_released(old_room_type_id, old_date, old_slot)
+            mark_slot_reserved(new_room_type.id, reservation.date, reservation.slot)
+            invalidate_availability_on_commit(old_date, reservation.date)
+            publish_on_commit(
+                BookingEvent("released", old_room_type_id, old_date, old_slot),
+                BookingEvent("reserved", new_room_type.id, reservation.date, reservation.slot),
+            )
+            inc_on_commit(BOOKING_CHANGES, operation="updated")
 
             _schedule_reservation_email(
                 ReservationEmailPayload(
@@ -157,18 +483,17 @@ def update_reservation(
             )
             return reservation
     except IntegrityError as exc:
+        INTEGRITY_RACES.inc(operation="update")
         raise SlotUnavailableError("That time slot was just reserved. Please pick another.") from exc
 
 
 def cancel_reservation(*, user, reservation_id: int) -> None:
     """
     Cancel (delete) an existing reservation (future-only, owner-only).
+    Locks (in the order documented in locks.py) the reservation row, then its (room_type, date) pair.
     """
-    with transaction.atomic():
-        reservation = (
-            Reservation.objects.select_for_update()
-            .get(id=reservation_id)
-        )
+    with booking_transaction():
+        reservation = lock_reservation(reservation_id, Reservation.objects.select_related("room_type"))
 
         if reservation.user_id != user.id:
             raise PermissionDenied("You do not have permission to cancel this reservation.")
@@ -176,6 +501,8 @@ def cancel_reservation(*, user, reservation_id: int) -> None:
         if not reservation.is_future():
             raise PastReservationError("Past reservations cannot be cancelled.")
 
+        acquire_booking_locks([(reservation.room_type_id, reservation.date)])
+
         payload = ReservationEmailPayload(
             to_email=getattr(user, "email", "") or "",
             event="cancelled",
@@ -184,20 +511,55 @@ def cancel_reservation(*, user, reservation_id: int) -> None:
             slot_value=reservation.slot,
         )
         reservation.delete()
+        mark_slot_released(reservation.room_type_id, reservation.date, reservation.slot)
+        invalidate_availability_on_commit(reservation.date)
+        publish_on_commit(BookingEvent("released", reservation.room_type_id, reservation.date, reservation.slot))
+        inc_on_commit(BOOKING_CHANGES, operation="cancelled")
         _schedule_reservation_email(payload)
 
 
-def _schedule_reservation_email(payload: ReservationEmailPayload) -> None:
+def _schedule_reservation_email(payload: EmailPayload) -> None:
     """
-    Schedule sending an email after the transaction commits.
-    Never raises.
+    Deliver a booking email once the transaction commits (see emails.get_email_delivery):
+    - immediate: sent from an on_commit callback; never raises (logs on failure).
+    - outbox: an EmailOutbox row written in this transaction, sent by process_email_outbox.
+    - thread: queued on the in-process dispatcher after commit (returns without waiting for SMTP).
     """
     if not payload.to_email:
         return
 
+    delivery = get_email_delivery()
+    if delivery == EMAIL_DELIVERY_OUTBOX:
+        enqueue_email(payload)
+        return
+    if delivery == EMAIL_DELIVERY_THREAD:
+        transaction.on_commit(lambda: get_email_dispatcher().submit(payload))
+        return
+
     def _send():
-        send_reservation_email(payload)
+        send_email_payload(payload)
 
     transaction.on_commit(_send)
 
 
+def schedule_booked_email(user, booked: list[tuple[str, date_type, int]]) -> None:
+    """
+    One confirmation email for several new reservations, given as (room_name, date, slot)
+    (the regular one when a single reservation was booked), delivered on commit like every
+    booking email. Public for code that books outside these services (e.g. imports).
+    """
+    to_email = getattr(user, "email", "") or ""
+    items = tuple(
+        ReservationEmailPayload(
+            to_email=to_email,
+            event="created",
+            room_name=room_name,
+            date=date_value,
+            slot_value=slot_value,
+        )
+        for room_name, date_value, slot_value in booked
+    )
+    if len(items) == 1:
+        _schedule_reservation_email(items[0])
+        return
+    _schedule_reservation_email(ReservationBatchEmailPayload(to_email=to_email, event="created", items=items))
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import date as date_type
+from http.cookies import SimpleCookie
+from importlib import import_module
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+
+from .events import broker, ensure_listener
+
+
+STREAM_PATH = "/api/availability/stream/"
+# Set on the scope of every request the router passes on, so pages know the stream is served.
+STREAM_SCOPE_KEY = "reservations.availability_stream"
+HEARTBEAT_SECONDS = 15
+
+
+class AvailabilityStreamRouter:
+    """
+    ASGI middleware serving GET /api/availability/stream/?date=YYYY-MM-DD as
+    Server-Sent Events and handing every other request to Django.
+
+    The stream lives outside Django's request cycle because it has to notice
+    client disconnects (http.disconnect) while idle, which Django 4.2's
+    streaming responses do not do.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == STREAM_PATH:
+            await availability_stream(scope, receive, send)
+            return
+        if scope["type"] == "http":
+            scope = {**scope, STREAM_SCOPE_KEY: STREAM_PATH}
+        await self.app(scope, receive, send)
+
+
+def stream_url(request) -> str:
+    """
+    The availability stream path when this request came through AvailabilityStreamRouter, else "".
+    """
+    return getattr(request, "scope", {}).get(STREAM_SCOPE_KEY, "")
+
+
+def _user_for_session(session_key: str | None):
+    """
+    Resolve the logged-in user from the Django session cookie (same rules as AuthenticationMiddleware).
+    """
+    if not session_key:
+        return None
+    session = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+    user = get_user(SimpleNamespace(session=session))
+    return user if user.is_authenticated else None
+
+
+def _session_key(scope) -> str | None:
+    for name, value in scope.get("headers", []):
+        if name == b"cookie":
+            cookie = SimpleCookie()
+            cookie.load(value.decode("latin-1"))
+            morsel = cookie.get(settings.SESSION_COOKIE_NAME)
+            return morsel.value if morsel else None
+    return None
+
+
+async def _send_json_error(send, status: int, message: str) -> None:
+    body = json.dumps({"error": message}).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def availability_stream(scope, receive, send) -> None:
+    """
+    Streams `booking` events ({type, room_type_id, date, slot}) for one date.
+    A `resync` event asks the client to re-fetch /api/availability/ (it fell behind).
+    """
+    if scope["method"] != "GET":
+        await _send_json_error(send, 405, "Method not allowed.")
+        return
+
+    user = await sync_to_async(_user_for_session)(_session_key(scope))
+    if user is None:
+        await _send_json_error(send, 401, "Authentication required.")
+        return
+
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    try:
+        target_date = date_type.fromisoformat((query.get("date") or [""])[0].strip())
+    except ValueError:
+        await _send_json_error(send, 400, "Invalid date. Expected YYYY-MM-DD.")
+        return
+
+    await sync_to_async(ensure_listener)()
+    subscription = broker.subscribe(target_date)
+    try:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": b"retry: 5000\n\n", "more_body": True})
+
+        disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+        next_event = asyncio.ensure_future(subscription.queue.get())
+        try:
+            while True:
+                done, _ = await asyncio.wait(
+                    {next_event, disconnected},
+                    timeout=HEARTBEAT_SECONDS,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if disconnected in done:
+                    break
+
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    while not subscription.queue.empty():
+                        subscription.queue.get_nowait()
+                    if next_event.done():
+                        next_event = asyncio.ensure_future(subscription.queue.get())
+                    chunk = b"event: resync\ndata: {}\n\n"
+                elif next_event in done:
+                    chunk = f"event: booking\ndata: {next_event.result().to_json()}\n\n".encode("utf-8")
+                    next_event = asyncio.ensure_future(subscription.queue.get())
+                else:
+                    chunk = b": ping\n\n"
+
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        finally:
+            disconnected.cancel()
+            next_event.cancel()
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def _wait_for_disconnect(receive) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
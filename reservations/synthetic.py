@@ -0,0 +1,223 @@
+"""
+Deterministic synthetic datasets for reproducing production-scale behaviour locally.
+
+Reservations are generated per (room type, date): each slot is drawn at most
+once, so unique_reservation_roomtype_date_slot holds by construction, and the
+rows go to the database in chunks of multi-row INSERTs, without per-row checks
+(and without building model instances, which would dominate the run time at
+millions of rows). The DailyAvailability masks come out of the same pass.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import date as date_type
+from datetime import timedelta
+from itertools import accumulate
+from typing import Callable
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .availability import slots_to_mask
+from .availability_cache import bump_date_versions
+from .models import DailyAvailability, Reservation, RoomType, TimeSlot
+
+
+SYNTHETIC_USER_PREFIX = "synthetic-user-"
+SYNTHETIC_ROOM_PREFIX = "Synthetic Room "
+
+# Relative demand per slot: busy mid-morning and mid-afternoon, a lunch dip, a quiet last hour.
+HOUR_WEIGHTS = {9: 0.7, 10: 1.15, 11: 1.25, 12: 0.75, 13: 0.8, 14: 1.2, 15: 1.15, 16: 0.9, 17: 0.5}
+# Monday..Sunday
+WEEKDAY_WEIGHTS = (1.0, 1.1, 1.1, 1.05, 0.8, 0.25, 0.1)
+# January..December: summer break and the end-of-year holidays are quiet.
+MONTH_WEIGHTS = (0.9, 1.0, 1.05, 1.0, 1.0, 0.9, 0.55, 0.5, 1.0, 1.1, 1.1, 0.75)
+MAX_SLOT_PROBABILITY = 0.97
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    users: int = 1000
+    room_types: int = 20
+    start: date_type | None = None  # default: `years` before today
+    end: date_type | None = None  # default: `future_days` after today
+    years: float = 2.0
+    future_days: int = 90
+    occupancy: float = 0.45  # average share of booked slots on a normal weekday
+    seed: int = 42
+    chunk_size: int = 5000
+
+
+@dataclass
+class SyntheticResult:
+    users: int = 0
+    room_types: int = 0
+    reservations: int = 0
+    daily_availability: int = 0
+    days: int = 0
+
+
+class SyntheticDataExists(Exception):
+    pass
+
+
+def synthetic_data_exists() -> bool:
+    User = get_user_model()
+    return (
+        RoomType.objects.filter(name__startswith=SYNTHETIC_ROOM_PREFIX).exists()
+        or User.objects.filter(**{f"{User.USERNAME_FIELD}__startswith": SYNTHETIC_USER_PREFIX}).exists()
+    )
+
+
+def delete_synthetic_data() -> dict[str, int]:
+    """
+    Remove everything a previous run generated (its reservations first: RoomType is PROTECTed).
+    """
+    User = get_user_model()
+    rooms = RoomType.objects.filter(name__startswith=SYNTHETIC_ROOM_PREFIX)
+    with transaction.atomic():
+        reservations, _ = Reservation.objects.filter(room_type__in=rooms).delete()
+        DailyAvailability.objects.filter(room_type__in=rooms).delete()
+        room_types, _ = rooms.delete()
+        users, _ = User.objects.filter(**{f"{User.USERNAME_FIELD}__startswith": SYNTHETIC_USER_PREFIX}).delete()
+    return {"reservations": reservations, "room_types": room_types, "users": users}
+
+
+def _date_range(spec: SyntheticSpec, today: date_type) -> tuple[date_type, date_type]:
+    start = spec.start or today - timedelta(days=round(spec.years * 365))
+    end = spec.end or today + timedelta(days=spec.future_days)
+    return start, end
+
+
+def _create_users(spec: SyntheticSpec) -> list[int]:
+    User = get_user_model()
+    password = make_password(None)  # unusable; shared by every synthetic user
+    width = len(str(spec.users))
+    users = [
+        User(
+            **{User.USERNAME_FIELD: f"{SYNTHETIC_USER_PREFIX}{index:0{width}d}"},
+            email=f"{SYNTHETIC_USER_PREFIX}{index:0{width}d}@example.com",
+            password=password,
+        )
+        for index in range(1, spec.users + 1)
+    ]
+    User.objects.bulk_create(users, batch_size=spec.chunk_size)
+    return list(
+        User.objects.filter(**{f"{User.USERNAME_FIELD}__startswith": SYNTHETIC_USER_PREFIX})
+        .order_by(User.USERNAME_FIELD)
+        .values_list("id", flat=True)
+    )
+
+
+def _create_room_types(spec: SyntheticSpec) -> list[int]:
+    width = len(str(spec.room_types))
+    RoomType.objects.bulk_create(
+        [
+            RoomType(name=f"{SYNTHETIC_ROOM_PREFIX}{index:0{width}d}", display_order=1000 + index)
+            for index in range(1, spec.room_types + 1)
+        ]
+    )
+    return list(
+        RoomType.objects.filter(name__startswith=SYNTHETIC_ROOM_PREFIX).order_by("name").values_list("id", flat=True)
+    )
+
+
+def _insert_rows(model, columns: tuple[str, ...], rows: list[tuple]) -> None:
+    """
+    INSERT already-adapted rows with as many rows per statement as the backend's parameter limit allows.
+    """
+    if not rows:
+        return
+    fields = [model._meta.get_field(column.removesuffix("_id")) for column in columns]
+    batch_size = max(connection.ops.bulk_batch_size(fields, rows), 1)
+    quote = connection.ops.quote_name
+    prefix = f"INSERT INTO {quote(model._meta.db_table)} ({', '.join(quote(column) for column in columns)}) VALUES "
+    row_sql = f"({', '.join(['%s'] * len(columns))})"
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start : start + batch_size]
+            cursor.execute(prefix + ", ".join([row_sql] * len(batch)), [value for row in batch for value in row])
+
+
+def generate_synthetic_data(
+    spec: SyntheticSpec,
+    *,
+    today: date_type | None = None,
+    progress: Callable[[SyntheticResult], None] | None = None,
+) -> SyntheticResult:
+    """
+    Create spec.users users, spec.room_types room types and reservations for every
+    day of the date range, with a seeded RNG so the same spec gives the same data.
+
+    Demand follows HOUR_WEIGHTS x WEEKDAY_WEIGHTS x MONTH_WEIGHTS, scaled per room
+    type by a popularity factor; a few heavy users hold most of the bookings.
+    Raises SyntheticDataExists when a previous run's data is still there
+    (see delete_synthetic_data()).
+    """
+    if synthetic_data_exists():
+        raise SyntheticDataExists("Synthetic data already exists; delete it first.")
+
+    rng = random.Random(spec.seed)
+    start, end = _date_range(spec, today or timezone.localdate())
+    result = SyntheticResult()
+
+    with transaction.atomic():
+        user_ids = _create_users(spec)
+        room_type_ids = _create_room_types(spec)
+    result.users, result.room_types = len(user_ids), len(room_type_ids)
+    if not user_ids or not room_type_ids or start > end:
+        return result
+
+    # Zipf-like user activity and log-normal room popularity, both fixed by the seed.
+    user_cum_weights = list(accumulate(1 / rank for rank in range(1, len(user_ids) + 1)))
+    rng.shuffle(user_ids)
+    popularity = {room_type_id: min(rng.lognormvariate(0, 0.35), 2.0) for room_type_id in room_type_ids}
+    slots = [int(value) for value in TimeSlot.values]
+
+    ops = connection.ops
+    stamp = ops.adapt_datetimefield_value(timezone.now())
+    reservations: list[tuple] = []
+    availability: list[tuple] = []
+
+    def flush() -> None:
+        with transaction.atomic():
+            _insert_rows(Reservation, ("user_id", "room_type_id", "date", "slot", "created_at", "updated_at"), reservations)
+            _insert_rows(DailyAvailability, ("room_type_id", "date", "reserved_mask", "updated_at"), availability)
+        result.reservations += len(reservations)
+        result.daily_availability += len(availability)
+        reservations.clear()
+        availability.clear()
+        if progress is not None:
+            progress(result)
+
+    day = start
+    while day <= end:
+        day_weight = spec.occupancy * WEEKDAY_WEIGHTS[day.weekday()] * MONTH_WEIGHTS[day.month - 1]
+        day_value = ops.adapt_datefield_value(day)
+        for room_type_id in room_type_ids:
+            room_weight = day_weight * popularity[room_type_id]
+            booked = [
+                slot
+                for slot in slots
+                if rng.random() < min(room_weight * HOUR_WEIGHTS.get(slot, 1.0), MAX_SLOT_PROBABILITY)
+            ]
+            if not booked:
+                continue
+            owners = rng.choices(user_ids, cum_weights=user_cum_weights, k=len(booked))
+            reservations.extend(
+                (user_id, room_type_id, day_value, slot, stamp, stamp) for user_id, slot in zip(owners, booked)
+            )
+            availability.append((room_type_id, day_value, slots_to_mask(booked), stamp))
+        result.days += 1
+        day += timedelta(days=1)
+        if len(reservations) >= spec.chunk_size:
+            flush()
+
+    if reservations or availability:
+        flush()
+    bump_date_versions(start + timedelta(days=offset) for offset in range((end - start).days + 1))
+    return result
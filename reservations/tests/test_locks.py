@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import unittest
+
+from django.db import connection
+from django.test import TransactionTestCase
+
+from benchmarks.lock_stress import FAILURE_FIELDS, run_lock_stress
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql",
+    "Needs PostgreSQL: on SQLite booking_transaction() takes the database write lock first, "
+    "which serializes every writer, so the run would not exercise the booking lock order.",
+)
+class BookingLockStressTests(TransactionTestCase):
+    """
+    Concurrent cross-room moves in both directions (benchmarks.lock_stress) must
+    never deadlock, break the lock order or lose a reservation, under either lock scope.
+    """
+
+    def test_cross_room_moves_do_not_deadlock(self):
+        result = run_lock_stress(threads=8, moves=10, hold_ms=2.0)
+
+        for scope_result in result["results"]:
+            with self.subTest(scope=scope_result["scope"]):
+                self.assertEqual({name: scope_result[name] for name in FAILURE_FIELDS}, dict.fromkeys(FAILURE_FIELDS, 0))
+                self.assertEqual(scope_result["moved"], 8 * 10)
+        self.assertTrue(result["passed"])
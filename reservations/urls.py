@@ -1,33 +1,51 @@
+from django.conf import settings
 from django.urls import path
 
-from .api import (
-    availability_api,
-    cancel_reservation_api,
-    create_reservation_api,
-    update_reservation_api,
+from . import api
+from . import api_async
+from .views import (
+    calendar_feed_rotate_view,
+    calendar_feed_view,
+    metrics_view,
+    my_reservations_view,
+    reservation_create_view,
+    reservation_edit_view,
+    reservation_export_view,
+    room_availability_view,
 )
-from .views import my_reservations_view, reservation_create_view, reservation_edit_view, room_availability_view
 
 
 app_name = "reservations"
 
+# RESERVATION_ASYNC_API=1 serves the JSON API with the ASGI-native views (see api_async).
+json_api = api_async if getattr(settings, "RESERVATION_ASYNC_API", False) else api
+
 urlpatterns = [
-    path("api/availability/", availability_api, name="availability_api"),
-    path("api/reservations/", create_reservation_api, name="create_reservation_api"),
+    path("api/availability/", json_api.availability_api, name="availability_api"),
+    path("api/availability/range/", json_api.availability_range_api, name="availability_range_api"),
+    path("api/availability/cache-stats/", api.availability_cache_stats_api, name="availability_cache_stats_api"),
+    path("api/emails/dispatch-stats/", api.email_dispatch_stats_api, name="email_dispatch_stats_api"),
+    path("api/reservations/", json_api.create_reservation_api, name="create_reservation_api"),
+    path("api/reservations/batch/", json_api.batch_reservation_api, name="batch_reservation_api"),
+    path("api/reservations/series/", json_api.series_reservation_api, name="series_reservation_api"),
     path(
         "api/reservations/<int:reservation_id>/update/",
-        update_reservation_api,
+        json_api.update_reservation_api,
         name="update_reservation_api",
     ),
     path(
         "api/reservations/<int:reservation_id>/cancel/",
-        cancel_reservation_api,
+        json_api.cancel_reservation_api,
         name="cancel_reservation_api",
     ),
     path("availability/", room_availability_view, name="room_availability"),
     path("reservations/new/", reservation_create_view, name="reservation_create"),
     path("my-reservations/", my_reservations_view, name="my_reservations"),
     path("reservations/<int:reservation_id>/edit/", reservation_edit_view, name="reservation_edit"),
+    path("reservations/export/", reservation_export_view, name="reservation_export"),
+    path("calendar/rotate/", calendar_feed_rotate_view, name="calendar_feed_rotate"),
+    path("calendar/<str:token>.ics", calendar_feed_view, name="calendar_feed"),
+    path("metrics", metrics_view, name="metrics"),
 ]
 
 
@@ -1,15 +1,41 @@
+import hmac
 from datetime import date as date_type
 
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
-from django.http import Http404
-from django.shortcuts import redirect, render
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
 from django.views.decorators.csrf import ensure_csrf_cookie
+from django.views.decorators.http import require_GET, require_POST
 
+from .calendar_feeds import (
+    FEED_KIND_ROOM,
+    FEED_KIND_USER,
+    cached_feed_body,
+    feed_etag,
+    feed_from_token,
+    feed_url,
+    iter_feed_and_cache,
+    rotate_feed,
+)
+from .exports import (
+    EXPORT_CONTENT_TYPES,
+    EXPORT_FORMAT_CSV,
+    STATUS_ALL,
+    STATUS_PAST,
+    STATUS_UPCOMING,
+    ExportFilters,
+    iter_export,
+)
 from .forms import ReservationCreateForm, ReservationUpdateForm
+from .metrics import metrics_text
 from .models import Reservation, RoomType
 from .services import PastReservationError, ReservationInput, SlotUnavailableError, create_reservation, update_reservation
+from .streams import stream_url
 
 
 @login_required
@@ -47,6 +73,7 @@ def room_availability_view(request):
         {
             "initial_date": initial_date.isoformat(),
             "room_types": room_types,
+            "availability_stream_url": stream_url(request),
         },
     )
 
@@ -116,31 +143,55 @@ def reservation_create_view(request):
 @ensure_csrf_cookie
 def my_reservations_view(request):
     """
-    Day 1 foundation: split user reservations into upcoming vs past.
-    Day 2 will add edit/cancel actions + richer UI.
+    Upcoming bookings in full, past bookings one keyset page at a time.
+
+    The upcoming/past split and both counts are computed in SQL from (date, slot)
+    against the local time; `?before=<date>.<slot>.<id>` continues the past list
+    after the given row, so deep pages cost the same as the first one.
     """
-    now = timezone.now()
-    all_reservations = (
-        Reservation.objects.select_related("room_type")
-        .filter(user=request.user)
-        .order_by("-date", "-slot", "-created_at")
-    )
+    mine = Reservation.objects.filter(user=request.user)
+    now = timezone.localtime()
+    counts = mine.status_counts(now)
 
-    upcoming = []
-    past = []
-    for r in all_reservations:
-        if r.end_datetime() >= now:
-            upcoming.append(r)
-        else:
-            past.append(r)
+    upcoming = mine.upcoming(now).select_related("room_type").order_by("-date", "-slot", "-created_at")
+
+    page_size = max(1, int(getattr(settings, "RESERVATION_PAST_PAGE_SIZE", 20)))
+    past_qs = mine.past(now).select_related("room_type").order_by("-date", "-slot", "-id")
+    cursor = _parse_past_cursor(request.GET.get("before"))
+    if cursor is not None:
+        past_qs = past_qs.before(*cursor)
+    past = list(past_qs[: page_size + 1])
+    next_cursor = None
+    if len(past) > page_size:
+        past = past[:page_size]
+        last = past[-1]
+        next_cursor = f"{last.date.isoformat()}.{last.slot}.{last.id}"
 
     return render(
         request,
         "reservations/my_reservations.html",
-        {"upcoming": upcoming, "past": past},
+        {
+            "upcoming": upcoming,
+            "past": past,
+            "upcoming_count": counts["upcoming"],
+            "past_count": counts["past"],
+            "past_is_first_page": cursor is None,
+            "past_next_cursor": next_cursor,
+            "calendar_feed_url": feed_url(request, FEED_KIND_USER, request.user.pk),
+        },
     )
 
 
+def _parse_past_cursor(value: str | None) -> tuple[date_type, int, int] | None:
+    if not value:
+        return None
+    try:
+        date_raw, slot_raw, id_raw = value.split(".")
+        return date_type.fromisoformat(date_raw), int(slot_raw), int(id_raw)
+    except ValueError:
+        return None
+
+
 @login_required
 @ensure_csrf_cookie
 def reservation_edit_view(request, reservation_id: int):
@@ -208,4 +259,115 @@ def reservation_edit_view(request, reservation_id: int):
     )
 
 
+@staff_member_required
+@require_GET
+def reservation_export_view(request):
+    """
+    GET /reservations/export/?format=csv|ndjson[&start=YYYY-MM-DD][&end=YYYY-MM-DD][&room_type_id=ID...][&status=...]
 
+    Streams matching reservations (staff only). Rows are read in chunks from a
+    single joined query, so large exports never sit in memory.
+    """
+    export_format = (request.GET.get("format") or EXPORT_FORMAT_CSV).strip().lower()
+    if export_format not in EXPORT_CONTENT_TYPES:
+        return HttpResponseBadRequest("format must be csv or ndjson.")
+
+    try:
+        start = date_type.fromisoformat(request.GET["start"]) if request.GET.get("start") else None
+        end = date_type.fromisoformat(request.GET["end"]) if request.GET.get("end") else None
+    except ValueError:
+        return HttpResponseBadRequest("Invalid date. Expected YYYY-MM-DD.")
+
+    room_type_ids = request.GET.getlist("room_type_id")
+    if not all(value.isdigit() for value in room_type_ids):
+        return HttpResponseBadRequest("room_type_id must be an integer.")
+
+    status = (request.GET.get("status") or STATUS_ALL).strip().lower()
+    if status not in {STATUS_ALL, STATUS_UPCOMING, STATUS_PAST}:
+        return HttpResponseBadRequest("status must be all, upcoming or past.")
+
+    filters = ExportFilters(
+        start=start,
+        end=end,
+        room_type_ids=tuple(int(value) for value in room_type_ids),
+        status=status,
+    )
+    response = StreamingHttpResponse(iter_export(filters, export_format), content_type=EXPORT_CONTENT_TYPES[export_format])
+    filename = f"reservations-{timezone.localdate():%Y%m%d}.{export_format}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+@require_GET
+def calendar_feed_view(request, token: str):
+    """
+    GET /calendar/<token>.ics
+
+    iCalendar feed of a user's reservations or of a room type's busy slots. The
+    signed token replaces the login (calendar apps cannot send the session cookie).
+    Revalidation is by ETag only (see calendar_feeds.feed_etag).
+    """
+    feed = feed_from_token(token)
+    if feed is None:
+        raise Http404
+
+    etag = feed_etag(feed)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    content_type = "text/calendar; charset=utf-8"
+    body = cached_feed_body(feed, etag)
+    if body is not None:
+        response = HttpResponse(body, content_type=content_type)
+    else:
+        if feed.kind == FEED_KIND_ROOM:
+            name = get_object_or_404(RoomType.objects.only("name"), pk=feed.object_id, is_active=True).name
+        else:
+            name = "My reservations"
+        response = StreamingHttpResponse(
+            iter_feed_and_cache(feed, etag, host=request.get_host(), name=name),
+            content_type=content_type,
+        )
+
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+@login_required
+@require_POST
+def calendar_feed_rotate_view(request):
+    """
+    POST /calendar/rotate/
+
+    Replace the user's calendar feed link; the previous one stops working.
+    """
+    rotate_feed(FEED_KIND_USER, request.user.pk)
+    messages.success(request, "Your calendar feed link was replaced. Subscribe to the new link in your calendar app.")
+    return redirect("reservations:my_reservations")
+
+
+def _metrics_authorized(request) -> bool:
+    token = getattr(settings, "RESERVATION_METRICS_TOKEN", "")
+    if token:
+        scheme, _, supplied = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(supplied.strip().encode(), token.encode()):
+            return True
+    user = getattr(request, "user", None)
+    return bool(user is not None and user.is_active and user.is_staff)
+
+
+@require_GET
+def metrics_view(request):
+    """
+    GET /metrics
+
+    Booking, conflict, email and cache metrics of every worker process, in the
+    Prometheus text exposition format (see reservations.metrics).
+    """
+    if not _metrics_authorized(request):
+        return HttpResponse("Forbidden.\n", status=403, content_type="text/plain; charset=utf-8")
+    response = HttpResponse(metrics_text(), content_type="text/plain; version=0.0.4; charset=utf-8")
+    response["Cache-Control"] = "no-store"
+    return response
@@ -70,6 +70,9 @@
     return getCookie("csrftoken");
   }
 
+  // url -> { etag, data } for GET responses that carried an ETag.
+  const etagCache = new Map();
+
   async function fetchJSON(url, opts = {}) {
     const method = (opts.method || "GET").toUpperCase();
     const headers = new Headers(opts.headers || {});
@@ -81,12 +84,18 @@
     }
     if (!headers.has("Accept")) headers.set("Accept", "application/json");
 
+    // Conditional GET: the server answers 304 (no body) when nothing changed.
+    const cached = method === "GET" ? etagCache.get(url) : null;
+    if (cached && !headers.has("If-None-Match")) headers.set("If-None-Match", cached.etag);
+
     const res = await fetch(url, {
       ...opts,
       method,
       headers,
     });
 
+    if (res.status === 304 && cached) return cached.data;
+
     const isJSON = (res.headers.get("content-type") || "").includes("application/json");
     const data = isJSON ? await res.json() : await res.text();
 
@@ -96,6 +105,11 @@
       err.data = data;
       throw err;
     }
+
+    const etag = res.headers.get("ETag");
+    if (method === "GET" && etag) {
+      etagCache.set(url, { etag, data });
+    }
     return data;
   }
 
@@ -288,6 +288,7 @@
         const cached = availabilityCacheByDate.get(date);
         renderAllRooms(cached);
         setText(roomCardsStatusEl, `Updated for ${cached.date} (cached)`);
+        connectStream(date);
         return;
       }
 
@@ -309,6 +310,7 @@
         availabilityCacheByDate.set(date, payload);
         renderAllRooms(payload);
         setText(roomCardsStatusEl, `Updated for ${payload.date}`);
+        connectStream(date);
       } catch (e) {
         if (e?.name === "AbortError") return;
         setText(roomCardsStatusEl, "Failed");
@@ -323,6 +325,66 @@
       }
     };
 
+    // Live updates (Server-Sent Events, only served when running under ASGI; the server
+    // announces the stream URL in data-stream-url). Without a stream the page keeps its
+    // previous behaviour: fetch on date change / after a 409.
+    let streamUrl = String(roomCardsWrap?.dataset.streamUrl || "");
+    let stream = null;
+    let streamDate = null;
+
+    const applyBookingEvent = (evt) => {
+      const payload = availabilityCacheByDate.get(evt.date);
+      const room = payload?.room_types?.find((rt) => Number(rt.id) === Number(evt.room_type_id));
+      if (!room) return;
+
+      const reserved = new Set((room.reserved_slots || []).map(Number));
+      if (evt.type === "reserved") reserved.add(Number(evt.slot));
+      if (evt.type === "released") reserved.delete(Number(evt.slot));
+      room.reserved_slots = Array.from(reserved).sort((a, b) => a - b);
+
+      if (dateInput.value !== evt.date || inFlight) return;
+
+      if (
+        evt.type === "reserved" &&
+        selection &&
+        selection.roomTypeId === Number(evt.room_type_id) &&
+        selection.slot === Number(evt.slot) &&
+        !reserving
+      ) {
+        selection = null;
+        window.App.toast("The slot you selected was just reserved by someone else.", { variant: "warning" });
+      }
+      renderAllRooms(payload);
+    };
+
+    const connectStream = (date) => {
+      if (!window.EventSource || !streamUrl || !date) return;
+      if (stream && streamDate === date && stream.readyState !== EventSource.CLOSED) return;
+      if (stream) stream.close();
+
+      streamDate = date;
+      stream = new EventSource(`${streamUrl}?date=${encodeURIComponent(date)}`);
+      stream.addEventListener("error", () => {
+        // The browser retries network errors by itself; CLOSED means the server refused
+        // the stream (e.g. 404), so stop asking for it on this page.
+        if (stream?.readyState === EventSource.CLOSED) {
+          stream = null;
+          streamUrl = "";
+        }
+      });
+      stream.addEventListener("booking", (e) => {
+        try {
+          applyBookingEvent(JSON.parse(e.data));
+        } catch (err) {
+          // Ignore malformed events; the next fetch resyncs the page.
+        }
+      });
+      stream.addEventListener("resync", () => {
+        availabilityCacheByDate.delete(streamDate);
+        if (!isBusy() && dateInput.value === streamDate) loadAvailability({ force: true });
+      });
+    };
+
     const debouncedLoad = debounce(() => loadAvailability(), 350);
 
     const onDateChanged = () => {